@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+BioNeuralNetwork Connectivity Build Benchmark
+
+Times connect_layers() between two layers of each `--sizes` width and
+reports the synapses created, the memory held by the synapse store and
+the bytes per synapse.
+
+Usage:
+    python benchmarks/bench_connectivity.py
+    python benchmarks/bench_connectivity.py --sizes 1000 3000 --probability 0.05
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from ai.neural.bio_neural_network import BioNeuralNetwork
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BioNeuralNetwork Connectivity Build Benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[300, 1000, 3000],
+                        help="layer widths")
+    parser.add_argument('--probability', type=float, default=0.1,
+                        help="connection probability between layers")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'width':>8}{'synapses':>12}{'build ms':>11}{'store MB':>10}{'bytes/syn':>11}")
+    print("-" * 52)
+    for width in args.sizes:
+        random.seed(args.seed)
+        network = BioNeuralNetwork("bench")
+        first = network.create_layer(width, "hidden")
+        second = network.create_layer(width, "hidden")
+        start = time.perf_counter()
+        network.connect_layers(first, second, args.probability)
+        elapsed = time.perf_counter() - start
+        store = network.synapse_store
+        size = store.nbytes()
+        print(f"{width:>8}{len(store):>12}{elapsed * 1000:>11.1f}"
+              f"{size / 2**20:>10.1f}{size / max(1, len(store)):>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
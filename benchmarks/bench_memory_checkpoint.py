@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+MemoryModule Checkpoint Benchmark
+
+Compares MemoryModule.checkpoint() with the previous implementation
+(dict copy + json.dump(indent=2) over the target file). Reports wall time,
+the extra peak RSS the checkpoint needs on top of the loaded store, and the
+file size. Each scenario runs in a fresh process so ru_maxrss is not shared.
+
+Usage:
+    python benchmarks/bench_memory_checkpoint.py
+    python benchmarks/bench_memory_checkpoint.py --count 500000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.memory.storage import MemoryModule
+
+
+SCENARIOS = ['legacy', 'atomic', 'atomic+gzip']
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (Linux reports KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_scenario(scenario: str, count: int) -> dict:
+    """Build a store of `count` entries, checkpoint it once, report costs"""
+    suffix = '.json.gz' if scenario == 'atomic+gzip' else '.json'
+    path = os.path.join(tempfile.mkdtemp(prefix="thalos_bench_"), 'memory' + suffix)
+
+    memory = MemoryModule(persistence_path=path)
+    for i in range(count):
+        memory.create(f"session:{i}:profile", {'id': i, 'name': f"user {i}",
+                                                'tags': ['a', 'b', 'c'], 'score': i * 0.5})
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    if scenario == 'legacy':
+        data = dict(memory.storage.items())
+        with open(path, 'w') as f:
+            json.dump(memory.storage.data, f, indent=2)
+        del data
+    else:
+        memory.checkpoint()
+    elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(path)
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+    return {'seconds': elapsed, 'extra_rss_mb': peak_rss_mb() - baseline,
+            'file_mb': size / (1 << 20)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MemoryModule Checkpoint Benchmark")
+    parser.add_argument('--count', type=int, default=200000, help="entries in the store")
+    parser.add_argument('--scenario', choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(args.scenario, args.count)))
+        return
+
+    print(f"{args.count} entries")
+    print(f"{'scenario':<14}{'seconds':>10}{'extra RSS MB':>14}{'file MB':>10}")
+    print("-" * 48)
+    for scenario in SCENARIOS:
+        output = subprocess.run([sys.executable, __file__, '--count', str(args.count),
+                                 '--scenario', scenario],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        print(f"{scenario:<14}{result['seconds']:>10.2f}"
+              f"{result['extra_rss_mb']:>14.1f}{result['file_mb']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
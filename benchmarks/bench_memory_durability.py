@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+AdvancedMemorySystem Durability Benchmark
+
+Measures insert throughput (ops/sec) under each durability policy and
+under a single batch() block.
+
+Usage:
+    python benchmarks/bench_memory_durability.py
+    python benchmarks/bench_memory_durability.py --count 100000 --persistence wal
+    python benchmarks/bench_memory_durability.py --count 2000 --persistence snapshot
+
+Note: the "per_op" policy in snapshot mode rewrites the whole store on every
+insert, so its cost is quadratic in --count; use a small count for it.
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.memory.advanced_memory import AdvancedMemorySystem
+
+
+SCENARIOS = [
+    ('per_op', {'durability': 'per_op'}, False),
+    ('every_n (n=1000)', {'durability': 'every_n', 'flush_every': 1000}, False),
+    ('interval (100 ms)', {'durability': 'interval', 'flush_interval_ms': 100}, False),
+    ('manual + flush()', {'durability': 'manual'}, False),
+    ('batch()', {'durability': 'per_op'}, True),
+]
+
+
+def run_scenario(count: int, persistence: str, options: dict, use_batch: bool) -> float:
+    """Insert `count` entries and return ops/sec including the final flush"""
+    directory = tempfile.mkdtemp(prefix="thalos_bench_")
+    try:
+        memory = AdvancedMemorySystem(directory, persistence=persistence,
+                                      compact_every=0, **options)
+        start = time.perf_counter()
+        if use_batch:
+            with memory.batch():
+                for i in range(count):
+                    memory.create(f"entry_{i}", f"knowledge entry number {i} about topic {i % 97}")
+        else:
+            for i in range(count):
+                memory.create(f"entry_{i}", f"knowledge entry number {i} about topic {i % 97}")
+            memory.flush()
+        elapsed = time.perf_counter() - start
+        memory.close()
+        return count / elapsed
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AdvancedMemorySystem Durability Benchmark")
+    parser.add_argument('--count', type=int, default=100000, help="inserts per scenario")
+    parser.add_argument('--persistence', choices=AdvancedMemorySystem.PERSISTENCE_MODES,
+                        default='wal')
+    args = parser.parse_args()
+
+    print(f"{args.count} inserts, persistence={args.persistence}")
+    print(f"{'policy':<22}{'ops/sec':>14}")
+    print("-" * 36)
+    for name, options, use_batch in SCENARIOS:
+        ops = run_scenario(args.count, args.persistence, options, use_batch)
+        print(f"{name:<22}{ops:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
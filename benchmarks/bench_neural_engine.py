@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+BioNeuralNetwork Simulation Benchmark
+
+Compares steps/sec of the object model (simulate_step() in a loop) with
+the vectorized engine (simulate(n)) across network sizes. Each network is
+four layers: 10 inputs, two hidden layers of each `--sizes` width and 5
+outputs. Both runs start from the same seed and stimulus.
+
+Usage:
+    python benchmarks/bench_neural_engine.py
+    python benchmarks/bench_neural_engine.py --sizes 50 200 800 --steps 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from ai.neural.bio_neural_network import BioNeuralNetwork
+
+
+def build_network(hidden: int, probability: float, seed: int) -> BioNeuralNetwork:
+    """Input(10) -> hidden -> hidden -> output(5), seeded"""
+    random.seed(seed)
+    network = BioNeuralNetwork("bench")
+    inputs = network.create_layer(10, "input")
+    first = network.create_layer(hidden, "hidden")
+    second = network.create_layer(hidden, "hidden")
+    outputs = network.create_layer(5, "output")
+    network.connect_layers(inputs, first, probability)
+    network.connect_layers(first, second, probability)
+    network.connect_layers(second, outputs, probability)
+    return network
+
+
+def steps_per_second(network: BioNeuralNetwork, steps: int, engine: bool) -> float:
+    """Stimulate every 50 steps, as web_server.chat() does, and time `steps` steps"""
+    pattern = [random.Random(0).random() for _ in range(10)]
+    start = time.perf_counter()
+    done = 0
+    while done < steps:
+        chunk = min(50, steps - done)
+        network.stimulate_inputs(pattern)
+        if engine:
+            network.simulate(chunk)
+        else:
+            for _ in range(chunk):
+                network.simulate_step()
+        done += chunk
+    return steps / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BioNeuralNetwork Simulation Benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100, 400, 1000],
+                        help="hidden layer widths")
+    parser.add_argument('--probability', type=float, default=0.1,
+                        help="connection probability between layers")
+    parser.add_argument('--steps', type=int, default=200, help="steps per run")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'hidden':>8}{'neurons':>9}{'synapses':>10}"
+          f"{'object steps/s':>16}{'engine steps/s':>16}{'speedup':>9}")
+    print("-" * 68)
+    for hidden in args.sizes:
+        network = build_network(hidden, args.probability, args.seed)
+        objects = steps_per_second(network, args.steps, engine=False)
+        network = build_network(hidden, args.probability, args.seed)
+        arrays = steps_per_second(network, args.steps, engine=True)
+        print(f"{hidden:>8}{len(network.neurons):>9}{len(network.synapses):>10}"
+              f"{objects:>16.0f}{arrays:>16.0f}{arrays / objects:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
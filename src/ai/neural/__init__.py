@@ -4,4 +4,6 @@ Thalos Prime™ is a proprietary system.
 """
 
 from .bio_neural_network import BioNeuralNetwork
-__all__ = ['BioNeuralNetwork']
\ No newline at end of file
+from .connectivity import SynapseStore, SynapseView
+from .engine import NetworkEngine
+__all__ = ['BioNeuralNetwork', 'NetworkEngine', 'SynapseStore', 'SynapseView']
\ No newline at end of file
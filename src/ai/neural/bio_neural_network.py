@@ -20,15 +20,25 @@ import random
 from typing import List, Dict, Tuple, Optional, Any
 import json
 
+import numpy as np
+
+from .connectivity import SynapseList, SynapseStore, SynapseView
+from .engine import NetworkEngine
+
+# Synapses are views into the network's SynapseStore
+Synapse = SynapseView
+
 
 class Neuron:
     """
     Spiking neuron model with biological properties
     """
     
-    def __init__(self, neuron_id: int, neuron_type: str = "excitatory"):
+    def __init__(self, neuron_id: int, neuron_type: str = "excitatory",
+                 synapse_store: Optional[SynapseStore] = None):
         self.neuron_id = neuron_id
         self.neuron_type = neuron_type  # excitatory or inhibitory
+        self.synapse_store = synapse_store
         
         # Membrane potential
         self.membrane_potential = -70.0  # mV (resting potential)
@@ -36,10 +46,6 @@ class Neuron:
         self.resting_potential = -70.0  # mV
         self.reset_potential = -75.0  # mV
         
-        # Synaptic inputs
-        self.incoming_synapses: List['Synapse'] = []
-        self.outgoing_synapses: List['Synapse'] = []
-        
         # Spike history
         self.spike_times: List[float] = []
         self.refractory_period = 2.0  # ms
@@ -64,8 +70,10 @@ class Neuron:
         if current_time - self.last_spike_time < self.refractory_period:
             return False
             
-        # Sum synaptic inputs
-        synaptic_current = sum(syn.get_current() for syn in self.incoming_synapses)
+        # Sum synaptic inputs (accumulated per neuron by the delay buffer)
+        synaptic_current = 0.0
+        if self.synapse_store is not None:
+            synaptic_current = float(self.synapse_store.buffer.current[self.neuron_id])
         
         # Leak current (towards resting potential)
         leak_current = -self.leak_conductance * (self.membrane_potential - self.resting_potential)
@@ -88,16 +96,22 @@ class Neuron:
         self.membrane_potential = self.reset_potential
         
         # Propagate spike to outgoing synapses
-        for synapse in self.outgoing_synapses:
-            synapse.receive_spike(time)
+        if self.synapse_store is not None:
+            self.synapse_store.transmit([self.neuron_id], time)
             
-    def add_incoming_synapse(self, synapse: 'Synapse') -> None:
-        """Add incoming synaptic connection"""
-        self.incoming_synapses.append(synapse)
-        
-    def add_outgoing_synapse(self, synapse: 'Synapse') -> None:
-        """Add outgoing synaptic connection"""
-        self.outgoing_synapses.append(synapse)
+    @property
+    def incoming_synapses(self) -> List[Synapse]:
+        """Views of the synapses onto this neuron"""
+        if self.synapse_store is None:
+            return []
+        return [self.synapse_store.view(i) for i in self.synapse_store.incoming(self.neuron_id)]
+        
+    @property
+    def outgoing_synapses(self) -> List[Synapse]:
+        """Views of the synapses from this neuron"""
+        if self.synapse_store is None:
+            return []
+        return [self.synapse_store.view(i) for i in self.synapse_store.outgoing(self.neuron_id)]
         
     def get_firing_rate(self, time_window: float = 1000.0) -> float:
         """Calculate firing rate in Hz over time window"""
@@ -107,73 +121,6 @@ class Neuron:
         return len(recent_spikes) / (time_window / 1000.0)
 
 
-class Synapse:
-    """
-    Synaptic connection with plasticity
-    """
-    
-    def __init__(self, pre_neuron: Neuron, post_neuron: Neuron, 
-                 initial_weight: float = 0.5):
-        self.pre_neuron = pre_neuron
-        self.post_neuron = post_neuron
-        self.weight = initial_weight
-        
-        # STDP parameters
-        self.a_plus = 0.01  # LTP amplitude
-        self.a_minus = 0.01  # LTD amplitude
-        self.tau_plus = 20.0  # LTP time constant (ms)
-        self.tau_minus = 20.0  # LTD time constant (ms)
-        
-        # Synaptic dynamics
-        self.delay = 1.0  # ms
-        self.pending_spikes: List[float] = []
-        self.current = 0.0
-        self.decay_rate = 0.9
-        
-    def receive_spike(self, time: float) -> None:
-        """Receive spike from presynaptic neuron"""
-        arrival_time = time + self.delay
-        self.pending_spikes.append(arrival_time)
-        
-    def update(self, dt: float, current_time: float) -> None:
-        """Update synaptic current"""
-        # Decay current
-        self.current *= math.exp(-self.decay_rate * dt)
-        
-        # Process pending spikes
-        spikes_to_remove = []
-        for spike_time in self.pending_spikes:
-            if current_time >= spike_time:
-                # Add synaptic current
-                self.current += self.weight
-                spikes_to_remove.append(spike_time)
-                
-        # Remove processed spikes
-        for spike_time in spikes_to_remove:
-            self.pending_spikes.remove(spike_time)
-            
-    def get_current(self) -> float:
-        """Get current synaptic current"""
-        return self.current
-        
-    def apply_stdp(self, dt_pre_post: float) -> None:
-        """
-        Apply Spike-Timing-Dependent Plasticity
-        
-        Args:
-            dt_pre_post: Time difference (post_spike - pre_spike) in ms
-        """
-        if dt_pre_post > 0:
-            # LTP (Long-Term Potentiation) - strengthen synapse
-            delta_w = self.a_plus * math.exp(-dt_pre_post / self.tau_plus)
-        else:
-            # LTD (Long-Term Depression) - weaken synapse
-            delta_w = -self.a_minus * math.exp(dt_pre_post / self.tau_minus)
-            
-        # Update weight with bounds
-        self.weight = max(0.0, min(1.0, self.weight + delta_w))
-
-
 class BioNeuralNetwork:
     """
     Biologically-inspired neural network with spiking neurons
@@ -182,7 +129,7 @@ class BioNeuralNetwork:
     def __init__(self, name: str = "bio_net"):
         self.name = name
         self.neurons: List[Neuron] = []
-        self.synapses: List[Synapse] = []
+        self.synapse_store = SynapseStore(self.neurons)
         
         # Network structure
         self.input_neurons: List[Neuron] = []
@@ -197,6 +144,21 @@ class BioNeuralNetwork:
         self.learning_enabled = True
         self.homeostasis_enabled = True
         
+        # Array engine for simulate(), rebuilt after structural changes
+        self._engine: Optional[NetworkEngine] = None
+        self._engine_key: Optional[Tuple] = None
+        
+    @property
+    def synapses(self) -> SynapseList:
+        """All synapses, as views in CSR (presynaptic neuron) order"""
+        return SynapseList(self.synapse_store)
+        
+    @synapses.setter
+    def synapses(self, synapses) -> None:
+        """Keep only the given synapses (e.g. a pruned list of views)"""
+        keep_ids = np.fromiter((synapse.synapse_id for synapse in synapses), dtype=np.int64)
+        self.synapse_store.retain(np.isin(self.synapse_store.ids, keep_ids))
+        
     def create_layer(self, num_neurons: int, layer_type: str = "hidden") -> List[Neuron]:
         """
         Create a layer of neurons
@@ -211,9 +173,10 @@ class BioNeuralNetwork:
         layer = []
         for i in range(num_neurons):
             neuron_id = len(self.neurons)
-            neuron = Neuron(neuron_id)
+            neuron = Neuron(neuron_id, synapse_store=self.synapse_store)
             self.neurons.append(neuron)
             layer.append(neuron)
+        self.synapse_store.resize()
             
         # Categorize neurons
         if layer_type == "input":
@@ -230,22 +193,22 @@ class BioNeuralNetwork:
         """
         Connect two layers with synapses
         
+        Each pair is connected independently with random initial weight in
+        [0.3, 0.7]. The graph is generated directly into the synapse store,
+        seeded from the ``random`` module so ``random.seed()`` reproduces it.
+        
         Args:
             pre_layer: Presynaptic layer
             post_layer: Postsynaptic layer
             connection_probability: Probability of connection between neurons
         """
-        for pre_neuron in pre_layer:
-            for post_neuron in post_layer:
-                if random.random() < connection_probability:
-                    # Random initial weight
-                    weight = random.uniform(0.3, 0.7)
-                    synapse = Synapse(pre_neuron, post_neuron, weight)
-                    
-                    pre_neuron.add_outgoing_synapse(synapse)
-                    post_neuron.add_incoming_synapse(synapse)
-                    self.synapses.append(synapse)
-                    
+        rng = np.random.default_rng(random.getrandbits(64))
+        self.synapse_store.connect_random(
+            [neuron.neuron_id for neuron in pre_layer],
+            [neuron.neuron_id for neuron in post_layer],
+            connection_probability, rng
+        )
+        
     def stimulate_inputs(self, input_pattern: List[float]) -> None:
         """
         Stimulate input neurons with pattern
@@ -268,9 +231,8 @@ class BioNeuralNetwork:
         Returns:
             Dict with simulation results
         """
-        # Update synapses
-        for synapse in self.synapses:
-            synapse.update(self.dt, self.current_time)
+        # Deliver synaptic input arriving this step
+        self.synapse_store.update(self.dt, self.current_time)
             
         # Update neurons
         spikes = []
@@ -280,7 +242,8 @@ class BioNeuralNetwork:
                 
         # Apply STDP if learning enabled
         if self.learning_enabled and len(spikes) > 0:
-            self._apply_learning()
+            self._apply_learning(spikes)
+        self.synapse_store.record_spikes(spikes)
             
         # Homeostatic regulation
         if self.homeostasis_enabled:
@@ -294,22 +257,45 @@ class BioNeuralNetwork:
             "num_spikes": len(spikes)
         }
         
-    def _apply_learning(self) -> None:
-        """Apply STDP learning to all synapses"""
-        for synapse in self.synapses:
-            pre_spikes = synapse.pre_neuron.spike_times
-            post_spikes = synapse.post_neuron.spike_times
+    def simulate(self, num_steps: int) -> Dict[str, Any]:
+        """
+        Simulate several time steps on the vectorized engine
+        
+        Equivalent to calling simulate_step() ``num_steps`` times, with
+        state kept in NumPy arrays for the whole run.
+        
+        Args:
+            num_steps: Number of time steps
             
-            if not pre_spikes or not post_spikes:
-                continue
-                
-            # Find closest spike pairs
-            for pre_time in pre_spikes[-5:]:  # Last 5 spikes
-                for post_time in post_spikes[-5:]:
-                    dt = post_time - pre_time
-                    if abs(dt) < 50.0:  # Within STDP window
-                        synapse.apply_stdp(dt)
-                        
+        Returns:
+            Dict with the final time, spiking neuron ids per step and the
+            total spike count
+        """
+        spikes = []
+        if num_steps > 0 and self.neurons:
+            key = (self.synapse_store.version, self.dt)
+            if self._engine is None or self._engine_key != key:
+                self._engine = NetworkEngine(self)
+                self._engine_key = key
+            spikes = self._engine.run(num_steps, self.learning_enabled,
+                                      self.homeostasis_enabled)
+        
+        return {
+            "time": self.current_time,
+            "steps": num_steps,
+            "spikes": spikes,
+            "num_spikes": sum(len(step) for step in spikes)
+        }
+        
+    def _apply_learning(self, spikes: List[int]) -> None:
+        """
+        Apply trace-based STDP to the synapses of neurons that spiked
+        
+        Args:
+            spikes: Ids of the neurons that spiked this step
+        """
+        self.synapse_store.apply_stdp(spikes)
+        
     def _apply_homeostasis(self) -> None:
         """Apply homeostatic regulation to maintain network stability"""
         target_rate = 5.0  # Target firing rate in Hz
@@ -361,8 +347,7 @@ class BioNeuralNetwork:
                 self.stimulate_inputs(input_pattern)
                 
                 # Simulate for processing time
-                for _ in range(100):  # 10ms simulation
-                    self.simulate_step()
+                self.simulate(100)  # 10ms simulation
                     
                 # Get output
                 actual_output = self.get_output_activity()
@@ -387,18 +372,17 @@ class BioNeuralNetwork:
         Args:
             reward: Reward signal (0.0 to 1.0)
         """
-        # Modulate recent synaptic changes based on reward
-        for synapse in self.synapses:
-            # Strengthen recently active synapses if reward is high
-            if synapse.current > 0.1:  # Recently active
-                synapse.weight *= (1.0 + reward * 0.01)
-                synapse.weight = min(1.0, synapse.weight)
+        # Strengthen recently active synapses if reward is high
+        store = self.synapse_store
+        active = store.synapse_current() > 0.1  # Recently active
+        store.weight[active] = np.minimum(1.0, store.weight[active] * (1.0 + reward * 0.01))
                 
     def get_network_stats(self) -> Dict[str, Any]:
         """Get comprehensive network statistics"""
         total_spikes = sum(len(n.spike_times) for n in self.neurons)
         avg_firing_rate = sum(n.get_firing_rate() for n in self.neurons) / len(self.neurons) if self.neurons else 0
-        avg_weight = sum(s.weight for s in self.synapses) / len(self.synapses) if self.synapses else 0
+        weights = self.synapse_store.weight
+        avg_weight = float(weights.mean(dtype=np.float64)) if len(weights) else 0
         
         return {
             "name": self.name,
@@ -419,6 +403,4 @@ class BioNeuralNetwork:
         for neuron in self.neurons:
             neuron.membrane_potential = neuron.resting_potential
             neuron.spike_times.clear()
-        for synapse in self.synapses:
-            synapse.current = 0.0
-            synapse.pending_spikes.clear()
+        self.synapse_store.reset()
@@ -0,0 +1,548 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Sparse Synaptic Connectivity
+
+Synapses stored as parallel arrays instead of one object per edge:
+- CSR order: synapses sorted by presynaptic neuron, with row pointers,
+  so a neuron's outgoing synapses are one contiguous slice
+- A CSC permutation (synapses grouped by postsynaptic neuron) for fan-in
+- float32 weight and delay arrays; int32 neuron indices
+- Vectorized random graph generation by geometric skipping, O(edges)
+- Event-driven spike delivery through a ring buffer of delay slots
+  holding input current per postsynaptic neuron
+- Trace-based STDP: per-neuron pre/post eligibility traces, with weight
+  updates only on the synapses of neurons that spiked
+- SynapseView objects expose single synapses to Synapse-based code
+"""
+
+import math
+import weakref
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+
+class DelayBuffer:
+    """
+    Circular buffer of synaptic input per delay slot and postsynaptic neuron
+
+    A spike crossing a synapse with a delay of ``d`` steps adds the weight
+    to the slot delivered ``d`` steps later, so transmission costs
+    O(fan-out) when the spike is emitted and each step costs one decay and
+    one slot read for the whole network. ``current`` is the summed
+    synaptic current into each neuron, decaying exponentially between
+    arrivals.
+    """
+
+    def __init__(self, num_neurons: int = 0, num_slots: int = 1):
+        self.current = np.zeros(num_neurons, dtype=np.float64)
+        self.slots = np.zeros((num_slots, num_neurons), dtype=np.float64)
+        self.position = 0  # slot delivered by the next deliver()
+
+    @property
+    def num_slots(self) -> int:
+        return len(self.slots)
+
+    def resize(self, num_neurons: int, num_slots: int) -> None:
+        """Grow to more neurons or longer delays, keeping input in flight"""
+        num_neurons = max(num_neurons, len(self.current))
+        num_slots = max(num_slots, self.num_slots)
+        if (num_slots, num_neurons) == self.slots.shape:
+            return
+        current = np.zeros(num_neurons, dtype=np.float64)
+        current[:len(self.current)] = self.current
+        slots = np.zeros((num_slots, num_neurons), dtype=np.float64)
+        slots[:self.num_slots, :self.slots.shape[1]] = np.roll(self.slots, -self.position, axis=0)
+        self.current, self.slots, self.position = current, slots, 0
+
+    def deliver(self, decay_factor: float) -> None:
+        """Start a step: decay the currents and add the input arriving now"""
+        self.current *= decay_factor
+        self.current += self.slots[self.position]
+        self.slots[self.position] = 0.0
+        self.position = (self.position + 1) % self.num_slots
+
+    def schedule(self, steps: np.ndarray, post: np.ndarray, weight: np.ndarray) -> None:
+        """
+        Queue input emitted during the current step
+
+        Args:
+            steps: Delay of each contribution in steps (1 = next step)
+            post: Postsynaptic neuron indices
+            weight: Current added on arrival
+        """
+        rows = (self.position + steps - 1) % self.num_slots
+        np.add.at(self.slots, (rows, post), weight)
+
+    def clear(self) -> None:
+        self.current[:] = 0.0
+        self.slots[:] = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return self.current.nbytes + self.slots.nbytes
+
+
+class SynapseStore:
+    """
+    All synapses of a network in compressed sparse row form
+
+    Each synapse also has a stable id, so views survive the reordering
+    done when edges are added or removed. Plasticity and decay parameters
+    are shared by every synapse. Delays are quantized to whole steps of
+    ``dt`` (at least one) for delivery through the DelayBuffer; input
+    already in flight is still delivered if its synapse is removed.
+
+    STDP keeps two exponentially decaying traces per neuron, each bumped
+    by 1 when the neuron spikes: ``pre_trace`` (time constant
+    ``tau_plus``) and ``post_trace`` (``tau_minus``). When a neuron spikes,
+    its incoming synapses gain ``a_plus`` times their presynaptic trace
+    and its outgoing synapses lose ``a_minus`` times their postsynaptic
+    trace. Summed over spike pairs this is the classic all-pairs rule
+    ``a_plus * exp(-dt / tau_plus)`` / ``-a_minus * exp(dt / tau_minus)``.
+    """
+
+    def __init__(self, neurons: Sequence[Any] = (), a_plus: float = 0.01,
+                 a_minus: float = 0.01, tau_plus: float = 20.0, tau_minus: float = 20.0,
+                 decay_rate: float = 0.9, dt: float = 0.1):
+        """
+        Initialize an empty store
+
+        Args:
+            neurons: The network's neuron list (indexed by neuron id)
+            a_plus: LTP amplitude
+            a_minus: LTD amplitude
+            tau_plus: LTP time constant (ms)
+            tau_minus: LTD time constant (ms)
+            decay_rate: Synaptic current decay rate (1/ms)
+            dt: Simulation time step (ms)
+        """
+        self.neurons = neurons
+        self.a_plus = a_plus
+        self.a_minus = a_minus
+        self.tau_plus = tau_plus
+        self.tau_minus = tau_minus
+        self.decay_rate = decay_rate
+        self.dt = dt
+
+        self.pre = np.empty(0, dtype=np.int32)
+        self.post = np.empty(0, dtype=np.int32)
+        self.weight = np.empty(0, dtype=np.float32)
+        self.delay = np.empty(0, dtype=np.float32)
+        self.ids = np.empty(0, dtype=np.int64)
+        # Time the last spike reached each synapse (inf while in flight)
+        self.last_arrival = np.empty(0, dtype=np.float64)
+        self.buffer = DelayBuffer()
+        self.pre_trace = np.zeros(0, dtype=np.float64)
+        self.post_trace = np.zeros(0, dtype=np.float64)
+        self.time = 0.0  # time of the latest simulated step
+
+        self.version = 0  # bumped on every structural change
+        self._next_id = 0
+        self._steps_key = None
+        self.delay_steps = np.empty(0, dtype=np.int64)
+        self._views: 'weakref.WeakValueDictionary[int, SynapseView]' = \
+            weakref.WeakValueDictionary()
+        self._rebuild_indexes()
+
+    @property
+    def num_neurons(self) -> int:
+        return len(self.neurons)
+
+    def add(self, pre: np.ndarray, post: np.ndarray, weight: np.ndarray,
+            delay: float = 1.0) -> None:
+        """
+        Add synapses and restore CSR order
+
+        Args:
+            pre: Presynaptic neuron indices
+            post: Postsynaptic neuron indices
+            weight: Initial weights
+            delay: Transmission delay (ms) for the new synapses
+        """
+        count = len(pre)
+        if count == 0:
+            return
+        ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+        self._next_id += count
+
+        pre = np.concatenate([self.pre, np.asarray(pre, dtype=np.int32)])
+        # A stable sort keeps each neuron's existing synapses ahead of new ones
+        order = np.argsort(pre, kind='stable')
+        self.pre = pre[order]
+        self.post = np.concatenate([self.post, np.asarray(post, dtype=np.int32)])[order]
+        self.weight = np.concatenate([self.weight, np.asarray(weight, dtype=np.float32)])[order]
+        self.last_arrival = np.concatenate([self.last_arrival,
+                                            np.full(count, -np.inf)])[order]
+        self.delay = np.concatenate([self.delay, np.full(count, delay, dtype=np.float32)])[order]
+        self.ids = np.concatenate([self.ids, ids])[order]
+        self._rebuild_indexes()
+
+    def connect_random(self, pre: np.ndarray, post: np.ndarray, probability: float,
+                       rng: np.random.Generator, weight_range=(0.3, 0.7),
+                       delay: float = 1.0) -> int:
+        """
+        Connect every pre/post pair independently with ``probability``
+
+        Edge positions in the flattened pre x post grid are drawn as
+        geometric gaps between successes, so generation costs O(edges)
+        rather than one draw per pair, and comes out in CSR order.
+
+        Args:
+            pre: Presynaptic neuron indices
+            post: Postsynaptic neuron indices
+            probability: Connection probability per pair
+            rng: Random generator
+            weight_range: Uniform range of initial weights
+            delay: Transmission delay (ms)
+
+        Returns:
+            Number of synapses created
+        """
+        pre = np.asarray(pre, dtype=np.int32)
+        post = np.asarray(post, dtype=np.int32)
+        total = len(pre) * len(post)
+        if total == 0 or probability <= 0:
+            return 0
+        if probability >= 1:
+            flat = np.arange(total, dtype=np.int64)
+        else:
+            chunks = []
+            position = -1
+            while True:
+                expected = (total - position) * probability
+                gaps = rng.geometric(probability, size=int(expected + 4 * math.sqrt(expected)) + 16)
+                positions = position + np.cumsum(gaps, dtype=np.int64)
+                chunks.append(positions[positions < total])
+                if positions[-1] >= total:
+                    break
+                position = int(positions[-1])
+            flat = np.concatenate(chunks)
+
+        rows, cols = np.divmod(flat, len(post))
+        weights = rng.uniform(weight_range[0], weight_range[1], size=len(flat))
+        self.add(pre[rows], post[cols], weights, delay)
+        return len(flat)
+
+    def retain(self, keep: np.ndarray) -> int:
+        """
+        Keep only the synapses selected by a boolean mask
+
+        Returns:
+            Number of synapses removed
+        """
+        keep = np.asarray(keep, dtype=bool)
+        removed = int(len(keep) - np.count_nonzero(keep))
+        if removed == 0:
+            return 0
+        self.pre = self.pre[keep]
+        self.post = self.post[keep]
+        self.weight = self.weight[keep]
+        self.last_arrival = self.last_arrival[keep]
+        self.delay = self.delay[keep]
+        self.ids = self.ids[keep]
+        self._rebuild_indexes()
+        return removed
+
+    def remove_ids(self, synapse_ids: Iterable[int]) -> int:
+        """Remove synapses by id; unknown ids are ignored"""
+        return self.retain(~np.isin(self.ids, np.fromiter(synapse_ids, dtype=np.int64)))
+
+    def update(self, dt: float, current_time: float) -> None:
+        """Start a simulation step: decay input and traces, deliver what arrives now"""
+        self.dt = dt
+        self.sync()
+        self.buffer.deliver(math.exp(-self.decay_rate * dt))
+        self.pre_trace *= math.exp(-dt / self.tau_plus)
+        self.post_trace *= math.exp(-dt / self.tau_minus)
+        self.time = current_time
+
+    def transmit(self, neurons: Any, time: float) -> None:
+        """
+        Send spikes emitted at ``time`` along the neurons' outgoing synapses
+
+        Args:
+            neurons: Indices of the spiking neurons, in firing order
+            time: Spike time (ms)
+        """
+        self.sync()
+        idx = _gather(self.indptr, neurons)
+        if idx.size == 0:
+            return
+        steps = self.delay_steps[idx]
+        self.buffer.schedule(steps, self.post[idx], self.weight[idx])
+        self.last_arrival[idx] = time + steps * self.dt
+
+    def apply_stdp(self, neurons: Any) -> None:
+        """
+        Potentiate and depress the synapses of this step's spiking neurons
+
+        Uses the traces before this step's spikes are added (see
+        record_spikes()), so cost scales with the spikers' fan-in and
+        fan-out rather than the number of synapses.
+
+        Args:
+            neurons: Indices of the neurons that spiked this step
+        """
+        # LTP: presynaptic activity before a postsynaptic spike
+        idx = self.in_order[_gather(self.in_ptr, neurons)]
+        if idx.size:
+            updated = self.weight[idx] + self.a_plus * self.pre_trace[self.pre[idx]]
+            self.weight[idx] = np.clip(updated, 0.0, 1.0)
+        # LTD: postsynaptic activity before a presynaptic spike
+        idx = _gather(self.indptr, neurons)
+        if idx.size:
+            updated = self.weight[idx] - self.a_minus * self.post_trace[self.post[idx]]
+            self.weight[idx] = np.clip(updated, 0.0, 1.0)
+
+    def record_spikes(self, neurons: Any) -> None:
+        """Add this step's spikes to the eligibility traces"""
+        self.pre_trace[neurons] += 1.0
+        self.post_trace[neurons] += 1.0
+
+    def sync(self) -> None:
+        """Requantize delays and size the buffer after changes to the graph or dt"""
+        key = (self.version, self.dt)
+        if key == self._steps_key:
+            return
+        self.delay_steps = np.maximum(1, np.rint(self.delay / self.dt)).astype(np.int64)
+        max_steps = int(self.delay_steps.max()) if len(self.delay_steps) else 1
+        self.buffer.resize(self.num_neurons, max_steps)
+        self._steps_key = key
+
+    def synapse_current(self) -> np.ndarray:
+        """
+        Current each synapse contributes at ``time``, from its last spike
+
+        The buffer keeps only per-neuron sums; this reconstructs a
+        synapse's share as its weight decayed since the last arrival.
+        """
+        elapsed = self.time - self.last_arrival
+        decayed = self.weight * np.exp(-self.decay_rate * np.maximum(elapsed, 0.0))
+        return np.where(elapsed >= 0, decayed, 0.0)
+
+    def reset(self) -> None:
+        """Drop all input in flight and spike history"""
+        self.buffer.clear()
+        self.pre_trace[:] = 0.0
+        self.post_trace[:] = 0.0
+        self.last_arrival[:] = -np.inf
+        self.time = 0.0
+
+    def resize(self) -> None:
+        """Extend the row pointers after neurons were added"""
+        self._rebuild_indexes()
+
+    def index_of(self, synapse_id: int) -> int:
+        """Current array index of a synapse id (ValueError if removed)"""
+        position = int(np.searchsorted(self._sorted_ids, synapse_id))
+        if position == len(self._sorted_ids) or self._sorted_ids[position] != synapse_id:
+            raise ValueError(f"Synapse {synapse_id} has been removed")
+        return int(self._id_order[position])
+
+    def outgoing(self, neuron: int) -> range:
+        """Array indices of a neuron's outgoing synapses"""
+        return range(int(self.indptr[neuron]), int(self.indptr[neuron + 1]))
+
+    def incoming(self, neuron: int) -> np.ndarray:
+        """Array indices of a neuron's incoming synapses, in index order"""
+        return self.in_order[self.in_ptr[neuron]:self.in_ptr[neuron + 1]]
+
+    def view(self, index: int) -> 'SynapseView':
+        """The view of the synapse at an array index (one per live synapse)"""
+        synapse_id = int(self.ids[index])
+        view = self._views.get(synapse_id)
+        if view is None:
+            view = SynapseView(self, synapse_id, index)
+            self._views[synapse_id] = view
+        return view
+
+    def nbytes(self) -> int:
+        arrays = (self.pre, self.post, self.weight, self.delay, self.ids, self.last_arrival,
+                  self.indptr, self.in_order, self.in_ptr)
+        return sum(array.nbytes for array in arrays) + self.buffer.nbytes
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _rebuild_indexes(self) -> None:
+        """Row pointers, the CSC permutation and the id lookup"""
+        n = self.num_neurons
+        if len(self.pre_trace) < n:
+            grow = n - len(self.pre_trace)
+            self.pre_trace = np.concatenate([self.pre_trace, np.zeros(grow)])
+            self.post_trace = np.concatenate([self.post_trace, np.zeros(grow)])
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.pre, minlength=n), out=self.indptr[1:])
+        self.in_order = np.argsort(self.post, kind='stable')
+        self.in_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.post, minlength=n), out=self.in_ptr[1:])
+        self._id_order = np.argsort(self.ids)
+        self._sorted_ids = self.ids[self._id_order]
+        self.version += 1
+
+
+class SynapseView:
+    """
+    One synapse of a SynapseStore, with the interface of a Synapse object
+
+    Reads and writes go straight to the store's arrays. A view follows its
+    synapse when the store is reordered and raises ValueError once the
+    synapse has been removed.
+    """
+
+    __slots__ = ('store', 'synapse_id', '_index', '_version', '__weakref__')
+
+    def __init__(self, store: SynapseStore, synapse_id: int, index: int):
+        self.store = store
+        self.synapse_id = synapse_id
+        self._index = index
+        self._version = store.version
+
+    @property
+    def index(self) -> int:
+        if self._version != self.store.version:
+            self._index = self.store.index_of(self.synapse_id)
+            self._version = self.store.version
+        return self._index
+
+    @property
+    def pre_neuron(self) -> Any:
+        return self.store.neurons[self.store.pre[self.index]]
+
+    @property
+    def post_neuron(self) -> Any:
+        return self.store.neurons[self.store.post[self.index]]
+
+    @property
+    def weight(self) -> float:
+        return float(self.store.weight[self.index])
+
+    @weight.setter
+    def weight(self, value: float) -> None:
+        self.store.weight[self.index] = value
+
+    @property
+    def current(self) -> float:
+        """Current from this synapse's last spike (see SynapseStore.synapse_current)"""
+        store = self.store
+        elapsed = store.time - float(store.last_arrival[self.index])
+        if elapsed < 0:
+            return 0.0
+        return self.weight * math.exp(-store.decay_rate * elapsed)
+
+    @property
+    def delay(self) -> float:
+        return float(self.store.delay[self.index])
+
+    @delay.setter
+    def delay(self, value: float) -> None:
+        self.store.delay[self.index] = value
+        self.store.version += 1  # delays are requantized by sync()
+
+    @property
+    def a_plus(self) -> float:
+        return self.store.a_plus
+
+    @property
+    def a_minus(self) -> float:
+        return self.store.a_minus
+
+    @property
+    def tau_plus(self) -> float:
+        return self.store.tau_plus
+
+    @property
+    def tau_minus(self) -> float:
+        return self.store.tau_minus
+
+    @property
+    def decay_rate(self) -> float:
+        return self.store.decay_rate
+
+    def receive_spike(self, time: float) -> None:
+        """Receive spike from presynaptic neuron"""
+        store = self.store
+        store.sync()
+        index = self.index
+        steps = store.delay_steps[index:index + 1]
+        store.buffer.schedule(steps, store.post[index:index + 1], store.weight[index:index + 1])
+        store.last_arrival[index] = time + int(steps[0]) * store.dt
+
+    def get_current(self) -> float:
+        return self.current
+
+    def apply_stdp(self, dt_pre_post: float) -> None:
+        """
+        Apply Spike-Timing-Dependent Plasticity
+
+        Args:
+            dt_pre_post: Time difference (post_spike - pre_spike) in ms
+        """
+        if dt_pre_post > 0:
+            delta_w = self.a_plus * math.exp(-dt_pre_post / self.tau_plus)
+        else:
+            delta_w = -self.a_minus * math.exp(dt_pre_post / self.tau_minus)
+        self.weight = max(0.0, min(1.0, self.weight + delta_w))
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, SynapseView) and other.store is self.store
+                and other.synapse_id == self.synapse_id)
+
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.synapse_id))
+
+    def __repr__(self) -> str:
+        return f"SynapseView(id={self.synapse_id}, weight={self.weight:.4f})"
+
+
+class SynapseList(Sequence):
+    """
+    The network's synapses as a sequence of views, in CSR order
+
+    ``remove()`` deletes a synapse from the store; assigning a filtered
+    list to ``network.synapses`` keeps only the synapses it contains.
+    """
+
+    def __init__(self, store: SynapseStore):
+        self.store = store
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store.view(i) for i in range(len(self.store))[index]]
+        if index < 0:
+            index += len(self.store)
+        if not 0 <= index < len(self.store):
+            raise IndexError("synapse index out of range")
+        return self.store.view(index)
+
+    def __iter__(self) -> Iterator[SynapseView]:
+        for index in range(len(self.store)):
+            yield self.store.view(index)
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __contains__(self, synapse: object) -> bool:
+        return isinstance(synapse, SynapseView) and synapse.store is self.store \
+            and synapse.synapse_id in self.store.ids
+
+    def remove(self, synapse: SynapseView) -> None:
+        if not self.store.remove_ids([synapse.synapse_id]):
+            raise ValueError("synapse not in network")
+
+
+def _gather(indptr: np.ndarray, rows: Any) -> np.ndarray:
+    """Concatenated index ranges ``indptr[r]:indptr[r + 1]`` of several rows"""
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.arange(total) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
@@ -0,0 +1,149 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Vectorized Simulation Engine
+
+Array-backed counterpart of BioNeuralNetwork.simulate_step():
+- Membrane potentials, thresholds and refractory timers as NumPy vectors
+- Synaptic input read from the SynapseStore's delay ring buffer: one
+  decay multiply and one slot read per step
+- Spikes as boolean masks; the spiking neurons' outgoing CSR slices are
+  scheduled into the buffer in one call
+- Trace-based STDP on the spiking neurons' synapses; homeostasis
+  applied to whole arrays
+
+Synaptic work goes through the same SynapseStore methods as the object
+model and the neuron update mirrors Neuron.update() operation for
+operation, so both produce the same spikes, potentials and weights from
+the same seed.
+"""
+
+from bisect import bisect_right
+from typing import Any, List
+
+import numpy as np
+
+
+RATE_WINDOW = 1000.0  # ms, homeostasis firing-rate window
+TARGET_RATE = 5.0  # Hz
+
+
+class NetworkEngine:
+    """
+    Compiled arrays for one BioNeuralNetwork
+
+    Synaptic state lives in the network's SynapseStore and is updated in
+    place. Neuron objects stay the source of truth for neuron state: run()
+    loads it into arrays, simulates, and writes it back, so
+    stimulate_inputs(), get_output_activity() and the object-level
+    simulate_step() keep working between runs. Neuron parameters are read
+    when the engine is built; the network rebuilds it after structural
+    changes.
+    """
+
+    def __init__(self, network: Any):
+        """
+        Compile a network's structure
+
+        Args:
+            network: BioNeuralNetwork to simulate
+        """
+        self.network = network
+        self.store = network.synapse_store
+        neurons = network.neurons
+        self.num_neurons = len(neurons)
+        self.dt = network.dt
+
+        def neuron_array(attribute: str) -> np.ndarray:
+            return np.fromiter((getattr(n, attribute) for n in neurons),
+                               dtype=np.float64, count=self.num_neurons)
+
+        self.resting = neuron_array('resting_potential')
+        self.reset_potential = neuron_array('reset_potential')
+        self.refractory = neuron_array('refractory_period')
+        self.leak = neuron_array('leak_conductance')
+        self.capacitance = neuron_array('capacitance')
+
+    def run(self, num_steps: int, learning: bool, homeostasis: bool) -> List[List[int]]:
+        """
+        Simulate ``num_steps`` steps
+
+        Args:
+            num_steps: Steps of ``network.dt`` ms
+            learning: Apply STDP on steps with spikes
+            homeostasis: Regulate thresholds towards the target rate
+
+        Returns:
+            Ids of the neurons that spiked, per step
+        """
+        network = self.network
+        neurons = network.neurons
+        store = self.store
+        buffer = store.buffer
+
+        # Load mutable neuron state
+        potential = np.fromiter((n.membrane_potential for n in neurons),
+                                dtype=np.float64, count=self.num_neurons)
+        threshold = np.fromiter((n.threshold for n in neurons),
+                                dtype=np.float64, count=self.num_neurons)
+        last_spike = np.fromiter((n.last_spike_time for n in neurons),
+                                 dtype=np.float64, count=self.num_neurons)
+        spike_times = [n.spike_times for n in neurons]
+        rate = np.array([_firing_rate(times) for times in spike_times], dtype=np.float64)
+
+        time = network.current_time
+        dt = self.dt
+        history = []
+        for _ in range(num_steps):
+            # Synapses: decay input and traces, deliver input arriving this step
+            store.update(dt, time)
+            synaptic = buffer.current
+
+            # Neurons: leaky integrate-and-fire outside the refractory period
+            active = ~((time - last_spike) < self.refractory)
+            leak_current = -self.leak * (potential - self.resting)
+            dv = (synaptic + leak_current) / self.capacitance
+            potential = np.where(active, potential + dv * dt, potential)
+            fired = active & (potential >= threshold)
+
+            spiked = np.flatnonzero(fired)
+            if spiked.size:
+                potential[spiked] = self.reset_potential[spiked]
+                last_spike[spiked] = time
+                for i in spiked.tolist():
+                    times = spike_times[i]
+                    times.append(time)
+                    rate[i] = _firing_rate(times)
+                store.transmit(spiked, time)
+
+                if learning:
+                    store.apply_stdp(spiked)
+                store.record_spikes(spiked)
+
+            if homeostasis:
+                threshold = np.where(rate > TARGET_RATE * 1.5, threshold + 0.1,
+                                     np.where(rate < TARGET_RATE * 0.5, threshold - 0.1, threshold))
+                threshold = np.maximum(-60.0, np.minimum(-50.0, threshold))
+
+            time += dt
+            history.append(spiked.tolist())
+
+        # Store state back into the neurons
+        network.current_time = time
+        for i, neuron in enumerate(neurons):
+            neuron.membrane_potential = float(potential[i])
+            neuron.threshold = float(threshold[i])
+            neuron.last_spike_time = float(last_spike[i])
+        return history
+
+
+def _firing_rate(times: List[float]) -> float:
+    """Neuron.get_firing_rate(RATE_WINDOW) over a sorted spike list"""
+    if not times:
+        return 0.0
+    recent = len(times) - bisect_right(times, times[-1] - RATE_WINDOW)
+    return recent / (RATE_WINDOW / 1000.0)
@@ -134,8 +134,9 @@ class NeuralPathwayOptimizer:
             # Weaken inactive pathways
             synapse.weight *= 0.95
         
-        # Track usage
-        synapse_id = id(synapse)
+        # Track usage; store-backed synapse views are transient, so key them
+        # by their stable synapse_id rather than the object's id()
+        synapse_id = getattr(synapse, 'synapse_id', id(synapse))
         if activity > 0.3:
             self.pathway_usage[synapse_id] += 1
         
@@ -38,8 +38,15 @@ class CIS:
     - Enforce deterministic execution
     """
     
-    def __init__(self):
-        """Initialize the CIS control unit"""
+    def __init__(self, config: Optional[Any] = None):
+        """
+        Initialize the CIS control unit
+        
+        Args:
+            config: Optional Config passed to subsystems; boot() loads
+                    config/thalos.conf when none is given
+        """
+        self.config = config
         self.memory = None
         self.codegen = None
         self.cli = None
@@ -137,13 +144,18 @@ class CIS:
         if src_dir not in sys.path:
             sys.path.insert(0, src_dir)
         
+        from core.config import Config
         from core.memory.storage import MemoryModule
         from codegen.generator import CodeGenerator
         from interfaces.cli.cli import CLI
         from interfaces.api.server import API
         
+        if self.config is None:
+            config_file = os.path.join(os.path.dirname(src_dir), 'config', 'thalos.conf')
+            self.config = Config(config_file if os.path.exists(config_file) else None)
+        
         # Initialize subsystems
-        self.memory = MemoryModule()
+        self.memory = MemoryModule(config=self.config)
         self.codegen = CodeGenerator()
         self.cli = CLI(self)
         self.api = API(self)
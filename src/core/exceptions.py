@@ -119,6 +119,11 @@ class ValidationError(ThalosError):
         return result
 
 
+class QueryError(ValidationError):
+    """Malformed database query or parameters"""
+    pass
+
+
 class StateError(ThalosError):
     """Invalid state transition or operation in current state"""
     
@@ -194,6 +199,11 @@ class ResourceError(ThalosError):
     pass
 
 
+class PoolTimeoutError(ResourceError):
+    """Timed out waiting for a pooled connection"""
+    pass
+
+
 class TimeoutError(ThalosError):
     """Operation timeout"""
     pass
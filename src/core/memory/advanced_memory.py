@@ -9,21 +9,39 @@ Advanced Memory System with Persistence, Indexing, and Search
 
 Enhanced memory capabilities:
 - Persistent storage to disk
-- Full-text search and indexing
+- Full-text search with BM25 ranking over posting lists
+- Memory-mapped on-disk index segments for fast cold starts
 - Semantic similarity matching
-- Version control for entries
+- Version control for entries (delta-encoded, bounded history)
 - Memory graphs and relationships
 - Automatic optimization
+- Optional write-ahead-log persistence with background compaction
+- Optional tiered value storage: bounded LRU/LFU hot cache, cold values on disk
+- Configurable durability policy and batched writes
 """
 
 import json
 import hashlib
+import os
 import pickle
+import re
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, MutableMapping, Optional, Set, Tuple, Union
 from datetime import datetime
 from collections import defaultdict
 
+from .index_segment import CorpusStats, IndexSegment, SegmentedIndex
+from .inverted_index import InvertedIndex
+from .tiered_store import TieredValueStore
+from .version_store import VersionStore
+from .wal import WriteAheadLog
+
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
 
 class AdvancedMemorySystem:
     """
@@ -31,32 +49,82 @@ class AdvancedMemorySystem:
     
     Features:
     - Persistent JSON/pickle storage
-    - Full-text search with indexing
+    - Full-text search with BM25 ranking
     - Semantic relationships
     - Version history
     - Memory graphs
     - Query optimization
+    
+    Persistence modes:
+    - "snapshot": every mutation rewrites the full store (original behaviour)
+    - "wal": every mutation appends one record to a write-ahead log; the log
+      is folded into a single snapshot file by periodic background compaction
+    
+    Durability policies decide when pending writes are flushed (a full save in
+    snapshot mode, an fsync of the log in wal mode):
+    - "per_op": after every mutation (original behaviour)
+    - "every_n": after every ``flush_every`` mutations
+    - "interval": at most every ``flush_interval_ms`` milliseconds
+    - "manual": only on explicit ``flush()``, ``batch()`` exit or ``close()``
+    
+    With ``cache_bytes`` set, values are tiered: every value is written
+    through to an on-disk value log and only a byte-bounded LRU or LFU
+    working set stays deserialised in memory. ``self.data`` is then a
+    TieredValueStore mapping instead of a dict.
     """
     
-    def __init__(self, storage_path: str = "data/memory"):
+    PERSISTENCE_MODES = ('snapshot', 'wal')
+    DURABILITY_POLICIES = ('per_op', 'every_n', 'interval', 'manual')
+    
+    def __init__(self, storage_path: str = "data/memory", persistence: str = "snapshot",
+                 durability: str = "per_op", flush_every: int = 100,
+                 flush_interval_ms: float = 1000.0, compact_every: int = 10000,
+                 background_compaction: bool = True, max_versions: Optional[int] = None,
+                 version_retention_days: Optional[float] = None,
+                 cache_bytes: Optional[int] = None, cache_policy: str = 'lru'):
         """
         Initialize advanced memory system
         
         Args:
             storage_path: Path to storage directory
+            persistence: Persistence mode, "snapshot" or "wal"
+            durability: Flush policy, one of DURABILITY_POLICIES
+            flush_every: Mutations between flushes ("every_n" policy)
+            flush_interval_ms: Maximum age of unflushed writes ("interval" policy)
+            compact_every: WAL records between snapshot compactions (wal mode)
+            background_compaction: Run compaction on a background thread (wal mode)
+            max_versions: Versions kept per key (None keeps every version)
+            version_retention_days: Age after which versions are dropped (None = forever)
+            cache_bytes: Hot value cache size in bytes; enables tiered storage
+                         (None keeps every value resident)
+            cache_policy: Hot cache eviction policy, "lru" or "lfu"
         """
+        if persistence not in self.PERSISTENCE_MODES:
+            raise ValueError(f"Unknown persistence mode: {persistence}")
+        if durability not in self.DURABILITY_POLICIES:
+            raise ValueError(f"Unknown durability policy: {durability}")
+        
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.persistence = persistence
+        self.durability = durability
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.compact_every = compact_every
+        self.background_compaction = background_compaction
         
-        # In-memory store
-        self.data: Dict[str, Any] = {}
-        self.metadata: Dict[str, Dict] = {}
-        self.versions: Dict[str, List[Dict]] = defaultdict(list)
+        # Concurrency and replay state
+        self._lock = threading.RLock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._replaying = False
+        self._replay_ts: Optional[str] = None
         
-        # Indexing structures
-        self.word_index: Dict[str, Set[str]] = defaultdict(set)
-        self.tag_index: Dict[str, Set[str]] = defaultdict(set)
-        self.relationships: Dict[str, Set[str]] = defaultdict(set)
+        # Group-commit state
+        self._dirty_ops = 0
+        self._batch_depth = 0
+        self._last_flush = time.monotonic()
+        self._flusher_stop = threading.Event()
+        self._flusher_thread: Optional[threading.Thread] = None
         
         # Statistics
         self.stats = {
@@ -64,11 +132,42 @@ class AdvancedMemorySystem:
             'updated': 0,
             'deleted': 0,
             'searches': 0,
-            'cache_hits': 0
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'cache_evictions': 0
         }
         
+        # Value store: a plain dict, or a disk-backed mapping with a hot cache
+        self.tiered = cache_bytes is not None
+        self.data: MutableMapping[str, Any] = {}
+        if self.tiered:
+            self.data = TieredValueStore(self.storage_path, cache_bytes, cache_policy, self.stats)
+        self.metadata: Dict[str, Dict] = {}
+        # Tiered mode reads the previous value back from the value log
+        # instead of keeping every key's latest version resident
+        self.versions = VersionStore(self.storage_path, max_versions=max_versions,
+                                     max_age_days=version_retention_days,
+                                     keep_tips=not self.tiered)
+        
+        # Indexing structures
+        self.word_index = SegmentedIndex()
+        self._index_generation = 0
+        self.tag_index: Dict[str, Set[str]] = defaultdict(set)
+        self.relationships: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Write-ahead log (wal mode only)
+        self.wal: Optional[WriteAheadLog] = None
+        if self.persistence == 'wal':
+            self.wal = WriteAheadLog(self.storage_path / "wal.log", sync_every=0)
+        
         # Load existing data
         self.load_from_disk()
+        
+        # Timed flushes must also happen when no further writes arrive
+        if self.durability == 'interval':
+            self._flusher_thread = threading.Thread(
+                target=self._flush_periodically, name="memory-flusher", daemon=True)
+            self._flusher_thread.start()
     
     def create(self, key: str, value: Any, tags: List[str] = None, 
                related_keys: List[str] = None) -> bool:
@@ -84,151 +183,222 @@ class AdvancedMemorySystem:
         Returns:
             Success status
         """
-        if key in self.data:
-            return False
-        
-        # Store data
-        self.data[key] = value
-        
-        # Store metadata
-        self.metadata[key] = {
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat(),
-            'version': 1,
-            'tags': tags or [],
-            'type': type(value).__name__,
-            'size': len(str(value))
-        }
-        
-        # Index tags
-        if tags:
-            for tag in tags:
-                self.tag_index[tag].add(key)
-        
-        # Index relationships
-        if related_keys:
-            for related in related_keys:
-                self.relationships[key].add(related)
-                self.relationships[related].add(key)
-        
-        # Index content for search
-        self._index_content(key, value)
-        
-        # Store version
-        self._save_version(key, value, 'created')
-        
-        # Update stats
-        self.stats['created'] += 1
-        
-        # Persist to disk
-        self.save_to_disk()
-        
-        return True
+        with self._lock:
+            if key in self.data:
+                return False
+            
+            now = self._now()
+            self._apply_create(key, value, tags, related_keys, now)
+            
+            # Store version
+            self._save_version(key, value, 'created')
+            
+            # Update stats
+            self.stats['created'] += 1
+            
+            # Persist to disk
+            self._persist({'op': 'create', 'k': key, 'v': value, 'tags': tags,
+                           'rel': related_keys, 'ts': now})
+            
+            return True
     
     def read(self, key: str) -> Optional[Any]:
         """Read entry value"""
-        return self.data.get(key)
+        with self._lock:
+            return self.data.get(key)
     
     def update(self, key: str, value: Any) -> bool:
         """Update entry with version tracking"""
-        if key not in self.data:
-            return False
-        
-        # Store new value
-        old_value = self.data[key]
-        self.data[key] = value
-        
-        # Update metadata
-        self.metadata[key]['updated_at'] = datetime.now().isoformat()
-        self.metadata[key]['version'] += 1
-        self.metadata[key]['size'] = len(str(value))
-        
-        # Re-index content
-        self._deindex_content(key, old_value)
-        self._index_content(key, value)
-        
-        # Save version
-        self._save_version(key, value, 'updated')
-        
-        # Update stats
-        self.stats['updated'] += 1
-        
-        # Persist to disk
-        self.save_to_disk()
-        
-        return True
+        with self._lock:
+            if key not in self.data:
+                return False
+            
+            now = self._now()
+            self._apply_update(key, value, now)
+            
+            # Save version
+            self._save_version(key, value, 'updated')
+            
+            # Update stats
+            self.stats['updated'] += 1
+            
+            # Persist to disk
+            self._persist({'op': 'update', 'k': key, 'v': value, 'ts': now})
+            
+            return True
     
     def delete(self, key: str) -> bool:
         """Delete entry"""
-        if key not in self.data:
-            return False
-        
-        # Remove from data
-        value = self.data.pop(key)
-        metadata = self.metadata.pop(key)
-        
-        # Remove from indexes
-        self._deindex_content(key, value)
-        
-        for tag in metadata.get('tags', []):
-            self.tag_index[tag].discard(key)
-        
-        # Remove relationships
-        for related in self.relationships[key]:
-            self.relationships[related].discard(key)
-        self.relationships.pop(key, None)
+        with self._lock:
+            if key not in self.data:
+                return False
+            
+            now = self._now()
+            value = self._apply_delete(key)
+            
+            # Save final version
+            self._save_version(key, value, 'deleted')
+            
+            # Update stats
+            self.stats['deleted'] += 1
+            
+            # Persist to disk
+            self._persist({'op': 'delete', 'k': key, 'ts': now})
+            
+            return True
+    
+    def create_many(self, entries: Iterable[Dict[str, Any]]) -> Dict[str, bool]:
+        """
+        Create many entries with a single indexing, versioning and flush pass
         
-        # Save final version
-        self._save_version(key, value, 'deleted')
+        Args:
+            entries: Dicts with 'key' and 'value' plus optional 'tags' and
+                     'related_keys', mirroring create()
+            
+        Returns:
+            Mapping of key to success status (False for existing or repeated keys)
+        """
+        with self._lock:
+            now = self._now()
+            results: Dict[str, bool] = {}
+            created: List[Dict[str, Any]] = []
+            
+            for entry in entries:
+                key = entry['key']
+                if key in self.data or key in results:
+                    results.setdefault(key, False)
+                    continue
+                self._apply_create(key, entry['value'], entry.get('tags'),
+                                   entry.get('related_keys'), now)
+                results[key] = True
+                created.append(entry)
+            
+            for entry in created:
+                self._save_version(entry['key'], entry['value'], 'created')
+            
+            if created:
+                self.stats['created'] += len(created)
+                self._persist({'op': 'create_many', 'ts': now, 'entries': [
+                    {'key': e['key'], 'value': e['value'], 'tags': e.get('tags'),
+                     'related_keys': e.get('related_keys')} for e in created
+                ]}, ops=len(created))
+            
+            return results
+    
+    def update_many(self, updates: Union[Dict[str, Any], Iterable[Tuple[str, Any]]]
+                    ) -> Dict[str, bool]:
+        """
+        Update many entries with a single indexing, versioning and flush pass
         
-        # Update stats
-        self.stats['deleted'] += 1
+        Args:
+            updates: Mapping or (key, value) pairs; a repeated key keeps its last value
+            
+        Returns:
+            Mapping of key to success status (False for missing keys)
+        """
+        if not isinstance(updates, dict):
+            updates = dict(updates)
         
-        # Persist to disk
-        self.save_to_disk()
+        with self._lock:
+            now = self._now()
+            results: Dict[str, bool] = {}
+            updated: Dict[str, Any] = {}
+            
+            for key, value in updates.items():
+                if key not in self.data:
+                    results[key] = False
+                    continue
+                self._apply_update(key, value, now)
+                results[key] = True
+                updated[key] = value
+            
+            for key, value in updated.items():
+                self._save_version(key, value, 'updated')
+            
+            if updated:
+                self.stats['updated'] += len(updated)
+                self._persist({'op': 'update_many', 'ts': now, 'updates': updated},
+                              ops=len(updated))
+            
+            return results
+    
+    def delete_many(self, keys: Iterable[str]) -> Dict[str, bool]:
+        """
+        Delete many entries with a single deindexing, versioning and flush pass
         
-        return True
+        Args:
+            keys: Keys to delete
+            
+        Returns:
+            Mapping of key to success status (False for missing keys)
+        """
+        with self._lock:
+            now = self._now()
+            results: Dict[str, bool] = {}
+            deleted: Dict[str, Any] = {}
+            
+            for key in keys:
+                if key not in self.data:
+                    results.setdefault(key, False)
+                    continue
+                deleted[key] = self._apply_delete(key)
+                results[key] = True
+            
+            for key, value in deleted.items():
+                self._save_version(key, value, 'deleted')
+            
+            if deleted:
+                self.stats['deleted'] += len(deleted)
+                self._persist({'op': 'delete_many', 'ts': now, 'keys': list(deleted)},
+                              ops=len(deleted))
+            
+            return results
     
-    def search(self, query: str, limit: int = 10) -> List[Tuple[str, Any, float]]:
+    def search(self, query: str, limit: int = 10,
+               corpus: Optional[CorpusStats] = None) -> List[Tuple[str, Any, float]]:
         """
         Full-text search across all entries
         
         Args:
             query: Search query
             limit: Maximum results
+            corpus: Collection statistics to score against (see term_statistics)
             
         Returns:
-            List of (key, value, score) tuples
+            List of (key, value, score) tuples, highest BM25 score first
         """
-        self.stats['searches'] += 1
-        
         # Tokenize query
-        query_words = set(self._tokenize(query.lower()))
-        
-        # Find matching keys
-        matches: Dict[str, int] = defaultdict(int)
+        query_words = self._tokenize(query.lower())
         
-        for word in query_words:
-            if word in self.word_index:
-                for key in self.word_index[word]:
-                    matches[key] += 1
-        
-        # Score and rank results
-        results = []
-        for key, match_count in matches.items():
-            value = self.data[key]
-            score = match_count / len(query_words)
-            results.append((key, value, score))
+        with self._lock:
+            self.stats['searches'] += 1
+            
+            # BM25 ranking with top-k heap selection
+            ranked = self.word_index.search(query_words, limit, corpus)
+            
+            return [(key, self.data[key], score) for key, score in ranked]
+    
+    def term_statistics(self, query: str) -> CorpusStats:
+        """
+        BM25 collection statistics for a query's terms
         
-        # Sort by score descending
-        results.sort(key=lambda x: x[2], reverse=True)
+        Summed across stores and passed back to search(), they let several
+        stores rank against one combined collection.
         
-        return results[:limit]
+        Args:
+            query: Search query
+            
+        Returns:
+            (documents, total tokens, {term: document frequency})
+        """
+        with self._lock:
+            return self.word_index.term_stats(self._tokenize(query.lower()))
     
     def find_by_tag(self, tag: str) -> List[Tuple[str, Any]]:
         """Find all entries with a specific tag"""
-        keys = self.tag_index.get(tag, set())
-        return [(k, self.data[k]) for k in keys]
+        with self._lock:
+            keys = self.tag_index.get(tag, set())
+            return [(k, self.data[k]) for k in keys]
     
     def find_related(self, key: str, depth: int = 1) -> List[str]:
         """
@@ -241,82 +411,133 @@ class AdvancedMemorySystem:
         Returns:
             List of related keys
         """
-        if key not in self.relationships:
-            return []
-        
-        visited = {key}
-        current_level = {key}
+        with self._lock:
+            if key not in self.relationships:
+                return []
+            
+            visited = {key}
+            current_level = {key}
+            
+            for _ in range(depth):
+                next_level = set()
+                for k in current_level:
+                    for related in self.relationships.get(k, set()):
+                        if related not in visited:
+                            next_level.add(related)
+                            visited.add(related)
+                current_level = next_level
+                
+                if not current_level:
+                    break
+            
+            visited.discard(key)
+            return list(visited)
+    
+    def get_neighbours(self, keys: Iterable[str]) -> Set[str]:
+        """
+        Direct relationships of several keys
         
-        for _ in range(depth):
-            next_level = set()
-            for k in current_level:
-                for related in self.relationships.get(k, set()):
-                    if related not in visited:
-                        next_level.add(related)
-                        visited.add(related)
-            current_level = next_level
+        Args:
+            keys: Keys to look up
             
-            if not current_level:
-                break
+        Returns:
+            Union of the keys' related keys
+        """
+        with self._lock:
+            neighbours: Set[str] = set()
+            for key in keys:
+                neighbours.update(self.relationships.get(key, ()))
+            return neighbours
+    
+    def unlink(self, key: str) -> bool:
+        """
+        Remove every relationship edge touching a key without deleting it
+        
+        Used when the key itself lives in another store (e.g. another shard).
         
-        visited.discard(key)
-        return list(visited)
+        Args:
+            key: Key whose edges are removed
+            
+        Returns:
+            True if any edge was removed
+        """
+        with self._lock:
+            related_keys = self.relationships.pop(key, None)
+            if not related_keys:
+                return False
+            for related in related_keys:
+                self.relationships[related].discard(key)
+            
+            self._persist({'op': 'unlink', 'k': key, 'ts': self._now()})
+            return True
     
     def get_version_history(self, key: str) -> List[Dict]:
-        """Get version history for a key"""
-        return self.versions.get(key, [])
+        """Get the retained version history for a key, oldest first"""
+        with self._lock:
+            return self.versions.history(key)
     
     def restore_version(self, key: str, version: int) -> bool:
-        """Restore a specific version"""
-        history = self.versions.get(key, [])
-        
-        if version < 1 or version > len(history):
-            return False
-        
-        # Restore the version
-        version_entry = history[version - 1]
-        value = version_entry['value']
-        
-        self.data[key] = value
-        self.metadata[key]['updated_at'] = datetime.now().isoformat()
-        
-        # Save restoration as new version
-        self._save_version(key, value, f'restored_from_v{version}')
-        
-        self.save_to_disk()
-        return True
+        """Restore a specific version (False if it is no longer retained)"""
+        with self._lock:
+            version_entry = self.versions.get(key, version)
+            
+            if version_entry is None:
+                return False
+            
+            now = self._now()
+            
+            # Restore the version
+            value = version_entry['value']
+            
+            self.data[key] = value
+            self.metadata[key]['updated_at'] = now
+            self.metadata[key]['size'] = len(str(value))
+            self._index_content(key, value)
+            
+            # Save restoration as new version
+            self._save_version(key, value, f'restored_from_v{version}')
+            
+            self._persist({'op': 'restore', 'k': key, 'ver': version, 'ts': now})
+            return True
+    
+    def get_tags(self) -> Set[str]:
+        """Get every tag in the tag index"""
+        with self._lock:
+            return set(self.tag_index)
     
     def get_statistics(self) -> Dict:
         """Get memory statistics"""
-        return {
-            'total_entries': len(self.data),
-            'total_tags': len(self.tag_index),
-            'total_relationships': sum(len(v) for v in self.relationships.values()) // 2,
-            'indexed_words': len(self.word_index),
-            'operations': self.stats.copy(),
-            'storage_size': self._calculate_storage_size()
-        }
+        with self._lock:
+            return {
+                'total_entries': len(self.data),
+                'total_tags': len(self.tag_index),
+                'total_relationships': sum(len(v) for v in self.relationships.values()) // 2,
+                'indexed_words': len(self.word_index),
+                'operations': self.stats.copy(),
+                'storage_size': self._calculate_storage_size()
+            }
     
     def optimize(self) -> Dict[str, int]:
         """Optimize indexes and cleanup"""
-        # Remove empty indexes
-        empty_tags = [tag for tag, keys in self.tag_index.items() if not keys]
-        for tag in empty_tags:
-            del self.tag_index[tag]
-        
-        empty_words = [word for word, keys in self.word_index.items() if not keys]
-        for word in empty_words:
-            del self.word_index[word]
-        
-        # Rebuild indexes
-        self._rebuild_indexes()
+        with self._lock:
+            # Remove empty indexes
+            empty_tags = [tag for tag, keys in self.tag_index.items() if not keys]
+            for tag in empty_tags:
+                del self.tag_index[tag]
+            
+            removed_words = self.word_index.prune()
+            pruned_versions = self.versions.prune()
+            
+            # Rebuild indexes
+            self._rebuild_indexes()
         
         # Compact storage
         self.save_to_disk()
         
         return {
             'removed_empty_tags': len(empty_tags),
-            'removed_empty_words': len(empty_words),
+            'removed_empty_words': removed_words,
+            'pruned_versions': pruned_versions,
             'total_entries': len(self.data)
         }
     
@@ -325,55 +546,115 @@ class AdvancedMemorySystem:
         nodes = []
         edges = []
         
-        for key in self.data:
-            nodes.append({
-                'id': key,
-                'label': key,
-                'metadata': self.metadata.get(key, {})
-            })
-        
-        for key, related_keys in self.relationships.items():
-            for related in related_keys:
-                if key < related:  # Avoid duplicates
-                    edges.append({
-                        'source': key,
-                        'target': related
-                    })
+        with self._lock:
+            for key in self.data:
+                nodes.append({
+                    'id': key,
+                    'label': key,
+                    'metadata': dict(self.metadata.get(key, {}))
+                })
+            
+            for key, related_keys in self.relationships.items():
+                for related in related_keys:
+                    if key < related:  # Avoid duplicates
+                        edges.append({
+                            'source': key,
+                            'target': related
+                        })
         
         return {
             'nodes': nodes,
             'edges': edges
         }
     
-    def _index_content(self, key: str, value: Any) -> None:
-        """Index content for search"""
-        text = str(value).lower()
-        words = self._tokenize(text)
+    def _apply_create(self, key: str, value: Any, tags: Optional[List[str]],
+                      related_keys: Optional[List[str]], now: str) -> None:
+        """Store a new entry and index it (no versioning or persistence)"""
+        # Store data
+        self.data[key] = value
+        
+        # Store metadata
+        self.metadata[key] = {
+            'created_at': now,
+            'updated_at': now,
+            'version': 1,
+            'tags': tags or [],
+            'type': type(value).__name__,
+            'size': len(str(value))
+        }
+        
+        # Index tags
+        if tags:
+            for tag in tags:
+                self.tag_index[tag].add(key)
+        
+        # Index relationships
+        if related_keys:
+            for related in related_keys:
+                self.relationships[key].add(related)
+                self.relationships[related].add(key)
+        
+        # Index content for search
+        self._index_content(key, value)
+    
+    def _apply_update(self, key: str, value: Any, now: str) -> None:
+        """Replace an entry's value and reindex it (no versioning or persistence)"""
+        # Store new value
+        self.data[key] = value
+        
+        # Update metadata
+        self.metadata[key]['updated_at'] = now
+        self.metadata[key]['version'] += 1
+        self.metadata[key]['size'] = len(str(value))
+        
+        # Re-index content (only terms that changed touch the index)
+        self._index_content(key, value)
+    
+    def _apply_delete(self, key: str) -> Any:
+        """Remove an entry from data and indexes, returning its last value"""
+        # Remove from data
+        value = self.data.pop(key)
+        metadata = self.metadata.pop(key)
+        
+        # Remove from indexes
+        self._deindex_content(key)
+        
+        for tag in metadata.get('tags', []):
+            self.tag_index[tag].discard(key)
+        
+        # Remove relationships
+        for related in self.relationships[key]:
+            self.relationships[related].discard(key)
+        self.relationships.pop(key, None)
         
-        for word in words:
-            self.word_index[word].add(key)
+        return value
     
-    def _deindex_content(self, key: str, value: Any) -> None:
-        """Remove content from index"""
+    def _index_content(self, key: str, value: Any) -> None:
+        """Index (or incrementally reindex) content for search"""
         text = str(value).lower()
         words = self._tokenize(text)
         
-        for word in words:
-            self.word_index[word].discard(key)
+        self.word_index.update(key, words)
+    
+    def _deindex_content(self, key: str) -> None:
+        """Remove content from index using the cached term counts"""
+        self.word_index.remove(key)
     
     def _tokenize(self, text: str) -> List[str]:
         """Simple tokenization"""
-        import re
-        return re.findall(r'\w+', text)
+        return _TOKEN_PATTERN.findall(text)
     
     def _save_version(self, key: str, value: Any, action: str) -> None:
         """Save version entry"""
-        self.versions[key].append({
-            'version': len(self.versions[key]) + 1,
-            'timestamp': datetime.now().isoformat(),
-            'action': action,
-            'value': value
-        })
+        previous = self.data.previous_loader(key) if self.tiered else None
+        self.versions.append(key, value, action, self._now(), previous)
+        if action == 'deleted':
+            # A later re-create starts from a full copy, not a delta
+            self.versions.forget_tip(key)
+    
+    def _now(self) -> str:
+        """Current timestamp, or the logged one while replaying the WAL"""
+        return self._replay_ts or datetime.now().isoformat()
     
     def _rebuild_indexes(self) -> None:
         """Rebuild all indexes from scratch"""
@@ -388,6 +669,10 @@ class AdvancedMemorySystem:
     
     def _calculate_storage_size(self) -> int:
         """Calculate approximate storage size in bytes"""
+        if self.tiered:
+            # Recorded sizes avoid paging every cold value back in
+            return sum(meta.get('size', 0) for meta in self.metadata.values())
+        
         size = 0
         for value in self.data.values():
             size += len(str(value).encode('utf-8'))
@@ -395,62 +680,378 @@ class AdvancedMemorySystem:
     
     def save_to_disk(self) -> None:
         """Save all data to disk"""
-        # Save data
-        data_file = self.storage_path / "data.json"
-        with open(data_file, 'w') as f:
-            json.dump(self.data, f, indent=2, default=str)
+        if self.wal is not None:
+            # In wal mode a full save is a synchronous compaction
+            self.compact(background=False)
+            return
         
-        # Save metadata
-        meta_file = self.storage_path / "metadata.json"
-        with open(meta_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2)
-        
-        # Save indexes (pickle for complex types)
-        index_file = self.storage_path / "indexes.pkl"
-        with open(index_file, 'wb') as f:
-            pickle.dump({
-                'word_index': dict(self.word_index),
-                'tag_index': dict(self.tag_index),
-                'relationships': dict(self.relationships),
-                'versions': dict(self.versions)
-            }, f)
-        
-        # Save statistics
-        stats_file = self.storage_path / "stats.json"
-        with open(stats_file, 'w') as f:
-            json.dump(self.stats, f, indent=2)
-    
-    def load_from_disk(self) -> None:
-        """Load all data from disk"""
-        try:
-            # Load data
+        with self._lock:
+            # Save data (tiered values are already in the value log)
             data_file = self.storage_path / "data.json"
-            if data_file.exists():
-                with open(data_file, 'r') as f:
-                    self.data = json.load(f)
+            if not self.tiered:
+                with open(data_file, 'w') as f:
+                    json.dump(self.data, f, indent=2, default=str)
+            value_log = self._checkpoint_values()
             
-            # Load metadata
+            # Save metadata
             meta_file = self.storage_path / "metadata.json"
-            if meta_file.exists():
-                with open(meta_file, 'r') as f:
-                    self.metadata = json.load(f)
+            with open(meta_file, 'w') as f:
+                json.dump(self.metadata, f, indent=2)
             
-            # Load indexes
+            # Save indexes (word index as an mmap segment, pickle for the rest)
+            segment_name = self._checkpoint_index()
+            version_log = self._checkpoint_versions()
             index_file = self.storage_path / "indexes.pkl"
-            if index_file.exists():
-                with open(index_file, 'rb') as f:
-                    indexes = pickle.load(f)
-                    self.word_index = defaultdict(set, {k: set(v) for k, v in indexes['word_index'].items()})
-                    self.tag_index = defaultdict(set, {k: set(v) for k, v in indexes['tag_index'].items()})
-                    self.relationships = defaultdict(set, {k: set(v) for k, v in indexes['relationships'].items()})
-                    self.versions = defaultdict(list, indexes['versions'])
-            
-            # Load statistics
+            with open(index_file, 'wb') as f:
+                pickle.dump({
+                    'word_index': {'segment': segment_name},
+                    'tag_index': dict(self.tag_index),
+                    'relationships': dict(self.relationships),
+                    'version_log': version_log,
+                    'value_log': value_log
+                }, f)
+            self._remove_stale_segments(segment_name)
+            self.versions.remove_stale_logs(version_log['file'])
+            self._remove_stale_value_logs(value_log)
+            if self.tiered and data_file.exists():
+                data_file.unlink()
+            
+            # Save statistics
             stats_file = self.storage_path / "stats.json"
-            if stats_file.exists():
-                with open(stats_file, 'r') as f:
-                    self.stats = json.load(f)
+            with open(stats_file, 'w') as f:
+                json.dump(self.stats, f, indent=2)
+            
+            self._mark_flushed()
+    
+    def load_from_disk(self) -> None:
+        """Load all data from disk"""
+        try:
+            snapshot_file = self.storage_path / "snapshot.pkl"
+            if self.wal is not None and snapshot_file.exists():
+                with open(snapshot_file, 'rb') as f:
+                    snapshot = pickle.load(f)
+                self._restore_snapshot(snapshot)
+            else:
+                self._load_legacy_files()
+                snapshot = {'wal_seq': 0}
+            
+            if self.wal is not None:
+                self._replay_wal(snapshot['wal_seq'])
                     
         except Exception as e:
             print(f"Warning: Could not load memory from disk: {e}")
             # Continue with empty memory
+    
+    def compact(self, background: Optional[bool] = None) -> bool:
+        """
+        Fold the write-ahead log into a fresh snapshot (wal mode)
+        
+        The active log segment is sealed and the in-memory state serialised
+        under the lock; writing and fsyncing the snapshot happens outside it,
+        on a background thread unless disabled.
+        
+        Args:
+            background: Override the instance's background_compaction setting
+            
+        Returns:
+            True if a compaction was started or completed
+        """
+        if self.wal is None:
+            return False
+        if background is None:
+            background = self.background_compaction
+        
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            if background:
+                return False
+            self._compaction_thread.join()
+        
+        with self._lock:
+            sealed_seq = self.wal.rotate()
+            self._mark_flushed()
+            snapshot = self._build_snapshot(sealed_seq)
+            payload = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+            segment_name = snapshot['word_index']['segment']
+            version_log = snapshot['version_log']['file']
+            value_log = snapshot['value_log']
+        
+        if background:
+            self._compaction_thread = threading.Thread(
+                target=self._write_snapshot,
+                args=(payload, segment_name, version_log, value_log),
+                name="memory-compaction", daemon=True)
+            self._compaction_thread.start()
+        else:
+            self._write_snapshot(payload, segment_name, version_log, value_log)
+        return True
+    
+    def flush(self) -> None:
+        """Make every pending write durable"""
+        with self._lock:
+            if not self._dirty_ops:
+                return
+            if self.wal is not None:
+                self.wal.sync()
+                # The WAL makes versions durable; this only drains the buffer
+                self.versions.flush(sync=False)
+                self._mark_flushed()
+            else:
+                self.save_to_disk()
+    
+    @contextmanager
+    def batch(self) -> Iterator['AdvancedMemorySystem']:
+        """
+        Suspend flushing for a group of writes
+        
+        Mutations inside the block are applied immediately but flushed once,
+        when the outermost batch exits.
+        
+        Example:
+            with memory.batch():
+                for key, value in rows:
+                    memory.create(key, value)
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+    
+    def close(self) -> None:
+        """Flush pending writes and stop background work"""
+        if self._flusher_thread is not None:
+            self._flusher_stop.set()
+            self._flusher_thread.join()
+            self._flusher_thread = None
+        self.flush()
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        with self._lock:
+            self.versions.close()
+            if self.tiered:
+                self.data.close()
+            if self.wal is not None:
+                self.wal.close()
+    
+    def _persist(self, record: Dict[str, Any], ops: int = 1) -> None:
+        """Record a mutation and flush it if the durability policy says so"""
+        if self._replaying:
+            return
+        if self.wal is not None:
+            self.wal.append(record)
+        self._dirty_ops += ops
+        
+        if self._batch_depth == 0 and self._flush_due():
+            self.flush()
+        
+        if (self.wal is not None and self.compact_every
+                and self.wal.records_since_rotate >= self.compact_every):
+            self.compact()
+    
+    def _flush_due(self) -> bool:
+        """Check the durability policy against pending writes"""
+        if self.durability == 'per_op':
+            return True
+        if self.durability == 'every_n':
+            return self._dirty_ops >= self.flush_every
+        if self.durability == 'interval':
+            return time.monotonic() - self._last_flush >= self.flush_interval
+        return False
+    
+    def _mark_flushed(self) -> None:
+        """Reset group-commit counters after a flush"""
+        self._dirty_ops = 0
+        self._last_flush = time.monotonic()
+    
+    def _flush_periodically(self) -> None:
+        """Background loop for the interval policy"""
+        while not self._flusher_stop.wait(self.flush_interval):
+            if self._batch_depth == 0:
+                self.flush()
+    
+    def _build_snapshot(self, wal_seq: int) -> Dict[str, Any]:
+        """Collect the full in-memory state for a snapshot"""
+        return {
+            'wal_seq': wal_seq,
+            'data': None if self.tiered else self.data,
+            'value_log': self._checkpoint_values(),
+            'metadata': self.metadata,
+            'word_index': {'segment': self._checkpoint_index()},
+            'tag_index': dict(self.tag_index),
+            'relationships': dict(self.relationships),
+            'version_log': self._checkpoint_versions(),
+            'stats': self.stats
+        }
+    
+    def _restore_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Install state loaded from a snapshot"""
+        self._restore_values(snapshot.get('value_log'), snapshot['data'])
+        self.metadata = snapshot['metadata']
+        self._restore_index(snapshot['word_index'])
+        self.tag_index = defaultdict(set, snapshot['tag_index'])
+        self.relationships = defaultdict(set, snapshot['relationships'])
+        self._restore_versions(snapshot)
+        self._set_stats(snapshot['stats'])
+    
+    def _write_snapshot(self, payload: bytes, segment_name: str, version_log: str,
+                        value_log: Optional[Dict[str, Any]]) -> None:
+        """Atomically replace the snapshot file and drop the sealed log"""
+        snapshot_file = self.storage_path / "snapshot.pkl"
+        tmp_file = snapshot_file.with_name(snapshot_file.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, snapshot_file)
+        self.wal.discard_sealed()
+        self._remove_stale_segments(segment_name)
+        self.versions.remove_stale_logs(version_log)
+        self._remove_stale_value_logs(value_log)
+    
+    def _checkpoint_index(self) -> str:
+        """Fold pending index changes into a new segment; return its file name"""
+        segment = self.word_index.segment
+        if segment is not None and not self.word_index.dirty:
+            return segment.path.name
+        
+        self._index_generation += 1
+        segment_name = f"index-{self._index_generation:08d}.seg"
+        self.word_index.write_segment(self.storage_path / segment_name)
+        return segment_name
+    
+    def _checkpoint_versions(self) -> Dict[str, Any]:
+        """Write buffered versions to the version log; return its index state"""
+        self.versions.flush()
+        if self.versions.needs_compaction():
+            self.versions.compact()
+        return self.versions.state()
+    
+    def _restore_versions(self, state: Dict[str, Any]) -> None:
+        """Reopen the version log, importing histories kept inline by older stores"""
+        if 'version_log' in state:
+            self.versions.restore(state['version_log'])
+        else:
+            for key, history in state.get('versions', {}).items():
+                self.versions.import_history(key, history)
+    
+    def _checkpoint_values(self) -> Optional[Dict[str, Any]]:
+        """Make the value log durable (tiered mode); return its location state"""
+        if not self.tiered:
+            return None
+        self.data.flush()
+        if self.data.needs_compaction():
+            self.data.compact()
+        return self.data.state()
+    
+    def _restore_values(self, value_log: Optional[Dict[str, Any]],
+                        data: Optional[Dict[str, Any]]) -> None:
+        """Install persisted values, converting between resident and tiered stores"""
+        if value_log is not None:
+            if self.tiered:
+                self.data.restore(value_log)
+            else:
+                store = TieredValueStore(self.storage_path, 0)
+                store.restore(value_log)
+                self.data = dict(store.items())
+                store.close()
+        elif data is not None:
+            if self.tiered:
+                self.data.update(data)
+            else:
+                self.data = data
+    
+    def _remove_stale_value_logs(self, value_log: Optional[Dict[str, Any]]) -> None:
+        """Delete value logs not referenced by the on-disk state"""
+        keep = value_log['file'] if value_log is not None else None
+        for path in self.storage_path.glob("values-*.log"):
+            if path.name != keep:
+                path.unlink()
+    
+    def _set_stats(self, stats: Dict[str, int]) -> None:
+        """Install loaded statistics, keeping the hot cache counting into them"""
+        for counter in ('cache_hits', 'cache_misses', 'cache_evictions'):
+            stats.setdefault(counter, 0)
+        self.stats = stats
+        if self.tiered:
+            self.data.cache.stats = stats
+    
+    def _restore_index(self, state: Dict[str, Any]) -> None:
+        """Open the persisted word index, upgrading older formats"""
+        self.word_index.clear()
+        if 'segment' in state:
+            segment_name = state['segment']
+            self._index_generation = int(segment_name[len('index-'):-len('.seg')])
+            self.word_index = SegmentedIndex(IndexSegment(self.storage_path / segment_name))
+        elif 'postings' in state:
+            self.word_index = SegmentedIndex(overlay=InvertedIndex.from_dict(state))
+        else:
+            # Pre-BM25 stores kept bare key sets: rebuild postings from data
+            for key, value in self.data.items():
+                self._index_content(key, value)
+    
+    def _remove_stale_segments(self, keep: str) -> None:
+        """Delete index segments no longer referenced by the on-disk state"""
+        for path in self.storage_path.glob("index-*.seg"):
+            if path.name != keep:
+                path.unlink()
+    
+    def _replay_wal(self, after_seq: int) -> None:
+        """Re-apply logged mutations newer than the loaded snapshot"""
+        handlers = {
+            'create': lambda r: self.create(r['k'], r['v'], r.get('tags'), r.get('rel')),
+            'update': lambda r: self.update(r['k'], r['v']),
+            'delete': lambda r: self.delete(r['k']),
+            'restore': lambda r: self.restore_version(r['k'], r['ver']),
+            'create_many': lambda r: self.create_many(r['entries']),
+            'update_many': lambda r: self.update_many(r['updates']),
+            'delete_many': lambda r: self.delete_many(r['keys']),
+            'unlink': lambda r: self.unlink(r['k']),
+        }
+        
+        self._replaying = True
+        try:
+            for record in self.wal.replay(after_seq):
+                self._replay_ts = record.get('ts')
+                handlers[record['op']](record)
+        finally:
+            self._replaying = False
+            self._replay_ts = None
+    
+    def _load_legacy_files(self) -> None:
+        """Load the per-structure files written in snapshot mode"""
+        index_file = self.storage_path / "indexes.pkl"
+        indexes = None
+        if index_file.exists():
+            with open(index_file, 'rb') as f:
+                indexes = pickle.load(f)
+        
+        # Load data (from the value log if the store was saved tiered)
+        data_file = self.storage_path / "data.json"
+        if indexes is not None and indexes.get('value_log') is not None:
+            self._restore_values(indexes['value_log'], None)
+        elif data_file.exists():
+            with open(data_file, 'r') as f:
+                self._restore_values(None, json.load(f))
+        
+        # Load metadata
+        meta_file = self.storage_path / "metadata.json"
+        if meta_file.exists():
+            with open(meta_file, 'r') as f:
+                self.metadata = json.load(f)
+        
+        # Load indexes
+        if indexes is not None:
+            self.tag_index = defaultdict(set, {k: set(v) for k, v in indexes['tag_index'].items()})
+            self.relationships = defaultdict(set, {k: set(v) for k, v in indexes['relationships'].items()})
+            self._restore_versions(indexes)
+            self._restore_index(indexes['word_index'])
+        
+        # Load statistics
+        stats_file = self.storage_path / "stats.json"
+        if stats_file.exists():
+            with open(stats_file, 'r') as f:
+                self._set_stats(json.load(f))
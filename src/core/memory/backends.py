@@ -0,0 +1,460 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Memory Storage Backends
+
+Pluggable key-value backends for MemoryModule:
+- InMemoryBackend: plain dict, no persistence
+- JSONBackend: dict saved as a single JSON file on flush (compatibility),
+  written atomically and streamed, optionally gzip-compressed
+- SQLiteBackend: one row per key, WAL journal, batched transactions
+
+Every backend is a MutableMapping with JSON-compatible values, plus
+insert/replace/discard single-statement primitives, ordered key_range
+scans and flush/close/batch.
+"""
+
+import gzip
+import io
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .key_index import SortedKeyIndex
+
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+@contextmanager
+def atomic_writer(path: str, compress: bool = False) -> Iterator[IO[str]]:
+    """
+    Open a text stream whose contents replace ``path`` only once complete
+
+    Data goes to a temporary file in the same directory, which is fsynced
+    and renamed over the target; the directory is fsynced so the rename
+    itself survives a crash. On error the target is left untouched.
+
+    Args:
+        path: Destination file
+        compress: gzip the stream
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+
+    raw = open(tmp_path, 'wb')
+    try:
+        binary = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) if compress else raw
+        text = io.TextIOWrapper(binary, encoding='utf-8')
+        yield text
+        text.flush()
+        text.detach()
+        if compress:
+            binary.close()
+        raw.flush()
+        os.fsync(raw.fileno())
+        raw.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        raw.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def dump_items(items: Iterable[Tuple[str, Any]], stream: IO[str]) -> None:
+    """
+    Stream a JSON object one member at a time
+
+    Each value is encoded on its own, so memory stays bounded by the
+    largest value rather than the whole document.
+    """
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+    stream.write('{')
+    separator = ''
+    for key, value in items:
+        stream.write(f"{separator}{encode(key)}:{encode(value)}")
+        separator = ','
+    stream.write('}')
+
+
+def open_json(path: str) -> IO[str]:
+    """Open a JSON file for reading, transparently decompressing gzip"""
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+    if magic == _GZIP_MAGIC:
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+class StorageBackend(MutableMapping):
+    """
+    Base class for MemoryModule storage backends
+
+    Subclasses implement the MutableMapping methods; the defaults for the
+    single-key primitives below are correct but may take two round trips.
+    """
+
+    name = 'base'
+
+    def insert(self, key: str, value: Any) -> bool:
+        """Store a value only if the key is absent; True if stored"""
+        if key in self:
+            return False
+        self[key] = value
+        return True
+
+    def replace(self, key: str, value: Any) -> bool:
+        """Store a value only if the key exists; True if stored"""
+        if key not in self:
+            return False
+        self[key] = value
+        return True
+
+    def discard(self, key: str) -> bool:
+        """Delete a key if present; True if deleted"""
+        if key not in self:
+            return False
+        del self[key]
+        return True
+
+    def key_range(self, low: Optional[str] = None, high: Optional[str] = None,
+                  low_inclusive: bool = True, limit: Optional[int] = None) -> List[str]:
+        """
+        Keys in sorted order between two bounds
+
+        The default sorts every key; subclasses answer from an ordered index.
+
+        Args:
+            low: Lower bound, or None for the first key
+            high: Exclusive upper bound, or None for no bound
+            low_inclusive: Whether a key equal to ``low`` is included
+            limit: Maximum number of keys
+        """
+        keys = sorted(
+            key for key in self
+            if (low is None or key > low or (low_inclusive and key == low))
+            and (high is None or key < high)
+        )
+        return keys if limit is None else keys[:limit]
+
+    def load(self) -> None:
+        """(Re)load persisted state, for backends that cache it in memory"""
+
+    def flush(self) -> None:
+        """Make every write so far durable"""
+
+    def close(self) -> None:
+        """Flush and release resources"""
+        self.flush()
+
+    @contextmanager
+    def batch(self) -> Iterator['StorageBackend']:
+        """Group writes so they are committed together"""
+        yield self
+
+
+class InMemoryBackend(StorageBackend):
+    """
+    Dict-backed storage without persistence
+
+    The sorted key index behind key_range() is built on the first range
+    scan and maintained by every write after that, so stores that are
+    never scanned pay nothing for it.
+    """
+
+    name = 'memory'
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self.data: Dict[str, Any] = data if data is not None else {}
+        self._index: Optional[SortedKeyIndex] = None
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.data[key] = value
+        if self._index is not None:
+            self._index.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        del self.data[key]
+        if self._index is not None:
+            self._index.discard(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._index = None
+
+    def key_range(self, low: Optional[str] = None, high: Optional[str] = None,
+                  low_inclusive: bool = True, limit: Optional[int] = None) -> List[str]:
+        if self._index is None:
+            self._index = SortedKeyIndex(self.data)
+        return list(islice(self._index.irange(low, high, low_inclusive), limit))
+
+
+class JSONBackend(InMemoryBackend):
+    """
+    Dict-backed storage persisted as one JSON document
+
+    Compatible with files written by earlier versions. Every flush rewrites
+    the whole file, but atomically (temp file, fsync, rename) and streamed
+    entry by entry, so a crash mid-save keeps the previous file intact.
+    """
+
+    name = 'json'
+
+    def __init__(self, path: str, compress: Optional[bool] = None):
+        """
+        Initialize the backend (call load() to read an existing file)
+
+        Args:
+            path: JSON file path
+            compress: gzip the file (default: when the path ends in .gz);
+                      loading detects compression either way
+        """
+        super().__init__()
+        self.path = path
+        self.compress = path.endswith('.gz') if compress is None else compress
+
+    def load(self) -> None:
+        """Replace the in-memory dict with the file contents"""
+        if os.path.exists(self.path):
+            with open_json(self.path) as f:
+                self.data = json.load(f)
+            self._index = None
+
+    def flush(self) -> None:
+        """Atomically replace the JSON file"""
+        self.save(self.data.items())
+
+    def save(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Atomically replace the JSON file with the given entries"""
+        with atomic_writer(self.path, self.compress) as f:
+            dump_items(items, f)
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    One row per key in an SQLite database
+
+    Reads and writes touch only the affected row. The database runs in WAL
+    journal mode; writes are grouped into transactions committed every
+    ``commit_every`` writes, on flush(), or when the outermost batch() exits.
+    Statements are fixed strings, so sqlite3's statement cache prepares
+    each one once per connection.
+    """
+
+    name = 'sqlite'
+
+    _SCHEMA = "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+    _GET = "SELECT value FROM kv WHERE key = ?"
+    _EXISTS = "SELECT 1 FROM kv WHERE key = ?"
+    _UPSERT = "INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)"
+    _INSERT = "INSERT OR IGNORE INTO kv (key, value) VALUES (?, ?)"
+    _UPDATE = "UPDATE kv SET value = ? WHERE key = ?"
+    _DELETE = "DELETE FROM kv WHERE key = ?"
+    _KEYS = "SELECT key FROM kv ORDER BY key"
+    _RANGE = {
+        (low, high): "SELECT key FROM kv WHERE 1"
+                     + {None: "", True: " AND key >= :low", False: " AND key > :low"}[low]
+                     + (" AND key < :high" if high else "")
+                     + " ORDER BY key LIMIT :limit"
+        for low in (None, True, False) for high in (False, True)
+    }
+    _ITEMS = "SELECT key, value FROM kv ORDER BY key"
+    _COUNT = "SELECT COUNT(*) FROM kv"
+    _CLEAR = "DELETE FROM kv"
+
+    def __init__(self, path: str, commit_every: int = 1000, synchronous: str = 'NORMAL'):
+        """
+        Open (or create) the database
+
+        Args:
+            path: Database file path
+            commit_every: Writes per transaction outside batch()
+            synchronous: SQLite synchronous pragma (NORMAL is durable in WAL mode
+                         except for the last transactions before a power loss)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.commit_every = max(1, commit_every)
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._batch_depth = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.execute(self._SCHEMA)
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(self._GET, (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._write(self._UPSERT, (key, json.dumps(value)))
+
+    def __delitem__(self, key: str) -> None:
+        if not self.discard(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return self._conn.execute(self._EXISTS, (key,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute(self._KEYS)]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(self._COUNT).fetchone()[0]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute(self._GET, (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def items(self) -> Iterator:
+        """Iterate (key, value) pairs in key order"""
+        with self._lock:
+            rows = self._conn.execute(self._ITEMS).fetchall()
+        return ((key, json.loads(value)) for key, value in rows)
+
+    def key_range(self, low: Optional[str] = None, high: Optional[str] = None,
+                  low_inclusive: bool = True, limit: Optional[int] = None) -> List[str]:
+        """Range scan on the primary key B-tree (TEXT compares like Python str)"""
+        sql = self._RANGE[(None if low is None else low_inclusive, high is not None)]
+        params = {'low': low, 'high': high, 'limit': -1 if limit is None else limit}
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def insert(self, key: str, value: Any) -> bool:
+        return self._write(self._INSERT, (key, json.dumps(value))) > 0
+
+    def replace(self, key: str, value: Any) -> bool:
+        return self._write(self._UPDATE, (json.dumps(value), key)) > 0
+
+    def discard(self, key: str) -> bool:
+        return self._write(self._DELETE, (key,)) > 0
+
+    def update(self, other: Any = (), **kwargs: Any) -> None:
+        """Upsert many keys with one executemany in the current transaction"""
+        pairs = dict(other, **kwargs)
+        with self._lock:
+            self._begin()
+            self._conn.executemany(self._UPSERT,
+                                   [(k, json.dumps(v)) for k, v in pairs.items()])
+            self._pending += len(pairs)
+            self._maybe_commit()
+
+    def clear(self) -> None:
+        self._write(self._CLEAR, ())
+
+    def flush(self) -> None:
+        """Commit the open transaction"""
+        with self._lock:
+            if self._conn.in_transaction:
+                self._conn.execute("COMMIT")
+            self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    @contextmanager
+    def batch(self) -> Iterator['SQLiteBackend']:
+        """Commit every write in the block as one transaction"""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+
+    def _write(self, sql: str, params: tuple) -> int:
+        """Run one write statement inside the current transaction"""
+        with self._lock:
+            self._begin()
+            changed = self._conn.execute(sql, params).rowcount
+            self._pending += 1
+            self._maybe_commit()
+            return changed
+
+    def _begin(self) -> None:
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+    def _maybe_commit(self) -> None:
+        if self._batch_depth == 0 and self._pending >= self.commit_every:
+            self.flush()
+
+
+BACKENDS = {
+    InMemoryBackend.name: InMemoryBackend,
+    JSONBackend.name: JSONBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+
+def create_backend(storage_type: str, path: Optional[str] = None) -> StorageBackend:
+    """
+    Build a backend from a storage type name
+
+    Args:
+        storage_type: 'memory', 'json' or 'sqlite' ('memory' with a path
+                      means the JSON file used before backends existed)
+        path: File path for persistent backends
+
+    Returns:
+        A ready backend
+
+    Raises:
+        ValueError: If the type is unknown or a persistent type lacks a path
+    """
+    if storage_type == InMemoryBackend.name:
+        return JSONBackend(path) if path else InMemoryBackend()
+    if storage_type not in BACKENDS:
+        raise ValueError(f"Unknown storage type: {storage_type}")
+    if not path:
+        raise ValueError(f"Storage type '{storage_type}' requires a path")
+    return BACKENDS[storage_type](path)
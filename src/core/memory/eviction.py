@@ -0,0 +1,176 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Eviction Policies
+
+Key-ordering policies shared by the memory caches:
+- LRU: least recently used key first
+- LFU: least frequently used key first, LRU among equal frequencies
+- FIFO: oldest inserted key first, regardless of use
+
+Every operation is O(1) (LFU keeps one ordered bucket per frequency).
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+
+class EvictionPolicy(ABC):
+    """Tracks keys and picks the next one to evict"""
+
+    @abstractmethod
+    def insert(self, key: Hashable) -> None:
+        """Start tracking a new key"""
+        pass
+
+    @abstractmethod
+    def access(self, key: Hashable) -> None:
+        """Record a read or overwrite of a tracked key"""
+        pass
+
+    @abstractmethod
+    def remove(self, key: Hashable) -> None:
+        """Stop tracking a key (no-op if untracked)"""
+        pass
+
+    @abstractmethod
+    def pop_victim(self) -> Optional[Hashable]:
+        """Stop tracking and return the key to evict, or None if empty"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Stop tracking every key"""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class LRUPolicy(EvictionPolicy):
+    """Least recently used"""
+
+    def __init__(self):
+        self._order: 'OrderedDict[Hashable, None]' = OrderedDict()
+
+    def insert(self, key: Hashable) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def access(self, key: Hashable) -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def remove(self, key: Hashable) -> None:
+        self._order.pop(key, None)
+
+    def pop_victim(self) -> Optional[Hashable]:
+        if not self._order:
+            return None
+        return self._order.popitem(last=False)[0]
+
+    def clear(self) -> None:
+        self._order.clear()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+class LFUPolicy(EvictionPolicy):
+    """Least frequently used, ties broken by recency"""
+
+    def __init__(self):
+        self._freq: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, 'OrderedDict[Hashable, None]'] = {}
+        self._min_freq = 0
+
+    def insert(self, key: Hashable) -> None:
+        if key in self._freq:
+            self.access(key)
+            return
+        self._freq[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_freq = 1
+
+    def access(self, key: Hashable) -> None:
+        freq = self._freq.get(key)
+        if freq is None:
+            return
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def remove(self, key: Hashable) -> None:
+        freq = self._freq.pop(key, None)
+        if freq is None:
+            return
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = min(self._buckets, default=0)
+
+    def pop_victim(self) -> Optional[Hashable]:
+        if not self._freq:
+            return None
+        bucket = self._buckets[self._min_freq]
+        key, _ = bucket.popitem(last=False)
+        del self._freq[key]
+        if not bucket:
+            del self._buckets[self._min_freq]
+            self._min_freq = min(self._buckets, default=0)
+        return key
+
+    def clear(self) -> None:
+        self._freq.clear()
+        self._buckets.clear()
+        self._min_freq = 0
+
+    def __len__(self) -> int:
+        return len(self._freq)
+
+
+class FIFOPolicy(LRUPolicy):
+    """First in, first out (accesses do not reorder)"""
+
+    def insert(self, key: Hashable) -> None:
+        if key not in self._order:
+            self._order[key] = None
+
+    def access(self, key: Hashable) -> None:
+        pass
+
+
+EVICTION_POLICIES = {
+    'lru': LRUPolicy,
+    'lfu': LFUPolicy,
+    'fifo': FIFOPolicy,
+}
+
+
+def create_policy(name: str) -> EvictionPolicy:
+    """
+    Instantiate an eviction policy by name
+
+    Args:
+        name: One of EVICTION_POLICIES
+
+    Returns:
+        A new, empty policy
+    """
+    try:
+        return EVICTION_POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown eviction policy: {name}") from None
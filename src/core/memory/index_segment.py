@@ -0,0 +1,469 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Memory-Mapped Inverted Index Segments
+
+Compact on-disk index format for the advanced memory system:
+- Sorted document key table and document lengths
+- Sorted term dictionary searched by bisection
+- Delta-encoded, array-backed posting lists
+- Opened with mmap so postings are read lazily, per query term
+
+A segment is immutable. SegmentedIndex layers an in-memory InvertedIndex
+(new and updated documents) and a tombstone set (superseded segment
+documents) on top of it, and merges both into a fresh segment on save.
+"""
+
+import heapq
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .inverted_index import InvertedIndex
+
+
+# magic, num_docs, num_terms, total_length, then section offsets:
+# key_offsets, key_blob, doc_lengths, term_offsets, term_blob, posting_offsets, postings
+_HEADER = struct.Struct('=4sIIQ7Q')
+_MAGIC = b'THIX' if sys.byteorder == 'little' else b'XIHT'
+
+# (live documents, live token count, {term: document frequency})
+CorpusStats = Tuple[int, int, Dict[str, int]]
+
+
+class IndexSegment:
+    """
+    Read-only, memory-mapped inverted index segment
+
+    Layout (native byte order, 8-byte aligned sections):
+    - key_offsets:     uint64[num_docs + 1] into key_blob
+    - key_blob:        UTF-8 document keys, sorted; doc id = position
+    - doc_lengths:     uint32[num_docs]
+    - term_offsets:    uint64[num_terms + 1] into term_blob
+    - term_blob:       UTF-8 terms, sorted
+    - posting_offsets: uint64[num_terms + 1] in uint32 units into postings
+    - postings:        per term, uint32 doc-id deltas followed by uint32 tfs
+    """
+
+    def __init__(self, path: Path):
+        """
+        Map a segment file
+
+        Args:
+            path: Segment file written by write_index_segment()
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        (magic, self.num_docs, self.num_terms, self.total_length,
+         key_offsets, key_blob, doc_lengths, term_offsets,
+         term_blob, posting_offsets, postings) = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            view.release()
+            self.close()
+            raise ValueError(f"Not an index segment for this platform: {self.path}")
+
+        self._key_offsets = view[key_offsets:key_offsets + 8 * (self.num_docs + 1)].cast('Q')
+        self._key_blob = view[key_blob:doc_lengths]
+        self._doc_lengths = view[doc_lengths:doc_lengths + 4 * self.num_docs].cast('I')
+        self._term_offsets = view[term_offsets:term_offsets + 8 * (self.num_terms + 1)].cast('Q')
+        self._term_blob = view[term_blob:posting_offsets]
+        self._posting_offsets = view[posting_offsets:posting_offsets
+                                     + 8 * (self.num_terms + 1)].cast('Q')
+        self._postings = view[postings:].cast('I')
+        self._view = view
+
+    def doc_key(self, doc_id: int) -> str:
+        """Key of a document id"""
+        start, end = self._key_offsets[doc_id], self._key_offsets[doc_id + 1]
+        return bytes(self._key_blob[start:end]).decode('utf-8')
+
+    def doc_length(self, doc_id: int) -> int:
+        """Token count of a document id"""
+        return self._doc_lengths[doc_id]
+
+    def doc_id(self, key: str) -> Optional[int]:
+        """Find a document id by key (binary search), or None"""
+        target = key.encode('utf-8')
+        index = self._bisect(self._key_offsets, self._key_blob, self.num_docs, target)
+        if index < self.num_docs and self._entry(self._key_offsets, self._key_blob, index) == target:
+            return index
+        return None
+
+    def term_id(self, term: str) -> Optional[int]:
+        """Find a term's dictionary position (binary search), or None"""
+        target = term.encode('utf-8')
+        index = self._bisect(self._term_offsets, self._term_blob, self.num_terms, target)
+        if index < self.num_terms and self._entry(self._term_offsets, self._term_blob, index) == target:
+            return index
+        return None
+
+    def term(self, term_id: int) -> str:
+        """Term at a dictionary position"""
+        return self._entry(self._term_offsets, self._term_blob, term_id).decode('utf-8')
+
+    def postings(self, term_id: int) -> Iterator[Tuple[int, int]]:
+        """
+        Decode one posting list lazily from the mapped file
+
+        Args:
+            term_id: Dictionary position from term_id()
+
+        Yields:
+            (doc id, term frequency) pairs in doc id order
+        """
+        start = self._posting_offsets[term_id]
+        end = self._posting_offsets[term_id + 1]
+        doc_freq = (end - start) // 2
+        deltas = self._postings[start:start + doc_freq]
+        freqs = self._postings[start + doc_freq:end]
+        return zip(accumulate(deltas), freqs)
+
+    def doc_freq(self, term_id: int) -> int:
+        """Number of documents in a term's posting list"""
+        return (self._posting_offsets[term_id + 1] - self._posting_offsets[term_id]) // 2
+
+    def close(self) -> None:
+        """Unmap and close the segment"""
+        for name in ('_key_offsets', '_key_blob', '_doc_lengths', '_term_offsets',
+                     '_term_blob', '_posting_offsets', '_postings', '_view'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    @staticmethod
+    def _entry(offsets: memoryview, blob: memoryview, index: int) -> bytes:
+        return bytes(blob[offsets[index]:offsets[index + 1]])
+
+    @classmethod
+    def _bisect(cls, offsets: memoryview, blob: memoryview, count: int, target: bytes) -> int:
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            if cls._entry(offsets, blob, mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+
+def write_index_segment(path: Path, doc_lengths: Dict[str, int],
+                        term_postings: Iterable[Tuple[str, Dict[str, int]]]) -> None:
+    """
+    Write a segment file atomically
+
+    Args:
+        path: Destination file
+        doc_lengths: Token count per document key
+        term_postings: (term, {key: tf}) pairs in ascending term order
+    """
+    keys = sorted(doc_lengths)
+    doc_ids = {key: doc_id for doc_id, key in enumerate(keys)}
+
+    key_offsets = array('Q', [0])
+    encoded_keys = []
+    for key in keys:
+        encoded = key.encode('utf-8')
+        encoded_keys.append(encoded)
+        key_offsets.append(key_offsets[-1] + len(encoded))
+    lengths = array('I', (doc_lengths[key] for key in keys))
+
+    term_offsets = array('Q', [0])
+    encoded_terms = []
+    posting_offsets = array('Q', [0])
+    postings = array('I')
+    for term, posting in term_postings:
+        if not posting:
+            continue
+        encoded = term.encode('utf-8')
+        encoded_terms.append(encoded)
+        term_offsets.append(term_offsets[-1] + len(encoded))
+
+        ids = sorted((doc_ids[key], tf) for key, tf in posting.items())
+        previous = 0
+        for doc_id, _ in ids:
+            postings.append(doc_id - previous)
+            previous = doc_id
+        postings.extend(tf for _, tf in ids)
+        posting_offsets.append(len(postings))
+
+    sections = [key_offsets.tobytes(), b''.join(encoded_keys), lengths.tobytes(),
+                term_offsets.tobytes(), b''.join(encoded_terms), posting_offsets.tobytes(),
+                postings.tobytes()]
+
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        position += -position % 8
+        offsets.append(position)
+        position += len(section)
+
+    tmp_path = Path(str(path) + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(keys), len(encoded_terms),
+                             sum(lengths), *offsets))
+        for offset, section in zip(offsets, sections):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(section)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SegmentedIndex:
+    """
+    BM25 index over an immutable segment plus an in-memory overlay
+
+    Writes never touch the segment: new or changed documents go to the
+    overlay InvertedIndex and their superseded segment copies are
+    tombstoned. write_segment() folds everything into a new segment.
+    """
+
+    def __init__(self, segment: Optional[IndexSegment] = None,
+                 overlay: Optional[InvertedIndex] = None):
+        self.segment = segment
+        self.overlay = overlay or InvertedIndex()
+        self.deleted: Set[int] = set()
+        self._deleted_length = 0
+
+    @property
+    def k1(self) -> float:
+        return self.overlay.k1
+
+    @property
+    def b(self) -> float:
+        return self.overlay.b
+
+    @property
+    def num_docs(self) -> int:
+        """Live documents across segment and overlay"""
+        segment_docs = self.segment.num_docs - len(self.deleted) if self.segment else 0
+        return segment_docs + len(self.overlay.doc_lengths)
+
+    @property
+    def total_length(self) -> int:
+        """Live token count across segment and overlay"""
+        segment_length = self.segment.total_length - self._deleted_length if self.segment else 0
+        return segment_length + self.overlay.total_length
+
+    @property
+    def dirty(self) -> bool:
+        """True when the overlay or tombstones hold changes not in the segment"""
+        return bool(self.overlay.doc_lengths or self.deleted)
+
+    def update(self, key: str, terms: Iterable[str]) -> Tuple[int, int]:
+        """Index or incrementally reindex a document (see InvertedIndex.update)"""
+        if key not in self.overlay.doc_terms:
+            self._tombstone(key)
+        return self.overlay.update(key, terms)
+
+    def remove(self, key: str) -> None:
+        """Remove a document from overlay and segment"""
+        self.overlay.remove(key)
+        self._tombstone(key)
+
+    def doc_length(self, key: str) -> Optional[int]:
+        """Token count of a live document, or None"""
+        if key in self.overlay.doc_lengths:
+            return self.overlay.doc_lengths[key]
+        doc_id = self._live_doc_id(key)
+        return self.segment.doc_length(doc_id) if doc_id is not None else None
+
+    def term_stats(self, query_terms: Iterable[str]) -> CorpusStats:
+        """
+        Collection statistics BM25 needs for a query
+
+        Summing these over several indexes and passing the totals to
+        search() scores every index against the combined collection.
+
+        Args:
+            query_terms: Query tokens
+
+        Returns:
+            (live documents, live token count, {term: live document frequency})
+        """
+        doc_freqs: Dict[str, int] = {}
+        for term in set(query_terms):
+            doc_freq = len(self.overlay.postings.get(term) or ())
+            if self.segment is not None:
+                term_id = self.segment.term_id(term)
+                if term_id is not None:
+                    if self.deleted:
+                        doc_freq += sum(1 for doc_id, _ in self.segment.postings(term_id)
+                                        if doc_id not in self.deleted)
+                    else:
+                        doc_freq += self.segment.doc_freq(term_id)
+            doc_freqs[term] = doc_freq
+        return self.num_docs, self.total_length, doc_freqs
+
+    def search(self, query_terms: Iterable[str], limit: int = 10,
+               corpus: Optional[CorpusStats] = None) -> List[Tuple[str, float]]:
+        """
+        Rank live documents with BM25, reading segment postings lazily
+
+        Args:
+            query_terms: Query tokens (duplicates are ignored)
+            limit: Maximum number of results
+            corpus: term_stats()-style totals to score against instead of
+                    this index's own statistics
+
+        Returns:
+            List of (key, score) tuples, best first
+        """
+        if corpus is None:
+            num_docs, total_length, doc_freqs = self.num_docs, self.total_length, None
+        else:
+            num_docs, total_length, doc_freqs = corpus
+        if not num_docs or limit <= 0:
+            return []
+
+        avg_length = total_length / num_docs or 1.0
+        k1, b = self.k1, self.b
+        segment_scores: Dict[int, float] = {}
+        overlay_scores: Dict[str, float] = {}
+
+        for term in set(query_terms):
+            segment_hits: List[Tuple[int, int]] = []
+            if self.segment is not None:
+                term_id = self.segment.term_id(term)
+                if term_id is not None:
+                    segment_hits = [(doc_id, tf) for doc_id, tf in self.segment.postings(term_id)
+                                    if doc_id not in self.deleted]
+            overlay_hits = self.overlay.postings.get(term) or {}
+
+            if not segment_hits and not overlay_hits:
+                continue
+            if doc_freqs is not None:
+                doc_freq = doc_freqs[term]
+            else:
+                doc_freq = len(segment_hits) + len(overlay_hits)
+            idf = InvertedIndex.idf(doc_freq, num_docs)
+
+            for doc_id, tf in segment_hits:
+                norm = k1 * (1.0 - b + b * self.segment.doc_length(doc_id) / avg_length)
+                segment_scores[doc_id] = (segment_scores.get(doc_id, 0.0)
+                                          + idf * tf * (k1 + 1.0) / (tf + norm))
+            for key, tf in overlay_hits.items():
+                norm = k1 * (1.0 - b + b * self.overlay.doc_lengths[key] / avg_length)
+                overlay_scores[key] = (overlay_scores.get(key, 0.0)
+                                       + idf * tf * (k1 + 1.0) / (tf + norm))
+
+        # Keys are only decoded for segment documents that make the cut
+        top_segment = heapq.nlargest(limit, segment_scores.items(), key=lambda item: item[1])
+        candidates = [(self.segment.doc_key(doc_id), score) for doc_id, score in top_segment]
+        candidates.extend(overlay_scores.items())
+        return heapq.nlargest(limit, candidates, key=lambda item: item[1])
+
+    def prune(self) -> int:
+        """Drop empty overlay terms (segment terms are pruned on write)"""
+        return self.overlay.prune()
+
+    def clear(self) -> None:
+        """Forget every document (the segment file itself is left in place)"""
+        if self.segment is not None:
+            self.segment.close()
+        self.segment = None
+        self.overlay.clear()
+        self.deleted.clear()
+        self._deleted_length = 0
+
+    def write_segment(self, path: Path) -> None:
+        """
+        Merge segment and overlay into a new segment file and switch to it
+
+        Args:
+            path: Destination of the merged segment
+        """
+        old = self.segment
+        doc_lengths: Dict[str, int] = {}
+        segment_keys: List[Optional[str]] = []
+        if old is not None:
+            for doc_id in range(old.num_docs):
+                if doc_id in self.deleted:
+                    segment_keys.append(None)
+                    continue
+                key = old.doc_key(doc_id)
+                segment_keys.append(key)
+                doc_lengths[key] = old.doc_length(doc_id)
+        doc_lengths.update(self.overlay.doc_lengths)
+
+        write_index_segment(Path(path), doc_lengths, self._merged_postings(old, segment_keys))
+
+        new_segment = IndexSegment(Path(path))
+        if old is not None:
+            old.close()
+        self.segment = new_segment
+        self.overlay.clear()
+        self.deleted.clear()
+        self._deleted_length = 0
+
+    def _merged_postings(self, old: Optional[IndexSegment], segment_keys: List[Optional[str]]
+                         ) -> Iterator[Tuple[str, Dict[str, int]]]:
+        """Yield (term, {key: tf}) from segment and overlay in term order"""
+        overlay_terms = sorted(term for term, posting in self.overlay.postings.items() if posting)
+        segment_terms = range(old.num_terms) if old is not None else range(0)
+
+        def from_segment() -> Iterator[Tuple[str, int]]:
+            for term_id in segment_terms:
+                yield old.term(term_id), term_id
+
+        def from_overlay() -> Iterator[Tuple[str, int]]:
+            for term in overlay_terms:
+                yield term, -1
+
+        current_term: Optional[str] = None
+        merged: Dict[str, int] = {}
+        for term, term_id in heapq.merge(from_segment(), from_overlay(), key=lambda item: item[0]):
+            if term != current_term:
+                if merged:
+                    yield current_term, merged
+                current_term, merged = term, {}
+            if term_id >= 0:
+                for doc_id, tf in old.postings(term_id):
+                    key = segment_keys[doc_id]
+                    if key is not None:
+                        merged[key] = tf
+            else:
+                merged.update(self.overlay.postings[term])
+        if merged:
+            yield current_term, merged
+
+    def _live_doc_id(self, key: str) -> Optional[int]:
+        if self.segment is None:
+            return None
+        doc_id = self.segment.doc_id(key)
+        if doc_id is None or doc_id in self.deleted:
+            return None
+        return doc_id
+
+    def _tombstone(self, key: str) -> None:
+        doc_id = self._live_doc_id(key)
+        if doc_id is not None:
+            self.deleted.add(doc_id)
+            self._deleted_length += self.segment.doc_length(doc_id)
+
+    def __len__(self) -> int:
+        """Number of distinct terms (segment terms may include dead documents)"""
+        segment_terms = self.segment.num_terms if self.segment else 0
+        extra = sum(1 for term, posting in self.overlay.postings.items()
+                    if posting and (self.segment is None or self.segment.term_id(term) is None))
+        return segment_terms + extra
+
+    def __contains__(self, term: str) -> bool:
+        if self.overlay.postings.get(term):
+            return True
+        return self.segment is not None and self.segment.term_id(term) is not None
@@ -0,0 +1,196 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Inverted Index with BM25 Ranking
+
+Full-text index used by the advanced memory system:
+- Posting lists carrying per-document term frequencies
+- Document lengths for length normalisation
+- Cached per-document term counts for diff-based reindexing
+- Okapi BM25 scoring
+- Bounded-heap top-k selection
+"""
+
+import heapq
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+class InvertedIndex:
+    """
+    Term -> {key: term frequency} posting lists with BM25 ranking
+
+    Args:
+        k1: BM25 term-frequency saturation
+        b: BM25 document-length normalisation strength
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.doc_terms: Dict[str, Counter] = {}
+        self.total_length = 0
+
+    def add(self, key: str, terms: Iterable[str]) -> None:
+        """
+        Index a document
+
+        Args:
+            key: Document key (an already indexed key is updated instead)
+            terms: Document tokens, repeated once per occurrence
+        """
+        if key in self.doc_terms:
+            self.update(key, terms)
+            return
+
+        counts = Counter(terms)
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[key] = tf
+
+        length = sum(counts.values())
+        self.doc_terms[key] = counts
+        self.doc_lengths[key] = length
+        self.total_length += length
+
+    def update(self, key: str, terms: Iterable[str]) -> Tuple[int, int]:
+        """
+        Reindex a document, touching only terms whose frequency changed
+
+        Args:
+            key: Document key
+            terms: New document tokens, repeated once per occurrence
+
+        Returns:
+            (terms removed, terms added or re-weighted)
+        """
+        old = self.doc_terms.get(key)
+        if old is None:
+            self.add(key, terms)
+            return 0, len(self.doc_terms[key])
+
+        new = Counter(terms)
+        removed = 0
+        changed = 0
+
+        for term in old.keys() - new.keys():
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(key, None)
+            removed += 1
+
+        for term, tf in new.items():
+            if old.get(term) != tf:
+                self.postings.setdefault(term, {})[key] = tf
+                changed += 1
+
+        length = sum(new.values())
+        self.total_length += length - self.doc_lengths[key]
+        self.doc_lengths[key] = length
+        self.doc_terms[key] = new
+        return removed, changed
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a document from the index
+
+        Args:
+            key: Document key
+        """
+        for term in self.doc_terms.pop(key, ()):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(key, None)
+
+        self.total_length -= self.doc_lengths.pop(key, 0)
+
+    def search(self, query_terms: Iterable[str], limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank documents against a query with BM25
+
+        Args:
+            query_terms: Query tokens (duplicates are ignored)
+            limit: Maximum number of results
+
+        Returns:
+            List of (key, score) tuples, best first
+        """
+        num_docs = len(self.doc_lengths)
+        if not num_docs or limit <= 0:
+            return []
+
+        avg_length = self.total_length / num_docs or 1.0
+        scores: Dict[str, float] = {}
+
+        for term in set(query_terms):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+
+            idf = self.idf(len(posting), num_docs)
+            for key, tf in posting.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    @staticmethod
+    def idf(doc_freq: int, num_docs: int) -> float:
+        """BM25 inverse document frequency (non-negative variant)"""
+        return math.log(1.0 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def prune(self) -> int:
+        """
+        Drop terms whose posting lists became empty
+
+        Returns:
+            Number of terms removed
+        """
+        empty = [term for term, posting in self.postings.items() if not posting]
+        for term in empty:
+            del self.postings[term]
+        return len(empty)
+
+    def clear(self) -> None:
+        """Remove every document"""
+        self.postings.clear()
+        self.doc_lengths.clear()
+        self.doc_terms.clear()
+        self.total_length = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise to plain containers for snapshots"""
+        return {
+            'postings': self.postings,
+            'doc_lengths': self.doc_lengths,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'InvertedIndex':
+        """Rebuild an index from to_dict() output"""
+        index = cls()
+        index.postings = state['postings']
+        index.doc_lengths = state['doc_lengths']
+        index.total_length = sum(index.doc_lengths.values())
+
+        # The per-document term cache is derived, so it is not stored twice
+        index.doc_terms = {key: Counter() for key in index.doc_lengths}
+        for term, posting in index.postings.items():
+            for key, tf in posting.items():
+                index.doc_terms[key][term] = tf
+        return index
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.postings
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.postings)
@@ -0,0 +1,152 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Sorted Key Index
+
+Ordered set of string keys for prefix and range scans:
+- Sorted list of bounded chunks plus a list of chunk maxima
+- O(log n) lookup by bisection; inserts and deletes shift one chunk only
+- Range iteration starts at the lower bound and stops at the upper bound,
+  so a scan touches only the keys it returns
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Smallest string greater than every string starting with ``prefix``
+
+    Args:
+        prefix: Key prefix
+
+    Returns:
+        Exclusive upper bound, or None if the prefix has none (it is empty
+        or made only of the largest code point)
+    """
+    stripped = prefix.rstrip(chr(0x10FFFF))
+    if not stripped:
+        return None
+    return stripped[:-1] + chr(ord(stripped[-1]) + 1)
+
+
+class SortedKeyIndex:
+    """
+    Sorted set of keys stored as a list of sorted chunks
+
+    Chunks hold between one and ``2 * chunk_size`` keys; a chunk that grows
+    past that is split in two. Not thread-safe, and the index must not be
+    modified while an irange() iterator is in use.
+    """
+
+    def __init__(self, keys: Iterable[str] = (), chunk_size: int = 512):
+        """
+        Initialize the index
+
+        Args:
+            keys: Initial keys (duplicates are ignored)
+            chunk_size: Target number of keys per chunk
+        """
+        self.chunk_size = max(1, chunk_size)
+        ordered = sorted(set(keys))
+        self._chunks: List[List[str]] = [
+            ordered[i:i + self.chunk_size] for i in range(0, len(ordered), self.chunk_size)
+        ]
+        self._maxes: List[str] = [chunk[-1] for chunk in self._chunks]
+        self._len = len(ordered)
+
+    def add(self, key: str) -> bool:
+        """Insert a key; False if it was already present"""
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return True
+
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            i -= 1
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, key)
+        if j < len(chunk) and chunk[j] == key:
+            return False
+
+        chunk.insert(j, key)
+        self._maxes[i] = chunk[-1]
+        self._len += 1
+        if len(chunk) > 2 * self.chunk_size:
+            half = len(chunk) // 2
+            self._chunks[i:i + 1] = [chunk[:half], chunk[half:]]
+            self._maxes[i:i + 1] = [chunk[half - 1], chunk[-1]]
+        return True
+
+    def discard(self, key: str) -> bool:
+        """Remove a key; False if it was absent"""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return False
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, key)
+        if j == len(chunk) or chunk[j] != key:
+            return False
+
+        del chunk[j]
+        self._len -= 1
+        if chunk:
+            self._maxes[i] = chunk[-1]
+        else:
+            del self._chunks[i]
+            del self._maxes[i]
+        return True
+
+    def clear(self) -> None:
+        self._chunks.clear()
+        self._maxes.clear()
+        self._len = 0
+
+    def irange(self, low: Optional[str] = None, high: Optional[str] = None,
+               low_inclusive: bool = True) -> Iterator[str]:
+        """
+        Iterate keys in order from ``low`` up to (excluding) ``high``
+
+        Args:
+            low: Lower bound, or None for the first key
+            high: Exclusive upper bound, or None for no bound
+            low_inclusive: Whether a key equal to ``low`` is included
+        """
+        if low is None:
+            i, j = 0, 0
+        else:
+            find = bisect_left if low_inclusive else bisect_right
+            i = find(self._maxes, low)
+            if i == len(self._maxes):
+                return
+            j = find(self._chunks[i], low)
+
+        for c in range(i, len(self._chunks)):
+            chunk = self._chunks[c]
+            for k in range(j, len(chunk)):
+                key = chunk[k]
+                if high is not None and key >= high:
+                    return
+                yield key
+            j = 0
+
+    def __contains__(self, key: object) -> bool:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return False
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, key)
+        return j < len(chunk) and chunk[j] == key
+
+    def __iter__(self) -> Iterator[str]:
+        return self.irange()
+
+    def __len__(self) -> int:
+        return self._len
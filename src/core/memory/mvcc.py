@@ -0,0 +1,169 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Multi-Version Concurrency Control for MemoryModule
+
+Point-in-time read views over a mutable backend:
+- Monotonic write version counter
+- Per-key undo chains holding pre-images, recorded only while readers exist
+  and at most once per key between pins
+- Reader registry; undo entries are reclaimed once no reader needs them
+- Snapshot: read-only Mapping pinned to one version
+"""
+
+import threading
+import weakref
+from collections import Counter, deque
+from collections.abc import Mapping
+from typing import Any, Deque, Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+
+_MISSING = object()
+
+
+class VersionManager:
+    """
+    Write versions and undo chains for one backend
+
+    Writers call record() under ``lock`` before each mutation. A write at
+    version w keeps the key's previous value as long as some reader is
+    pinned to a version below w; everything else is reclaimed.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = 0
+        self._undo: Dict[str, List[Tuple[int, Any]]] = {}
+        self._undo_order: Deque[Tuple[int, str]] = deque()
+        self._readers: Counter = Counter()
+
+    @property
+    def active_readers(self) -> int:
+        return sum(self._readers.values())
+
+    @property
+    def undo_entries(self) -> int:
+        return len(self._undo_order)
+
+    def record(self, key: str, backend: MutableMapping) -> None:
+        """Advance the version, keeping the key's pre-image if a reader may need it"""
+        self.version += 1
+        if self._readers:
+            chain = self._undo.setdefault(key, [])
+            # Readers pinned before an earlier write since the newest pin
+            # already resolve through that entry; later pre-images are unseen
+            if chain and chain[-1][0] > max(self._readers):
+                return
+            chain.append((self.version, backend.get(key, _MISSING)))
+            self._undo_order.append((self.version, key))
+
+    def pin(self) -> int:
+        """Register a reader at the current version"""
+        with self.lock:
+            self._readers[self.version] += 1
+            return self.version
+
+    def unpin(self, version: int) -> None:
+        """Release a reader and reclaim undo entries nobody can see any more"""
+        with self.lock:
+            self._readers[version] -= 1
+            if self._readers[version] <= 0:
+                del self._readers[version]
+            self._reclaim()
+
+    def resolve(self, key: str, version: int, backend: MutableMapping) -> Any:
+        """Value of a key as of a pinned version, or _MISSING"""
+        with self.lock:
+            for written_at, previous in self._undo.get(key, ()):
+                if written_at > version:
+                    return previous
+            return backend.get(key, _MISSING)
+
+    def candidate_keys(self, backend: MutableMapping) -> List[str]:
+        """Every key that may exist at some pinned version (current or undone)"""
+        with self.lock:
+            keys = list(backend.keys())
+            keys.extend(key for key in self._undo if key not in backend)
+            return keys
+
+    def _reclaim(self) -> None:
+        """Drop undo entries written at or before the oldest pinned version"""
+        oldest = min(self._readers) if self._readers else self.version
+        while self._undo_order and self._undo_order[0][0] <= oldest:
+            _, key = self._undo_order.popleft()
+            chain = self._undo[key]
+            chain.pop(0)
+            if not chain:
+                del self._undo[key]
+
+
+class Snapshot(Mapping):
+    """
+    Read-only view of a backend as of one version
+
+    Creating a snapshot is O(1). Reads resolve through the undo chains,
+    holding the lock only per key, so writers are never blocked for the
+    duration of a scan. Close it (or use it as a context manager) to let
+    undo entries be reclaimed; an unreachable snapshot is closed by the
+    garbage collector.
+    """
+
+    def __init__(self, manager: VersionManager, backend: MutableMapping):
+        self._manager = manager
+        self._backend = backend
+        self.version = manager.pin()
+        self._finalizer = weakref.finalize(self, manager.unpin, self.version)
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        """Release the pinned version"""
+        self._finalizer()
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._resolve(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._resolve(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        return self._resolve(key) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        for key, _ in self.items():
+            yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.items())
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate (key, value) pairs as of the snapshot version"""
+        for key in self._manager.candidate_keys(self._backend):
+            value = self._resolve(key)
+            if value is not _MISSING:
+                yield key, value
+
+    def values(self) -> Iterator[Any]:
+        for _, value in self.items():
+            yield value
+
+    def _resolve(self, key: Any) -> Any:
+        if self.closed:
+            raise ValueError("Snapshot is closed")
+        return self._manager.resolve(key, self.version, self._backend)
@@ -0,0 +1,284 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Sharded Advanced Memory System
+
+Hash-partitioned front end over several AdvancedMemorySystem shards:
+- Stable key routing (BLAKE2b, independent of PYTHONHASHSEED)
+- One lock, index set and persistence directory per shard
+- Fan-out search (globally consistent BM25), tag lookup and relationship
+  traversal with merged results
+- Bulk operations grouped per shard
+"""
+
+import hashlib
+import heapq
+import json
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple, Union
+
+from .advanced_memory import AdvancedMemorySystem
+
+
+class ShardedMemorySystem:
+    """
+    AdvancedMemorySystem partitioned across N independently locked shards
+
+    Writes to different shards never contend; each shard keeps its own
+    indexes, version store and files under ``<storage_path>/shard-<i>``.
+    The shard count is recorded in ``shards.json`` and cannot change for an
+    existing store.
+
+    Search runs in two phases: shards first report BM25 collection
+    statistics for the query terms, then each ranks against the summed
+    totals, so merged scores match those of a single unsharded store.
+    """
+
+    def __init__(self, storage_path: str = "data/memory", num_shards: int = 8,
+                 **shard_options: Any):
+        """
+        Initialize sharded memory system
+
+        Args:
+            storage_path: Path to storage directory
+            num_shards: Number of shards (fixed once the store exists)
+            **shard_options: Keyword arguments passed to every AdvancedMemorySystem
+        """
+        if num_shards < 1:
+            raise ValueError(f"num_shards must be positive: {num_shards}")
+
+        self.storage_path = Path(storage_path)
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+
+        manifest_file = self.storage_path / "shards.json"
+        if manifest_file.exists():
+            with open(manifest_file, 'r') as f:
+                existing = json.load(f)['num_shards']
+            if existing != num_shards:
+                raise ValueError(
+                    f"Store at {storage_path} has {existing} shards, not {num_shards}")
+        else:
+            with open(manifest_file, 'w') as f:
+                json.dump({'num_shards': num_shards}, f)
+
+        self.num_shards = num_shards
+        self.shards: List[AdvancedMemorySystem] = [
+            AdvancedMemorySystem(str(self.storage_path / f"shard-{i}"), **shard_options)
+            for i in range(num_shards)
+        ]
+
+    def shard_for(self, key: str) -> AdvancedMemorySystem:
+        """Shard that owns a key"""
+        return self.shards[self.shard_index(key)]
+
+    def shard_index(self, key: str) -> int:
+        """Index of the shard that owns a key"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') % self.num_shards
+
+    def create(self, key: str, value: Any, tags: List[str] = None,
+               related_keys: List[str] = None) -> bool:
+        """Create entry with metadata (see AdvancedMemorySystem.create)"""
+        return self.shard_for(key).create(key, value, tags, related_keys)
+
+    def read(self, key: str) -> Any:
+        """Read entry value"""
+        return self.shard_for(key).read(key)
+
+    def update(self, key: str, value: Any) -> bool:
+        """Update entry with version tracking"""
+        return self.shard_for(key).update(key, value)
+
+    def delete(self, key: str) -> bool:
+        """Delete entry and its relationship edges on every shard"""
+        owner = self.shard_for(key)
+        if not owner.delete(key):
+            return False
+        self._unlink_elsewhere([key], owner)
+        return True
+
+    def create_many(self, entries: Iterable[Dict[str, Any]]) -> Dict[str, bool]:
+        """Create many entries, one bulk call per shard"""
+        groups: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for entry in entries:
+            groups[self.shard_index(entry['key'])].append(entry)
+
+        results: Dict[str, bool] = {}
+        for index, group in groups.items():
+            results.update(self.shards[index].create_many(group))
+        return results
+
+    def update_many(self, updates: Union[Dict[str, Any], Iterable[Tuple[str, Any]]]
+                    ) -> Dict[str, bool]:
+        """Update many entries, one bulk call per shard"""
+        if not isinstance(updates, dict):
+            updates = dict(updates)
+
+        groups: Dict[int, Dict[str, Any]] = defaultdict(dict)
+        for key, value in updates.items():
+            groups[self.shard_index(key)][key] = value
+
+        results: Dict[str, bool] = {}
+        for index, group in groups.items():
+            results.update(self.shards[index].update_many(group))
+        return results
+
+    def delete_many(self, keys: Iterable[str]) -> Dict[str, bool]:
+        """Delete many entries, one bulk call per shard"""
+        groups: Dict[int, List[str]] = defaultdict(list)
+        for key in keys:
+            groups[self.shard_index(key)].append(key)
+
+        results: Dict[str, bool] = {}
+        for index, group in groups.items():
+            shard_results = self.shards[index].delete_many(group)
+            results.update(shard_results)
+            deleted = [key for key, ok in shard_results.items() if ok]
+            self._unlink_elsewhere(deleted, self.shards[index])
+        return results
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, Any, float]]:
+        """
+        Full-text search across all shards
+
+        Args:
+            query: Search query
+            limit: Maximum results
+
+        Returns:
+            List of (key, value, score) tuples, highest score first
+        """
+        num_docs = 0
+        total_length = 0
+        doc_freqs: Dict[str, int] = defaultdict(int)
+        for shard in self.shards:
+            shard_docs, shard_length, shard_freqs = shard.term_statistics(query)
+            num_docs += shard_docs
+            total_length += shard_length
+            for term, doc_freq in shard_freqs.items():
+                doc_freqs[term] += doc_freq
+
+        corpus = (num_docs, total_length, doc_freqs)
+        ranked = [shard.search(query, limit, corpus) for shard in self.shards]
+        return list(heapq.merge(*ranked, key=lambda item: -item[2]))[:limit]
+
+    def find_by_tag(self, tag: str) -> List[Tuple[str, Any]]:
+        """Find all entries with a specific tag"""
+        results: List[Tuple[str, Any]] = []
+        for shard in self.shards:
+            results.extend(shard.find_by_tag(tag))
+        return results
+
+    def find_related(self, key: str, depth: int = 1) -> List[str]:
+        """
+        Find related entries, following edges stored on any shard
+
+        Args:
+            key: Starting key
+            depth: Relationship depth (1 = direct, 2 = friends-of-friends, etc.)
+
+        Returns:
+            List of related keys
+        """
+        visited = {key}
+        current_level = {key}
+
+        for _ in range(depth):
+            next_level: Set[str] = set()
+            for shard in self.shards:
+                next_level.update(shard.get_neighbours(current_level))
+            next_level -= visited
+            visited.update(next_level)
+            current_level = next_level
+
+            if not current_level:
+                break
+
+        visited.discard(key)
+        return list(visited)
+
+    def get_version_history(self, key: str) -> List[Dict]:
+        """Get the retained version history for a key"""
+        return self.shard_for(key).get_version_history(key)
+
+    def restore_version(self, key: str, version: int) -> bool:
+        """Restore a specific version"""
+        return self.shard_for(key).restore_version(key, version)
+
+    def get_statistics(self) -> Dict:
+        """Get memory statistics summed over shards (indexed words are counted per shard)"""
+        shard_stats = [shard.get_statistics() for shard in self.shards]
+        operations: Dict[str, int] = defaultdict(int)
+        for stats in shard_stats:
+            for name, count in stats['operations'].items():
+                operations[name] += count
+
+        return {
+            'total_entries': sum(s['total_entries'] for s in shard_stats),
+            'total_tags': len(set().union(*(shard.get_tags() for shard in self.shards))),
+            'total_relationships': sum(s['total_relationships'] for s in shard_stats),
+            'indexed_words': sum(s['indexed_words'] for s in shard_stats),
+            'operations': dict(operations),
+            'storage_size': sum(s['storage_size'] for s in shard_stats),
+            'num_shards': self.num_shards,
+            'shard_entries': [s['total_entries'] for s in shard_stats]
+        }
+
+    def optimize(self) -> Dict[str, int]:
+        """Optimize every shard"""
+        totals: Dict[str, int] = defaultdict(int)
+        for shard in self.shards:
+            for name, count in shard.optimize().items():
+                totals[name] += count
+        return dict(totals)
+
+    def export_graph(self) -> Dict:
+        """Export memory as a graph structure"""
+        nodes = []
+        edges: Set[Tuple[str, str]] = set()
+        for shard in self.shards:
+            graph = shard.export_graph()
+            nodes.extend(graph['nodes'])
+            edges.update((edge['source'], edge['target']) for edge in graph['edges'])
+
+        return {
+            'nodes': nodes,
+            'edges': [{'source': source, 'target': target} for source, target in sorted(edges)]
+        }
+
+    def flush(self) -> None:
+        """Make every pending write durable"""
+        for shard in self.shards:
+            shard.flush()
+
+    def save_to_disk(self) -> None:
+        """Save every shard"""
+        for shard in self.shards:
+            shard.save_to_disk()
+
+    @contextmanager
+    def batch(self) -> Iterator['ShardedMemorySystem']:
+        """Suspend flushing on every shard until the block exits"""
+        with ExitStack() as stack:
+            for shard in self.shards:
+                stack.enter_context(shard.batch())
+            yield self
+
+    def close(self) -> None:
+        """Flush pending writes and stop background work on every shard"""
+        for shard in self.shards:
+            shard.close()
+
+    def _unlink_elsewhere(self, keys: List[str], owner: AdvancedMemorySystem) -> None:
+        """Drop edges to deleted keys that were recorded on other shards"""
+        for shard in self.shards:
+            if shard is owner:
+                continue
+            for key in keys:
+                shard.unlink(key)
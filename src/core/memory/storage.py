@@ -16,15 +16,26 @@ Thalos Prime™ is a proprietary system.
 Memory Module - Data Storage and Management
 
 Deterministic storage interface:
-- In-memory dict-based storage
+- Pluggable storage backends (in-memory dict, JSON file, SQLite)
+- MVCC snapshots: consistent point-in-time reads alongside writers
+- Per-key TTL (lazy expiry on read plus a background sweeper)
+- Optional capacity limit with LRU, LFU or FIFO eviction
+- Ordered prefix/range scans with stable pagination cursors
 - Explicit CRUD semantics
 - No side effects, no magic
 - Optional file-based persistence
 """
 
-from typing import Any, Dict, Optional
-import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+import heapq
 import os
+import threading
+import time
+
+from .backends import InMemoryBackend, JSONBackend, StorageBackend, create_backend
+from .eviction import create_policy
+from .key_index import prefix_upper_bound
+from .mvcc import Snapshot, VersionManager
 
 
 class MemoryModule:
@@ -32,29 +43,90 @@ class MemoryModule:
     Memory Module for data storage and management
     
     Provides deterministic key-value storage:
-    - In-memory dict-based implementation
+    - Backend-based implementation (dict by default)
     - Explicit CRUD operations
     - No automatic timestamps or side effects
     - Optional file-based persistence for data durability
+    
+    Backend selection, first match wins:
+    - an explicit ``backend`` (StorageBackend instance or type name)
+    - ``[memory] storage_type`` from ``config`` ("memory", "json", "sqlite")
+    - "memory", which persists to a JSON file when a path is given
+    
+    Writes are serialised by one lock; snapshot() gives readers a
+    consistent view without copying the store or blocking writers.
+    
+    Keys may carry a TTL. Expired keys vanish on the next read, and a
+    daemon sweeper (running only while TTLs exist) deletes them from a
+    deadline heap. With ``max_items`` set, inserting past the limit evicts
+    keys by the chosen policy. Expiries and evictions are ordinary deletes,
+    so open snapshots still see the old values. Deadlines live in memory
+    only; keys reloaded from disk have no TTL.
     """
     
-    def __init__(self, persistence_path: Optional[str] = None):
+    def __init__(self, persistence_path: Optional[str] = None,
+                 backend: Optional[Union[StorageBackend, str]] = None,
+                 config: Optional[Any] = None,
+                 max_items: Optional[int] = None,
+                 eviction_policy: Optional[str] = None,
+                 default_ttl: Optional[float] = None):
         """
         Initialize the Memory Module
         
         Args:
-            persistence_path: Optional path to JSON file for persistent storage.
-                            If provided, data will be loaded from and saved to this file.
-        """
-        self.storage: Dict[str, Any] = {}
+            persistence_path: Optional path to the backend's file (JSON file or
+                            SQLite database). Falls back to ``[memory] path``.
+            backend: Optional StorageBackend instance or storage type name
+            config: Optional Config providing ``[memory]`` settings
+            max_items: Capacity limit; falls back to ``[memory] max_size``
+                       (unbounded when unset or 0)
+            eviction_policy: 'lru', 'lfu' or 'fifo'; falls back to
+                             ``[memory] eviction_policy``, then 'lru'
+            default_ttl: TTL in seconds for created keys that don't pass one;
+                         falls back to ``[memory] default_ttl`` (none when 0)
+        """
+        storage_type = 'memory'
+        if config is not None:
+            storage_type = config.get('memory', 'storage_type', default='memory')
+            persistence_path = persistence_path or config.get('memory', 'path')
+            if max_items is None:
+                max_items = config.get_int('memory', 'max_size', 0)
+            if eviction_policy is None:
+                eviction_policy = config.get('memory', 'eviction_policy')
+            if default_ttl is None:
+                default_ttl = config.get_float('memory', 'default_ttl', 0.0)
+        
+        if max_items is not None and max_items < 0:
+            raise ValueError(f"max_items must not be negative: {max_items}")
+        if default_ttl is not None and default_ttl < 0:
+            raise ValueError(f"default_ttl must not be negative: {default_ttl}")
+        
+        if isinstance(backend, StorageBackend):
+            self.storage: StorageBackend = backend
+        else:
+            self.storage = create_backend(backend or storage_type, persistence_path)
+        
         self.persistence_path = persistence_path
+        self._mvcc = VersionManager()
         self._initialized = False
         self._validated = False
         self._state = 'created'
         
+        self.max_items = max_items or None
+        self.eviction_policy = eviction_policy or 'lru'
+        self.default_ttl = default_ttl or None
+        self._policy = create_policy(self.eviction_policy) if self.max_items else None
+        self._expiry: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._counters = {'expirations': 0, 'evictions': 0}
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_wake = threading.Condition(self._mvcc.lock)
+        
         # Load existing data from file if persistence is enabled
         if self.persistence_path:
             self.load_from_disk()
+        else:
+            self._track_existing()
             
     def initialize(self) -> bool:
         """
@@ -71,7 +143,7 @@ class MemoryModule:
         try:
             # Ensure storage is initialized
             if self.storage is None:
-                self.storage = {}
+                self.storage = InMemoryBackend()
                 
             self._initialized = True
             self._state = 'initialized'
@@ -103,8 +175,8 @@ class MemoryModule:
                 if directory and not os.path.exists(directory):
                     os.makedirs(directory, exist_ok=True)
                     
-            # Validate storage is a dict
-            if not isinstance(self.storage, dict):
+            # Validate storage is a backend
+            if not isinstance(self.storage, StorageBackend):
                 return False
                 
             self._validated = True
@@ -128,7 +200,16 @@ class MemoryModule:
             'initialized': self._initialized,
             'validated': self._validated,
             'item_count': len(self.storage),
-            'persistence_enabled': self.persistence_path is not None
+            'persistence_enabled': self.persistence_path is not None,
+            'storage_backend': self.storage.name,
+            'version': self._mvcc.version,
+            'active_snapshots': self._mvcc.active_readers,
+            'undo_entries': self._mvcc.undo_entries,
+            'max_items': self.max_items,
+            'eviction_policy': self.eviction_policy if self.max_items else None,
+            'ttl_keys': len(self._expiry),
+            'expirations': self._counters['expirations'],
+            'evictions': self._counters['evictions']
         }
         
     def reconcile(self) -> bool:
@@ -140,14 +221,17 @@ class MemoryModule:
         Returns:
             bool: True if reconciliation successful
         """
-        # Ensure storage is a dict
-        if not isinstance(self.storage, dict):
-            self.storage = {}
+        # Ensure storage is a backend
+        if not isinstance(self.storage, StorageBackend):
+            self.storage = InMemoryBackend()
             
-        # Remove any None keys
-        keys_to_remove = [k for k in self.storage.keys() if k is None]
-        for k in keys_to_remove:
-            del self.storage[k]
+        # Remove any None keys and anything past its TTL
+        with self._mvcc.lock:
+            keys_to_remove = [k for k in self.storage.keys() if k is None]
+            for k in keys_to_remove:
+                self._mvcc.record(k, self.storage)
+                del self.storage[k]
+            self._expire_due()
             
         return True
         
@@ -158,16 +242,20 @@ class MemoryModule:
         Persists full deterministic state for recovery.
         
         Returns:
-            dict: Serialized state
+            dict: Serialized state; 'data' is a copy taken from one
+                  snapshot, so it is consistent while writers continue
         """
+        with self.snapshot() as view:
+            data = dict(view.items())
+        
         state = {
             'version': '1.0',
             'state': self._state,
             'initialized': self._initialized,
             'validated': self._validated,
-            'item_count': len(self.storage),
+            'item_count': len(data),
             'persistence_path': self.persistence_path,
-            'data': self.storage.copy()
+            'data': data
         }
         
         # Also save to disk if persistence enabled
@@ -189,25 +277,38 @@ class MemoryModule:
         if self.persistence_path:
             self.save_to_disk()
             
+        self._stop_sweeper()
+        
         # Clear state but don't destroy storage (allows restart)
         self._state = 'terminated'
         return True
         
-    def create(self, key: str, value: Any) -> bool:
+    def create(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
         """
         Create a new entry in storage (explicit CRUD - Create)
         
         Args:
             key: Unique identifier for the data
             value: Data to store
+            ttl: Seconds until the entry expires (default: default_ttl)
             
         Returns:
             bool: True if creation successful, False if key already exists
-        """
-        if key in self.storage:
-            return False
-        self.storage[key] = value
-        return True
+            
+        Raises:
+            ValueError: If ttl is not a positive number
+        """
+        _check_ttl(ttl)
+        with self._mvcc.lock:
+            self._expire_if_due(key)
+            self._mvcc.record(key, self.storage)
+            if not self.storage.insert(key, value):
+                return False
+            self._set_deadline(key, self.default_ttl if ttl is None else ttl)
+            if self._policy is not None:
+                self._policy.insert(key)
+                self._enforce_capacity()
+            return True
         
     def read(self, key: str) -> Optional[Any]:
         """
@@ -217,25 +318,43 @@ class MemoryModule:
             key: Unique identifier for the data
             
         Returns:
-            Stored data if found, None otherwise
-        """
+            Stored data if found (and not expired), None otherwise
+        """
+        if self._is_expired(key):
+            with self._mvcc.lock:
+                self._expire_if_due(key)
+            return None
+        if self._policy is not None:
+            with self._mvcc.lock:
+                self._policy.access(key)
         return self.storage.get(key)
         
-    def update(self, key: str, value: Any) -> bool:
+    def update(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
         """
         Update existing data in storage (explicit CRUD - Update)
         
         Args:
             key: Unique identifier for the data
             value: New data value
+            ttl: New TTL in seconds (default: keep the current deadline)
             
         Returns:
             bool: True if update successful, False if key doesn't exist
-        """
-        if key not in self.storage:
-            return False
-        self.storage[key] = value
-        return True
+            
+        Raises:
+            ValueError: If ttl is not a positive number
+        """
+        _check_ttl(ttl)
+        with self._mvcc.lock:
+            self._expire_if_due(key)
+            self._mvcc.record(key, self.storage)
+            if not self.storage.replace(key, value):
+                return False
+            if ttl is not None:
+                self._set_deadline(key, ttl)
+            if self._policy is not None:
+                self._policy.access(key)
+            return True
         
     def delete(self, key: str) -> bool:
         """
@@ -247,10 +366,12 @@ class MemoryModule:
         Returns:
             bool: True if deletion successful, False if key doesn't exist
         """
-        if key not in self.storage:
-            return False
-        del self.storage[key]
-        return True
+        with self._mvcc.lock:
+            if self._expire_if_due(key):
+                return False
+            self._mvcc.record(key, self.storage)
+            self._forget(key)
+            return self.storage.discard(key)
         
     def exists(self, key: str) -> bool:
         """
@@ -260,10 +381,50 @@ class MemoryModule:
             key: Unique identifier for the data
             
         Returns:
-            bool: True if key exists, False otherwise
+            bool: True if key exists (and has not expired), False otherwise
         """
+        if self._is_expired(key):
+            with self._mvcc.lock:
+                self._expire_if_due(key)
+            return False
         return key in self.storage
         
+    def set_ttl(self, key: str, ttl: Optional[float]) -> bool:
+        """
+        Set or clear the TTL of an existing key
+        
+        Args:
+            key: Unique identifier for the data
+            ttl: Seconds from now until expiry, or None to keep the key forever
+            
+        Returns:
+            bool: True if the key exists, False otherwise
+            
+        Raises:
+            ValueError: If ttl is not a positive number
+        """
+        _check_ttl(ttl)
+        with self._mvcc.lock:
+            if self._expire_if_due(key) or key not in self.storage:
+                return False
+            self._set_deadline(key, ttl)
+            return True
+        
+    def get_ttl(self, key: str) -> Optional[float]:
+        """
+        Remaining lifetime of a key
+        
+        Args:
+            key: Unique identifier for the data
+            
+        Returns:
+            Seconds until expiry, or None if the key has no TTL (or is gone)
+        """
+        deadline = self._expiry.get(key)
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+        
     def list_keys(self) -> list:
         """
         List all stored keys
@@ -271,11 +432,90 @@ class MemoryModule:
         Returns:
             List of all keys in storage
         """
-        return list(self.storage.keys())
+        with self._mvcc.lock:
+            self._expire_due()
+            return list(self.storage.keys())
+        
+    def scan(self, prefix: Optional[str] = None, start: Optional[str] = None,
+             end: Optional[str] = None, limit: Optional[int] = None,
+             cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """
+        List keys in sorted order, optionally by prefix or range, page by page
+        
+        Served from the backend's ordered key index, so only the returned
+        page is visited. The cursor is the last key of the previous page and
+        the next page starts strictly after it, so pages stay consistent
+        while keys are inserted or deleted concurrently.
+        
+        Example:
+            keys, cursor = memory.scan(prefix="session:42:", limit=100)
+            while cursor:
+                more, cursor = memory.scan(prefix="session:42:", limit=100, cursor=cursor)
+        
+        Args:
+            prefix: Only keys starting with this string
+            start: Inclusive lower bound
+            end: Exclusive upper bound
+            limit: Maximum number of keys per page (all when None)
+            cursor: Cursor returned by the previous page
+            
+        Returns:
+            Tuple of (keys, cursor for the next page or None when done)
+        """
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit must be positive: {limit}")
+        
+        low, high, inclusive = start, end, True
+        if prefix:
+            if low is None or prefix > low:
+                low = prefix
+            prefix_end = prefix_upper_bound(prefix)
+            if prefix_end is not None and (high is None or prefix_end < high):
+                high = prefix_end
+        if cursor is not None and (low is None or cursor >= low):
+            low, inclusive = cursor, False
+        
+        with self._mvcc.lock:
+            self._expire_due()
+            keys = self.storage.key_range(low, high, inclusive,
+                                          None if limit is None else limit + 1)
+        
+        if limit is not None and len(keys) > limit:
+            del keys[limit:]
+            return keys, keys[-1]
+        return keys, None
         
     def clear(self) -> None:
         """Clear all data from storage"""
-        self.storage.clear()
+        with self._mvcc.lock:
+            if self._mvcc.active_readers:
+                for key in list(self.storage.keys()):
+                    self._mvcc.record(key, self.storage)
+            else:
+                self._mvcc.version += 1
+            self.storage.clear()
+            self._expiry.clear()
+            self._expiry_heap.clear()
+            if self._policy is not None:
+                self._policy.clear()
+        
+    def snapshot(self) -> Snapshot:
+        """
+        Consistent read-only view of the current contents
+        
+        O(1) to create. While it is open, writers keep the previous value of
+        each key they change (only while some snapshot needs it), so scans
+        see one version without copying the store or blocking writers.
+        
+        Example:
+            with memory.snapshot() as view:
+                for key, value in view.items():
+                    ...
+        
+        Returns:
+            Snapshot (a read-only Mapping); close it when done
+        """
+        return Snapshot(self._mvcc, self.storage)
         
     def count(self) -> int:
         """
@@ -284,7 +524,9 @@ class MemoryModule:
         Returns:
             Number of items in storage
         """
-        return len(self.storage)
+        with self._mvcc.lock:
+            self._expire_due()
+            return len(self.storage)
         
     def save_to_disk(self) -> bool:
         """
@@ -297,12 +539,13 @@ class MemoryModule:
             return True  # No persistence configured, nothing to do
             
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.persistence_path), exist_ok=True)
-            
-            # Write storage to JSON file
-            with open(self.persistence_path, 'w') as f:
-                json.dump(self.storage, f, indent=2)
+            if isinstance(self.storage, JSONBackend):
+                # Full rewrites stream from a snapshot so writers keep going
+                with self.snapshot() as view:
+                    self.storage.save(view.items())
+            else:
+                # Other backends write only what changed
+                self.storage.flush()
             return True
         except Exception as e:
             # In production, you'd log this error
@@ -323,10 +566,125 @@ class MemoryModule:
             return True  # File doesn't exist yet, start with empty storage
             
         try:
-            with open(self.persistence_path, 'r') as f:
-                self.storage = json.load(f)
+            with self._mvcc.lock:
+                self.storage.load()
+                self._expiry.clear()
+                self._expiry_heap.clear()
+                self._track_existing()
             return True
         except Exception as e:
             # In production, you'd log this error
             print(f"Error loading from disk: {e}")
             return False
+            
+    def _is_expired(self, key: str) -> bool:
+        """True if the key has a deadline that has passed (lock-free check)"""
+        deadline = self._expiry.get(key)
+        return deadline is not None and deadline <= time.monotonic()
+        
+    def _expire_if_due(self, key: str) -> bool:
+        """Delete a key whose deadline has passed; caller holds the lock"""
+        if not self._is_expired(key):
+            return False
+        self._remove(key)
+        self._counters['expirations'] += 1
+        return True
+        
+    def _expire_due(self) -> int:
+        """Delete every key whose deadline has passed; caller holds the lock"""
+        now = time.monotonic()
+        expired = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            deadline, key = heapq.heappop(heap)
+            # Entries superseded by a later set_ttl/delete are skipped
+            if self._expiry.get(key) == deadline:
+                self._remove(key)
+                expired += 1
+        self._counters['expirations'] += expired
+        return expired
+        
+    def _set_deadline(self, key: str, ttl: Optional[float]) -> None:
+        """Replace a key's deadline; caller holds the lock and checked ttl"""
+        if ttl is None:
+            self._expiry.pop(key, None)
+            return
+        
+        deadline = time.monotonic() + ttl
+        self._expiry[key] = deadline
+        heap = self._expiry_heap
+        heapq.heappush(heap, (deadline, key))
+        if len(heap) > 2 * len(self._expiry) + 64:
+            # Too many superseded entries; rebuild from the live deadlines
+            heap[:] = [(d, k) for k, d in self._expiry.items()]
+            heapq.heapify(heap)
+        
+        if heap[0][1] == key:
+            self._sweeper_wake.notify()
+        self._start_sweeper()
+        
+    def _forget(self, key: str) -> None:
+        """Drop TTL and eviction tracking for a key; caller holds the lock"""
+        self._expiry.pop(key, None)
+        if self._policy is not None:
+            self._policy.remove(key)
+        
+    def _remove(self, key: str) -> None:
+        """Delete a key on behalf of expiry or eviction; caller holds the lock"""
+        self._mvcc.record(key, self.storage)
+        self.storage.discard(key)
+        self._forget(key)
+        
+    def _enforce_capacity(self) -> None:
+        """Evict keys until the store fits max_items; caller holds the lock"""
+        while len(self._policy) > self.max_items:
+            victim = self._policy.pop_victim()
+            self._mvcc.record(victim, self.storage)
+            self.storage.discard(victim)
+            self._expiry.pop(victim, None)
+            self._counters['evictions'] += 1
+            
+    def _track_existing(self) -> None:
+        """Register keys already in the backend with the eviction policy"""
+        if self._policy is None:
+            return
+        with self._mvcc.lock:
+            self._policy.clear()
+            for key in self.storage.keys():
+                self._policy.insert(key)
+            self._enforce_capacity()
+            
+    def _start_sweeper(self) -> None:
+        """Start the expiry thread if it isn't running; caller holds the lock"""
+        if self._sweeper is None:
+            self._sweeper = threading.Thread(target=self._sweep, name='memory-ttl-sweeper',
+                                             daemon=True)
+            self._sweeper.start()
+            
+    def _stop_sweeper(self) -> None:
+        """Stop the expiry thread (restarted by the next TTL write)"""
+        with self._mvcc.lock:
+            sweeper = self._sweeper
+            self._sweeper = None
+            self._sweeper_wake.notify_all()
+        if sweeper is not None and sweeper is not threading.current_thread():
+            sweeper.join()
+            
+    def _sweep(self) -> None:
+        """Sleep until the earliest deadline, expire, repeat while TTLs exist"""
+        me = threading.current_thread()
+        with self._sweeper_wake:
+            while self._sweeper is me:
+                self._expire_due()
+                if not self._expiry_heap:
+                    self._sweeper = None
+                    return
+                self._sweeper_wake.wait(self._expiry_heap[0][0] - time.monotonic())
+
+
+def _check_ttl(ttl: Optional[float]) -> None:
+    """Reject a ttl that is neither None nor a positive number"""
+    if ttl is None:
+        return
+    if isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or not ttl > 0:
+        raise ValueError(f"ttl must be a positive number: {ttl!r}")
@@ -0,0 +1,287 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Tiered Value Store
+
+Bounded hot-value cache backed by an on-disk value log:
+- Byte-sized LRU or LFU cache of deserialised values
+- Write-through, append-only log of pickled values
+- Only key -> (offset, length) locations stay resident for cold values
+- Hit, miss and eviction counters
+- Log garbage collection into a new log generation
+"""
+
+import os
+import pickle
+import struct
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from .eviction import create_policy
+
+
+_FRAME = struct.Struct('<I')
+_MISSING = object()
+
+
+class ValueCache:
+    """
+    Byte-bounded value cache
+
+    Sizes are the pickled size of each value, a stable proxy for its
+    in-memory footprint that the value log computes anyway.
+    """
+
+    def __init__(self, max_bytes: int, policy: str = 'lru',
+                 stats: Optional[Dict[str, int]] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Capacity in (pickled) bytes
+            policy: Eviction policy name, 'lru' or 'lfu'
+            stats: Dict receiving cache_hits / cache_misses / cache_evictions
+        """
+        self.max_bytes = max_bytes
+        self.policy = create_policy(policy)
+        self.stats = stats if stats is not None else {}
+        for counter in ('cache_hits', 'cache_misses', 'cache_evictions'):
+            self.stats.setdefault(counter, 0)
+        self.current_bytes = 0
+        self._values: Dict[Hashable, Tuple[Any, int]] = {}
+
+    def lookup(self, key: Hashable) -> Any:
+        """Return a cached value (counting a hit) or _MISSING (counting a miss)"""
+        entry = self._values.get(key)
+        if entry is None:
+            self.stats['cache_misses'] += 1
+            return _MISSING
+        self.stats['cache_hits'] += 1
+        self.policy.access(key)
+        return entry[0]
+
+    def peek(self, key: Hashable) -> Any:
+        """Return a cached value or _MISSING without touching stats or recency"""
+        entry = self._values.get(key)
+        return _MISSING if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """Cache a value, evicting others until it fits"""
+        self.discard(key)
+        if size > self.max_bytes:
+            return
+
+        while self.current_bytes + size > self.max_bytes:
+            victim = self.policy.pop_victim()
+            self.current_bytes -= self._values.pop(victim)[1]
+            self.stats['cache_evictions'] += 1
+
+        self._values[key] = (value, size)
+        self.current_bytes += size
+        self.policy.insert(key)
+
+    def discard(self, key: Hashable) -> None:
+        """Drop a value without counting an eviction"""
+        entry = self._values.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+            self.policy.remove(key)
+
+    def clear(self) -> None:
+        self._values.clear()
+        self.policy.clear()
+        self.current_bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class TieredValueStore(MutableMapping):
+    """
+    Mapping whose values live in a log file, with a hot subset cached
+
+    Every write is appended to ``values-<gen>.log`` (buffered; flush()
+    fsyncs). The caller persists state() with its snapshot; bytes past the
+    recorded size are dropped on reopen, as with VersionStore.
+
+    The log location a write or delete supersedes is remembered until
+    previous_loader() claims it, so the version store can diff against
+    the old value without keeping it in memory.
+    """
+
+    def __init__(self, directory: Path, cache_bytes: int, policy: str = 'lru',
+                 stats: Optional[Dict[str, int]] = None):
+        """
+        Initialize the store
+
+        Args:
+            directory: Directory holding values-<gen>.log files
+            cache_bytes: Hot cache capacity in bytes
+            policy: Cache eviction policy, 'lru' or 'lfu'
+            stats: Dict receiving the cache counters
+        """
+        self.directory = Path(directory)
+        self.cache = ValueCache(cache_bytes, policy, stats)
+        self.locations: Dict[str, Tuple[int, int]] = {}
+        self.superseded: Dict[str, Tuple[int, int]] = {}
+
+        self.generation = 0
+        self.log_size = 0
+        self.live_bytes = 0
+        self._writer: Optional[BinaryIO] = None
+        self._reader: Optional[BinaryIO] = None
+
+    @property
+    def log_name(self) -> str:
+        return f"values-{self.generation:08d}.log"
+
+    @property
+    def log_path(self) -> Path:
+        return self.directory / self.log_name
+
+    def __getitem__(self, key: str) -> Any:
+        offset, length = self.locations[key]
+        value = self.cache.lookup(key)
+        if value is not _MISSING:
+            return value
+        value = self._read(offset, length)
+        self.cache.put(key, value, length)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self._writer is None:
+            # Bytes past log_size belong to writes no durable snapshot covers
+            self._writer = open(self.log_path, 'ab')
+            self._writer.truncate(self.log_size)
+        self._writer.write(_FRAME.pack(len(payload)) + payload)
+
+        self._release(key)
+        self.locations[key] = (self.log_size + _FRAME.size, len(payload))
+        self.log_size += _FRAME.size + len(payload)
+        self.live_bytes += _FRAME.size + len(payload)
+        self.cache.put(key, value, len(payload))
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self.locations:
+            raise KeyError(key)
+        self._release(key)
+        del self.locations[key]
+        self.cache.discard(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.locations
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.locations)
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate every entry without disturbing the hot cache"""
+        for key, (offset, length) in list(self.locations.items()):
+            value = self.cache.peek(key)
+            yield key, value if value is not _MISSING else self._read(offset, length)
+
+    def values(self) -> Iterator[Any]:
+        """Iterate every value without disturbing the hot cache"""
+        for _, value in self.items():
+            yield value
+
+    def previous_loader(self, key: str) -> Optional[Callable[[], Any]]:
+        """
+        Claim the value a key had before its latest write or delete
+
+        Returns:
+            A function reading the old value from the log, or None if the
+            key had no earlier value
+        """
+        location = self.superseded.pop(key, None)
+        if location is None:
+            return None
+        return lambda: self._read(*location)
+
+    def flush(self) -> None:
+        """Make appended values durable"""
+        if self._writer is not None:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+
+    def needs_compaction(self) -> bool:
+        """True when overwritten values make up most of the log"""
+        garbage = self.log_size - self.live_bytes
+        return garbage > 1 << 20 and garbage > self.live_bytes
+
+    def compact(self) -> None:
+        """Rewrite live values into the next log generation"""
+        self.flush()
+        old_path = self.log_path
+        self.generation += 1
+        self._close_handles()
+
+        locations: Dict[str, Tuple[int, int]] = {}
+        size = 0
+        with open(self.log_path, 'wb') as out, open(old_path, 'rb') as src:
+            for key, (offset, length) in self.locations.items():
+                src.seek(offset)
+                out.write(_FRAME.pack(length) + src.read(length))
+                locations[key] = (size + _FRAME.size, length)
+                size += _FRAME.size + length
+            out.flush()
+            os.fsync(out.fileno())
+
+        self.locations = locations
+        self.superseded.clear()  # garbage records are not carried over
+        self.log_size = size
+        self.live_bytes = size
+
+    def state(self) -> Dict[str, Any]:
+        """Location state to persist alongside a snapshot (call after flush())"""
+        return {'file': self.log_name, 'size': self.log_size,
+                'live_bytes': self.live_bytes, 'locations': dict(self.locations)}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Reopen the log referenced by a snapshot's state()"""
+        self._close_handles()
+        self.generation = int(state['file'][len('values-'):-len('.log')])
+        self.log_size = state['size']
+        self.live_bytes = state['live_bytes']
+        self.locations = state['locations']
+        self.superseded.clear()
+        self.cache.clear()
+
+    def close(self) -> None:
+        """Close file handles"""
+        self._close_handles()
+
+    def _release(self, key: str) -> None:
+        """Account for the superseded log record of a key"""
+        location = self.locations.get(key)
+        if location is not None:
+            self.live_bytes -= _FRAME.size + location[1]
+            # The oldest unclaimed location is the one the version store last saw
+            self.superseded.setdefault(key, location)
+
+    def _read(self, offset: int, length: int) -> Any:
+        if self._writer is not None:
+            self._writer.flush()
+        if self._reader is None:
+            self._reader = open(self.log_path, 'rb')
+        self._reader.seek(offset)
+        return pickle.loads(self._reader.read(length))
+
+    def _close_handles(self) -> None:
+        for handle in (self._writer, self._reader):
+            if handle is not None:
+                handle.close()
+        self._writer = None
+        self._reader = None
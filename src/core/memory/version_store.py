@@ -0,0 +1,359 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Version History Store
+
+Bounded, delta-encoded version history for the advanced memory system:
+- Append-only log of pickled version records, separate from the main store
+- Dict values stored as shallow deltas against the previous version,
+  with periodic full keyframes
+- Retention by version count and/or age
+- Per-key history loaded lazily from disk, with a small LRU cache
+- Log garbage collection into a new log generation
+"""
+
+import os
+import pickle
+import struct
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+
+_FRAME = struct.Struct('<I')
+_PENDING = -1
+_NO_TIP = object()
+
+# Entry: (version, timestamp, offset in log or _PENDING, record length)
+Entry = Tuple[int, str, int, int]
+
+
+def diff_values(old: Any, new: Any) -> Optional[Dict[str, Any]]:
+    """
+    Shallow delta between two dict values
+
+    Returns:
+        {'set': {...}, 'unset': [...]} or None when a full copy is as small
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None
+    changed = {k: v for k, v in new.items() if k not in old or old[k] != v}
+    removed = [k for k in old if k not in new]
+    if len(changed) + len(removed) >= len(new):
+        return None
+    return {'set': changed, 'unset': removed}
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a dict value from its predecessor and a diff_values() delta"""
+    value = dict(base)
+    value.update(delta['set'])
+    for k in delta['unset']:
+        value.pop(k, None)
+    return value
+
+
+class VersionStore:
+    """
+    Delta-encoded version history with retention
+
+    Records are buffered in memory and appended to the log on flush(); the
+    caller persists state() together with its own snapshot so that the log
+    prefix and the entry index always agree after a crash.
+
+    By default the latest value of each key is kept to diff the next
+    version against. With ``keep_tips=False`` only the delta run length is
+    kept and the caller passes the previous value to append() on demand,
+    so resident memory does not grow with the size of the values.
+    """
+
+    def __init__(self, directory: Path, max_versions: Optional[int] = None,
+                 max_age_days: Optional[float] = None, keyframe_interval: int = 16,
+                 cache_size: int = 64, keep_tips: bool = True):
+        """
+        Initialize the version store
+
+        Args:
+            directory: Directory holding versions-<gen>.log files
+            max_versions: Keep at most this many versions per key (None = unbounded)
+            max_age_days: Drop versions older than this (the newest is always kept)
+            keyframe_interval: Maximum number of consecutive delta records
+            cache_size: Number of reconstructed per-key histories kept in memory
+            keep_tips: Keep each key's latest value in memory for delta encoding
+        """
+        self.directory = Path(directory)
+        self.max_versions = max_versions
+        self.max_age_days = max_age_days
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.cache_size = cache_size
+        self.keep_tips = keep_tips
+
+        self.entries: Dict[str, List[Entry]] = {}
+        self._pending: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._tips: Dict[str, Tuple[Any, int]] = {}
+        self._cache: 'OrderedDict[str, List[Dict[str, Any]]]' = OrderedDict()
+
+        self.generation = 0
+        self.log_size = 0
+        self.live_bytes = 0
+        self._writer: Optional[BinaryIO] = None
+        self._reader: Optional[BinaryIO] = None
+
+    @property
+    def log_name(self) -> str:
+        return f"versions-{self.generation:08d}.log"
+
+    @property
+    def log_path(self) -> Path:
+        return self.directory / self.log_name
+
+    def append(self, key: str, value: Any, action: str, timestamp: str,
+               previous: Optional[Callable[[], Any]] = None) -> int:
+        """
+        Record a new version of a key
+
+        Args:
+            key: Entry key
+            value: Value at this version
+            action: What produced the version ('created', 'updated', ...)
+            timestamp: ISO timestamp
+            previous: Loads the key's previous value (used instead of the
+                      kept tip when ``keep_tips`` is off; None = unknown)
+
+        Returns:
+            The new version number
+        """
+        entries = self.entries.setdefault(key, [])
+        version = entries[-1][0] + 1 if entries else 1
+
+        record: Dict[str, Any] = {'key': key, 'version': version,
+                                  'timestamp': timestamp, 'action': action}
+        tip_value, run = self._tips.get(key, (_NO_TIP, None))
+        delta = None
+        if run is not None and run + 1 < self.keyframe_interval and isinstance(value, dict):
+            if not self.keep_tips and previous is not None:
+                tip_value = previous()
+            if tip_value is not _NO_TIP:
+                delta = diff_values(tip_value, value)
+        if delta is not None:
+            record['delta'] = delta
+            run += 1
+        else:
+            record['value'] = value
+            run = 0
+
+        self._pending[(key, version)] = record
+        entries.append((version, timestamp, _PENDING, 0))
+        self._tips[key] = (value if self.keep_tips else _NO_TIP, run)
+        self._cache.pop(key, None)
+
+        self._apply_retention(key)
+        return version
+
+    def history(self, key: str) -> List[Dict[str, Any]]:
+        """
+        Reconstruct the retained history of a key
+
+        Returns:
+            List of {'version', 'timestamp', 'action', 'value'} dicts, oldest first
+        """
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        history: List[Dict[str, Any]] = []
+        value: Any = None
+        for entry in self.entries.get(key, []):
+            record = self._load(key, entry)
+            if 'delta' in record:
+                value = apply_delta(value, record['delta'])
+            else:
+                value = record['value']
+            history.append({'version': record['version'], 'timestamp': record['timestamp'],
+                            'action': record['action'], 'value': value})
+
+        if self.cache_size:
+            self._cache[key] = history
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return history
+
+    def get(self, key: str, version: int) -> Optional[Dict[str, Any]]:
+        """Reconstruct one retained version, or None"""
+        for item in self.history(key):
+            if item['version'] == version:
+                return item
+        return None
+
+    def forget_tip(self, key: str) -> None:
+        """Make the next version of a key a full keyframe (e.g. after deletion)"""
+        self._tips.pop(key, None)
+
+    def prune(self) -> int:
+        """
+        Apply retention to every key
+
+        Returns:
+            Number of versions dropped
+        """
+        before = sum(len(entries) for entries in self.entries.values())
+        for key in list(self.entries):
+            self._apply_retention(key)
+        return before - sum(len(entries) for entries in self.entries.values())
+
+    def flush(self, sync: bool = True) -> None:
+        """
+        Append buffered records to the log
+
+        Args:
+            sync: fsync the log (skip when another log already makes the
+                  versions durable, e.g. the write-ahead log)
+        """
+        if not self._pending:
+            return
+        if self._writer is None:
+            # Bytes past log_size belong to a flush whose snapshot never became
+            # durable; drop them so WAL replay can append those versions again
+            self._writer = open(self.log_path, 'ab')
+            self._writer.truncate(self.log_size)
+
+        written: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        for (key, version), record in self._pending.items():
+            payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+            self._writer.write(_FRAME.pack(len(payload)) + payload)
+            written[(key, version)] = (self.log_size + _FRAME.size, len(payload))
+            self.log_size += _FRAME.size + len(payload)
+            self.live_bytes += _FRAME.size + len(payload)
+        self._writer.flush()
+        if sync:
+            os.fsync(self._writer.fileno())
+
+        for key in {key for key, _ in written}:
+            self.entries[key] = [
+                (version, ts, *written[(key, version)]) if offset == _PENDING else
+                (version, ts, offset, length)
+                for version, ts, offset, length in self.entries[key]
+            ]
+        self._pending.clear()
+
+    def needs_compaction(self) -> bool:
+        """True when dropped records make up most of the log"""
+        garbage = self.log_size - self.live_bytes
+        return garbage > 1 << 20 and garbage > self.live_bytes
+
+    def compact(self) -> None:
+        """Rewrite live records into the next log generation"""
+        self.flush()
+        old_path = self.log_path
+        self.generation += 1
+        self._close_handles()
+
+        new_entries: Dict[str, List[Entry]] = {}
+        size = 0
+        with open(self.log_path, 'wb') as out, open(old_path, 'rb') as src:
+            for key, entries in self.entries.items():
+                rewritten = []
+                for version, ts, offset, length in entries:
+                    src.seek(offset)
+                    payload = src.read(length)
+                    out.write(_FRAME.pack(length) + payload)
+                    rewritten.append((version, ts, size + _FRAME.size, length))
+                    size += _FRAME.size + length
+                new_entries[key] = rewritten
+            out.flush()
+            os.fsync(out.fileno())
+
+        self.entries = new_entries
+        self.log_size = size
+        self.live_bytes = size
+
+    def state(self) -> Dict[str, Any]:
+        """Index state to persist alongside a snapshot (call after flush())"""
+        return {'file': self.log_name, 'size': self.log_size,
+                'live_bytes': self.live_bytes, 'entries': self.entries}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Reopen the log referenced by a snapshot's state()"""
+        self._close_handles()
+        self.generation = int(state['file'][len('versions-'):-len('.log')])
+        self.log_size = state['size']
+        self.live_bytes = state['live_bytes']
+        self.entries = state['entries']
+        self._pending.clear()
+        self._tips.clear()
+        self._cache.clear()
+
+    def import_history(self, key: str, history: List[Dict[str, Any]]) -> None:
+        """Load a key's history from the older in-memory list format"""
+        for item in history:
+            self.append(key, item['value'], item['action'], item['timestamp'])
+
+    def remove_stale_logs(self, keep: str) -> None:
+        """Delete log generations other than the one a durable snapshot references"""
+        for path in self.directory.glob("versions-*.log"):
+            if path.name != keep:
+                path.unlink()
+
+    def close(self) -> None:
+        """Close file handles (buffered records are kept)"""
+        self._close_handles()
+
+    def _apply_retention(self, key: str) -> None:
+        """Drop versions outside the retention window, keeping the newest"""
+        entries = self.entries[key]
+        drop = 0
+        if self.max_versions is not None and len(entries) > self.max_versions:
+            drop = len(entries) - max(1, self.max_versions)
+        if self.max_age_days is not None:
+            cutoff = datetime.now() - timedelta(days=self.max_age_days)
+            while (drop < len(entries) - 1
+                   and datetime.fromisoformat(entries[drop][1]) < cutoff):
+                drop += 1
+        if not drop:
+            return
+
+        # The oldest surviving version must become a keyframe
+        survivor = entries[drop]
+        record = self._load(key, survivor)
+        if 'delta' in record:
+            full = self.history(key)[drop]
+            record = {'key': key, 'version': full['version'], 'timestamp': full['timestamp'],
+                      'action': full['action'], 'value': full['value']}
+            self._pending[(key, survivor[0])] = record
+            self._release(survivor)
+            entries[drop] = (survivor[0], survivor[1], _PENDING, 0)
+
+        for entry in entries[:drop]:
+            self._pending.pop((key, entry[0]), None)
+            self._release(entry)
+        del entries[:drop]
+        self._cache.pop(key, None)
+
+    def _release(self, entry: Entry) -> None:
+        """Account for a log record that is no longer referenced"""
+        if entry[2] != _PENDING:
+            self.live_bytes -= _FRAME.size + entry[3]
+
+    def _load(self, key: str, entry: Entry) -> Dict[str, Any]:
+        """Read one record from the pending buffer or the log"""
+        version, _, offset, length = entry
+        if offset == _PENDING:
+            return self._pending[(key, version)]
+        if self._reader is None:
+            if self._writer is not None:
+                self._writer.flush()
+            self._reader = open(self.log_path, 'rb')
+        self._reader.seek(offset)
+        return pickle.loads(self._reader.read(length))
+
+    def _close_handles(self) -> None:
+        for handle in (self._writer, self._reader):
+            if handle is not None:
+                handle.close()
+        self._writer = None
+        self._reader = None
@@ -0,0 +1,180 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+
+Thalos Prime™ is a proprietary system.
+"""
+
+"""
+Write-Ahead Log for Memory Persistence
+
+Append-only mutation log:
+- One compact JSON record per line, tagged with a monotonic sequence number
+- Buffered appends with batched fsync
+- Segment rotation so a snapshot can be taken while writes continue
+- Crash-tolerant replay (a torn trailing record is ignored)
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+class WriteAheadLog:
+    """
+    Append-only log of memory mutations
+
+    The active segment is ``<name>``; ``rotate()`` seals it as ``<name>.old``
+    so that a snapshot covering every sealed record can be written in the
+    background. Once the snapshot is durable the sealed segment is discarded.
+    """
+
+    def __init__(self, path: Path, sync_every: int = 64):
+        """
+        Open (or create) a write-ahead log
+
+        Args:
+            path: Path of the active log segment
+            sync_every: Number of appended records between automatic fsyncs
+                        (0 disables automatic syncing)
+        """
+        self.path = Path(path)
+        self.sealed_path = self.path.with_name(self.path.name + '.old')
+        self.sync_every = sync_every
+
+        self.last_seq = self._scan_last_seq()
+        self.records_since_rotate = 0
+        self._unsynced = 0
+        self._file = open(self.path, 'ab')
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Append a mutation record
+
+        Args:
+            record: JSON-serialisable mutation description
+
+        Returns:
+            Sequence number assigned to the record
+        """
+        self.last_seq += 1
+        record['s'] = self.last_seq
+        line = json.dumps(record, separators=(',', ':'), default=str)
+        self._file.write(line.encode('utf-8') + b'\n')
+
+        self.records_since_rotate += 1
+        self._unsynced += 1
+        if self.sync_every and self._unsynced >= self.sync_every:
+            self.sync()
+
+        return self.last_seq
+
+    def sync(self) -> None:
+        """Flush buffered records and fsync the active segment"""
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of records appended since the last fsync"""
+        return self._unsynced
+
+    def rotate(self) -> int:
+        """
+        Seal the active segment and start a new one
+
+        Any previously sealed segment that was never discarded (e.g. after a
+        crash during compaction) is merged into the new sealed segment so
+        that replay order is preserved.
+
+        Returns:
+            Sequence number of the last sealed record
+        """
+        self.sync()
+        self._file.close()
+
+        if self.sealed_path.exists():
+            with open(self.sealed_path, 'ab') as sealed, open(self.path, 'rb') as active:
+                for chunk in iter(lambda: active.read(1 << 20), b''):
+                    sealed.write(chunk)
+                sealed.flush()
+                os.fsync(sealed.fileno())
+            self.path.unlink()
+        else:
+            os.replace(self.path, self.sealed_path)
+
+        self._file = open(self.path, 'ab')
+        self.records_since_rotate = 0
+        return self.last_seq
+
+    def discard_sealed(self) -> None:
+        """Remove the sealed segment once a snapshot covers it"""
+        if self.sealed_path.exists():
+            self.sealed_path.unlink()
+
+    def replay(self, after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over logged records newer than a snapshot
+
+        Args:
+            after_seq: Sequence number already contained in the snapshot
+
+        Yields:
+            Mutation records in log order
+        """
+        self.sync()
+        for segment in (self.sealed_path, self.path):
+            for record in self._read_segment(segment):
+                if record['s'] > after_seq:
+                    yield record
+
+    def close(self) -> None:
+        """Sync and close the active segment"""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def _scan_last_seq(self) -> int:
+        """Find the highest sequence number on disk, dropping a torn tail"""
+        last_seq = 0
+        for record in self._read_segment(self.sealed_path):
+            last_seq = max(last_seq, record['s'])
+
+        if self.path.exists():
+            valid_bytes = 0
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if not isinstance(record, dict) or 's' not in record:
+                        break
+                    last_seq = max(last_seq, record['s'])
+                    valid_bytes += len(line)
+            if valid_bytes < self.path.stat().st_size:
+                with open(self.path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+        return last_seq
+
+    @staticmethod
+    def _read_segment(segment: Path) -> Iterator[Dict[str, Any]]:
+        """Read records from a segment, stopping at a torn trailing line"""
+        if not segment.exists():
+            return
+        with open(segment, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record: Optional[Dict[str, Any]] = json.loads(line)
+                except ValueError:
+                    break
+                if not isinstance(record, dict) or 's' not in record:
+                    break
+                yield record
@@ -8,6 +8,11 @@ Thalos Prime™ is a proprietary system.
 Database Module - Auto-Reconnecting Database Management
 """
 
-from .connection_manager import DatabaseManager, ConnectionPool
+from .connection_manager import DatabaseManager, ConnectionPool, PoolStatistics
+from .async_pool import AsyncDatabaseManager, AsyncConnectionPool
+from .query import Cursor, PreparedStatement, StatementCache
+from .indexes import IndexedStore
 
-__all__ = ['DatabaseManager', 'ConnectionPool']
+__all__ = ['DatabaseManager', 'ConnectionPool', 'PoolStatistics',
+           'AsyncDatabaseManager', 'AsyncConnectionPool',
+           'Cursor', 'PreparedStatement', 'StatementCache', 'IndexedStore']
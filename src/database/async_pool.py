@@ -0,0 +1,390 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+Thalos Prime™ is a proprietary system.
+
+Asyncio Connection Pool and Database Manager
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+from core.exceptions import PoolTimeoutError, ResourceError
+from .file_store import FileStore
+from .connection_manager import (
+    DatabaseManager, PoolStatistics, _PooledConnection, _default_validate, expired
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _call(func: Callable, *args: Any) -> Any:
+    """Call a sync or async function"""
+    result = func(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class AsyncConnectionPool:
+    """
+    Connection pool for asyncio code, the counterpart of ConnectionPool
+
+    Callers that find the pool exhausted queue as futures in FIFO order; a
+    returned connection (or a freed slot) is handed directly to the oldest
+    waiter, so later callers can't overtake it. A caller cancelled or timed
+    out while waiting leaves the queue, and a connection handed to it in
+    that instant is passed on instead of leaking. ``create_func``,
+    ``validate_func`` and connections' ``close`` may be sync or async.
+
+    Not thread-safe: use one pool per event loop. Statistics are a
+    PoolStatistics, reported in the same format as the sync pool.
+    """
+
+    def __init__(self, create_func: Callable[[], Any], max_conn: int = 10, min_conn: int = 2,
+                 max_retries: int = 5, timeout: Optional[float] = 30.0,
+                 max_idle_time: Optional[float] = 300.0, max_lifetime: Optional[float] = 3600.0,
+                 validate_func: Optional[Callable[[Any], Any]] = None,
+                 health_check_interval: Optional[float] = 30.0, retry_delay: float = 0.1):
+        """
+        Initialize the pool (connections are opened lazily)
+
+        Args:
+            create_func: Opens a new connection (may be a coroutine function)
+            max_conn: Maximum open connections (idle + in use)
+            min_conn: Connections kept open by the maintenance task
+            max_retries: Attempts per connection before giving up
+            timeout: Default seconds to wait for a connection (None = forever)
+            max_idle_time: Close connections idle longer than this (None = never)
+            max_lifetime: Close connections older than this (None = never)
+            validate_func: Health check run on checkout (may be async)
+            health_check_interval: Seconds between maintenance passes
+                                   (None or 0 disables the task)
+            retry_delay: Initial backoff between connection attempts
+        """
+        if max_conn < 1:
+            raise ValueError(f"max_conn must be positive: {max_conn}")
+
+        self.create_connection = create_func
+        self.validate_connection = validate_func or _default_validate
+        self.max_connections = max_conn
+        self.min_connections = min(min_conn, max_conn)
+        self.max_retries = max(1, max_retries)
+        self.timeout = timeout
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.retry_delay = retry_delay
+
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._size = 0  # idle + in use + being opened
+        self._closed = False
+        self._maintainer: Optional[asyncio.Task] = None
+        self.stats = PoolStatistics()
+
+    async def get_connection(self, timeout: Optional[float] = None) -> Any:
+        """
+        Check out a healthy connection, waiting in line if the pool is exhausted
+
+        Args:
+            timeout: Seconds to wait (default: the pool's timeout)
+
+        Returns:
+            A connection; hand it back with return_connection()
+
+        Raises:
+            PoolTimeoutError: If none became available in time
+            ResourceError: If the pool is closed or a connection cannot be opened
+        """
+        self._start_maintenance()
+        started = time.monotonic()
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else started + timeout
+
+        replacing = False
+        while True:
+            record = await self._acquire(deadline)
+            if record is None:
+                # A slot was reserved for a new connection
+                try:
+                    record = await self._open()
+                except BaseException:
+                    self._release_slot()
+                    raise
+                if replacing:
+                    self.stats.total_reconnections += 1
+            else:
+                try:
+                    usable = await self._is_usable(record, time.monotonic())
+                except BaseException:
+                    self._release(record)
+                    raise
+                if not usable:
+                    self.stats.total_discarded += 1
+                    self._release_slot()
+                    await self._close_quietly(record.conn)
+                    replacing = True
+                    continue
+
+            if self._closed:
+                self._size -= 1
+                await self._close_quietly(record.conn)
+                raise ResourceError("Connection pool is closed")
+            record.checked_out_at = time.monotonic()
+            self._in_use[id(record.conn)] = record
+            self.stats.wait_time.record(record.checked_out_at - started)
+            return record.conn
+
+    async def return_connection(self, conn: Any) -> None:
+        """Hand a checked-out connection back to the pool"""
+        record = self._in_use.pop(id(conn), None)
+        if record is None:
+            return
+        now = time.monotonic()
+        self.stats.hold_time.record(now - record.checked_out_at)
+        if self._closed or expired(record.created_at, self.max_lifetime, now):
+            self.stats.total_discarded += 1
+            self._release_slot()
+            await self._close_quietly(conn)
+            return
+        record.last_used = now
+        self._release(record)
+
+    @asynccontextmanager
+    async def connection(self, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """Check out a connection for the duration of an ``async with`` block"""
+        conn = await self.get_connection(timeout)
+        try:
+            yield conn
+        finally:
+            await self.return_connection(conn)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        waiting = sum(1 for waiter in self._waiters if not waiter.done())
+        return self.stats.snapshot(len(self._idle), len(self._in_use), self._size,
+                                   self.max_connections, waiting)
+
+    async def maintain(self) -> None:
+        """
+        Retire stale idle connections and reopen up to ``min_conn``
+
+        Run periodically by the maintenance task; safe to call directly.
+        """
+        if self._closed:
+            return
+        now = time.monotonic()
+        stale = []
+        # The left end holds the least recently used connections
+        while self._idle and (expired(self._idle[0].last_used, self.max_idle_time, now)
+                              or expired(self._idle[0].created_at, self.max_lifetime, now)):
+            stale.append(self._idle.popleft())
+            self._size -= 1
+            self.stats.total_discarded += 1
+        for record in stale:
+            await self._close_quietly(record.conn)
+
+        missing = self.min_connections - self._size
+        for _ in range(max(0, missing)):
+            self._size += 1
+            try:
+                record = await self._open()
+            except Exception as e:
+                logger.error(f"Reconnect failed: {e}")
+                self._release_slot()
+                continue
+            if self._closed:
+                self._size -= 1
+                await self._close_quietly(record.conn)
+                return
+            self.stats.total_reconnections += 1
+            self._release(record)
+
+    async def close_all(self) -> None:
+        """Close every connection, fail waiting callers and stop maintenance"""
+        self._closed = True
+        if self._maintainer is not None:
+            self._maintainer.cancel()
+            try:
+                await self._maintainer
+            except asyncio.CancelledError:
+                pass
+            self._maintainer = None
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(ResourceError("Connection pool is closed"))
+
+        records = list(self._idle) + list(self._in_use.values())
+        self._idle.clear()
+        self._in_use.clear()
+        self._size = 0
+        for record in records:
+            await self._close_quietly(record.conn)
+
+    async def _acquire(self, deadline: Optional[float]) -> Optional[_PooledConnection]:
+        """Take an idle record, or reserve a slot (None), queueing until ``deadline``"""
+        if self._closed:
+            raise ResourceError("Connection pool is closed")
+        if not self._waiters:
+            if self._idle:
+                return self._idle.pop()
+            if self._size < self.max_connections:
+                self._size += 1
+                return None
+
+        self.stats.total_exhausted += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            await asyncio.wait((waiter,), timeout=remaining)
+        except BaseException:
+            # Cancelled: pass on anything handed over in the meantime
+            self._abandon(waiter)
+            raise
+
+        if not waiter.done():
+            self._abandon(waiter)
+            self.stats.total_timeouts += 1
+            raise PoolTimeoutError(
+                "Timed out waiting for a database connection",
+                details={'max_connections': self.max_connections, 'in_use': len(self._in_use)})
+        return waiter.result()
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        """Withdraw a waiter, forwarding a connection or slot it was just given"""
+        if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+            record = waiter.result()
+            if record is None:
+                self._release_slot()
+            else:
+                self._release(record)
+        else:
+            waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                return waiter
+        return None
+
+    def _release(self, record: _PooledConnection) -> None:
+        """Give a healthy record to the oldest waiter, or make it idle"""
+        waiter = self._next_waiter()
+        if waiter is not None:
+            waiter.set_result(record)
+        else:
+            self._idle.append(record)
+
+    def _release_slot(self) -> None:
+        """Give a freed slot to the oldest waiter, or shrink the pool"""
+        waiter = self._next_waiter()
+        if waiter is not None:
+            waiter.set_result(None)
+        else:
+            self._size -= 1
+
+    async def _open(self) -> _PooledConnection:
+        """Create a connection, retrying with exponential backoff"""
+        delay = self.retry_delay
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                conn = await _call(self.create_connection)
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise ResourceError(f"Could not open a database connection: {e}",
+                                        details={'attempts': attempt}) from e
+                logger.warning(f"Connection attempt {attempt} failed: {e}")
+                await asyncio.sleep(delay)
+                delay *= 2
+        self.stats.total_created += 1
+        return _PooledConnection(conn, time.monotonic())
+
+    async def _is_usable(self, record: _PooledConnection, now: float) -> bool:
+        """Lifetime, idle-time and validation checks run on checkout"""
+        if (expired(record.created_at, self.max_lifetime, now)
+                or expired(record.last_used, self.max_idle_time, now)):
+            return False
+        try:
+            healthy = await _call(self.validate_connection, record.conn)
+        except Exception:
+            healthy = False
+        if not healthy:
+            self.stats.total_validation_failures += 1
+        return bool(healthy)
+
+    def _start_maintenance(self) -> None:
+        if self._maintainer is None and self.health_check_interval and not self._closed:
+            self._maintainer = asyncio.get_running_loop().create_task(self._maintain())
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.error(f"Pool maintenance failed: {e}")
+
+    @staticmethod
+    async def _close_quietly(conn: Any) -> None:
+        try:
+            if hasattr(conn, 'close'):
+                await _call(conn.close)
+        except Exception:
+            pass
+
+
+class AsyncDatabaseManager(DatabaseManager):
+    """
+    DatabaseManager for asyncio front ends
+
+    Same connections, configuration and statistics as DatabaseManager,
+    but checkout awaits instead of blocking the event loop:
+
+        await db.execute("PUT ? ?", (key, value))
+    """
+
+    def _create_pool(self):
+        return AsyncConnectionPool(self._create_connection, **self._pool_options())
+
+    @asynccontextmanager
+    async def get_connection(self, timeout=None):
+        async with self.pool.connection(timeout) as conn:
+            yield conn
+
+    connection = get_connection
+
+    async def execute(self, query, params=None):
+        """Run one statement; see DatabaseManager.execute"""
+        started = time.perf_counter()
+        statement = self._prepare(query)
+        parse_time = time.perf_counter() - started
+        async with self.get_connection() as conn:
+            return self._run(statement, conn["data"], params, parse_time)
+
+    async def executemany(self, query, seq_of_params):
+        """Run a write statement once per parameter set; see DatabaseManager.executemany"""
+        statement = self._prepare(query, batch=True)
+        async with self.get_connection() as conn:
+            return self._run_batch(statement, conn["data"], seq_of_params)
+
+    async def close(self):
+        """Close all connections"""
+        if self.pool:
+            await self.pool.close_all()
+        if isinstance(self.shared_data.store, FileStore):
+            self.shared_data.store.close()
+        logger.info("Async database manager closed")
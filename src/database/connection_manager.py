@@ -7,68 +7,383 @@ Database Connection Manager with Auto-Reconnection
 
 import time
 import logging
-from typing import Any, Optional, Dict
+import threading
+import weakref
+from collections import deque
+from collections.abc import Mapping
+from typing import Any, Callable, Deque, Dict, Optional
 from contextlib import contextmanager
 
+from core.exceptions import PoolTimeoutError, QueryError, ResourceError
+from .file_store import FileStore
+from .indexes import IndexedStore
+from .metrics import LatencyHistogram, QueryStatistics
+from .query import Cursor, StatementCache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _default_validate(conn: Any) -> bool:
+    """A connection is healthy unless it reports itself disconnected or closed"""
+    if isinstance(conn, Mapping):
+        return bool(conn.get('connected', True))
+    return not getattr(conn, 'closed', False)
+
+
+class PoolStatistics:
+    """
+    Lifetime counters shared by the sync and async pools
+    
+    Pools update the counters under their own lock; snapshot() adds the
+    pool's current occupancy in the format get_statistics() returns.
+    ``wait_time`` covers checkout from the call to the connection being
+    handed over, ``hold_time`` checkout to return, and
+    ``total_exhausted`` counts checkouts that found the pool full and
+    had to queue.
+    """
+    
+    def __init__(self):
+        self.total_created = 0
+        self.total_reconnections = 0
+        self.total_discarded = 0
+        self.total_validation_failures = 0
+        self.total_timeouts = 0
+        self.total_exhausted = 0
+        self.wait_time = LatencyHistogram()
+        self.hold_time = LatencyHistogram()
+    
+    def snapshot(self, available: int, in_use: int, total: int, max_connections: int,
+                 waiting: int) -> Dict[str, Any]:
+        return {
+            "available_connections": available,
+            "in_use_connections": in_use,
+            "total_connections": total,
+            "max_connections": max_connections,
+            "waiting_requests": waiting,
+            "total_created": self.total_created,
+            "total_reconnections": self.total_reconnections,
+            "total_discarded": self.total_discarded,
+            "total_validation_failures": self.total_validation_failures,
+            "total_timeouts": self.total_timeouts,
+            "total_exhausted": self.total_exhausted,
+            "wait_time": self.wait_time.snapshot(),
+            "hold_time": self.hold_time.snapshot()
+        }
+
+
+def expired(since: float, limit: Optional[float], now: float) -> bool:
+    """True if more than ``limit`` seconds (None = unlimited) passed since ``since``"""
+    return limit is not None and now - since > limit
+
+
+class _PooledConnection:
+    """Bookkeeping for one pooled connection"""
+    
+    __slots__ = ('conn', 'created_at', 'last_used', 'checked_out_at')
+    
+    def __init__(self, conn: Any, now: float):
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+        self.checked_out_at = now
+
+
 class ConnectionPool:
-    """Connection pool with automatic reconnection"""
+    """
+    Thread-safe connection pool with health checks and automatic reconnection
     
-    def __init__(self, create_func, max_conn=10, min_conn=2, max_retries=5):
+    Idle connections sit in a deque: checkout and return take the most
+    recently used end in O(1), and the maintenance thread retires stale ones
+    from the other end. When every connection is busy, callers wait on a
+    condition variable for up to ``timeout`` seconds, then get a
+    PoolTimeoutError. Connections are created and validated outside the
+    lock, so a slow server never blocks other callers' returns.
+    
+    Connections past ``max_lifetime``, idle longer than ``max_idle_time`` or
+    failing ``validate_func`` are closed and replaced; the background thread
+    also re-establishes ``min_conn`` connections after failures (counted in
+    ``total_reconnections``), retrying with exponential backoff.
+    """
+    
+    def __init__(self, create_func: Callable[[], Any], max_conn: int = 10, min_conn: int = 2,
+                 max_retries: int = 5, timeout: Optional[float] = 30.0,
+                 max_idle_time: Optional[float] = 300.0, max_lifetime: Optional[float] = 3600.0,
+                 validate_func: Optional[Callable[[Any], bool]] = None,
+                 health_check_interval: Optional[float] = 30.0, retry_delay: float = 0.1):
+        """
+        Initialize the pool and open ``min_conn`` connections
+        
+        Args:
+            create_func: Opens a new connection
+            max_conn: Maximum open connections (idle + in use)
+            min_conn: Connections kept open by the maintenance thread
+            max_retries: Attempts per connection before giving up
+            timeout: Default seconds to wait for a connection (None = forever)
+            max_idle_time: Close connections idle longer than this (None = never)
+            max_lifetime: Close connections older than this (None = never)
+            validate_func: Health check run on checkout (default: the
+                           connection's ``connected`` / ``closed`` flag)
+            health_check_interval: Seconds between maintenance passes
+                                   (None or 0 disables the thread)
+            retry_delay: Initial backoff between connection attempts
+        """
+        if max_conn < 1:
+            raise ValueError(f"max_conn must be positive: {max_conn}")
+        
         self.create_connection = create_func
+        self.validate_connection = validate_func or _default_validate
         self.max_connections = max_conn
-        self.available = []
-        self.in_use = []
-        self.total_reconnections = 0
-        self.total_created = 0
+        self.min_connections = min(min_conn, max_conn)
+        self.max_retries = max(1, max_retries)
+        self.timeout = timeout
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.retry_delay = retry_delay
+        
+        self._lock = threading.RLock()
+        self._available = threading.Condition(self._lock)
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._size = 0  # idle + in use + being opened
+        self._waiting = 0
+        self._closed = False
+        self.stats = PoolStatistics()
         
-        for _ in range(min_conn):
+        for _ in range(self.min_connections):
             try:
-                conn = self.create_connection()
-                self.available.append(conn)
-                self.total_created += 1
+                self._idle.append(self._open())
+                self._size += 1
             except Exception as e:
                 logger.error(f"Init failed: {e}")
+        
+        self._stop = threading.Event()
+        self._maintainer: Optional[threading.Thread] = None
+        if health_check_interval:
+            self._maintainer = threading.Thread(
+                target=_maintain, args=(weakref.ref(self), self._stop, health_check_interval),
+                name='connection-pool-maintenance', daemon=True)
+            self._maintainer.start()
     
-    def get_connection(self):
-        if self.available:
-            conn = self.available.pop(0)
-            self.in_use.append(conn)
-            return conn
-        elif len(self.in_use) < self.max_connections:
-            conn = self.create_connection()
-            self.in_use.append(conn)
-            self.total_created += 1
-            return conn
-        raise Exception("No connections available")
-    
-    def return_connection(self, conn):
-        if conn in self.in_use:
-            self.in_use.remove(conn)
-            self.available.append(conn)
+    def get_connection(self, timeout: Optional[float] = None) -> Any:
+        """
+        Check out a healthy connection, waiting if the pool is exhausted
+        
+        Args:
+            timeout: Seconds to wait (default: the pool's timeout)
+            
+        Returns:
+            A connection; hand it back with return_connection()
+            
+        Raises:
+            PoolTimeoutError: If none became available in time
+            ResourceError: If the pool is closed or a connection cannot be opened
+        """
+        started = time.monotonic()
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else started + timeout
+        
+        replacing = False
+        while True:
+            record = self._acquire(deadline)
+            if record is None:
+                # A slot was reserved for a new connection
+                try:
+                    record = self._open()
+                except Exception:
+                    self._release_slot()
+                    raise
+                if replacing:
+                    with self._lock:
+                        self.stats.total_reconnections += 1
+            elif not self._is_usable(record, time.monotonic()):
+                self._discard(record)
+                replacing = True
+                continue
+            
+            with self._lock:
+                if self._closed:
+                    self._close_quietly(record.conn)
+                    self._size -= 1
+                    raise ResourceError("Connection pool is closed")
+                record.checked_out_at = time.monotonic()
+                self._in_use[id(record.conn)] = record
+            self.stats.wait_time.record(record.checked_out_at - started)
+            return record.conn
     
-    def get_statistics(self):
-        return {
-            "available_connections": len(self.available),
-            "in_use_connections": len(self.in_use),
-            "total_connections": len(self.available) + len(self.in_use),
-            "max_connections": self.max_connections,
-            "total_created": self.total_created,
-            "total_reconnections": self.total_reconnections
-        }
+    def return_connection(self, conn: Any) -> None:
+        """Hand a checked-out connection back to the pool"""
+        with self._lock:
+            record = self._in_use.pop(id(conn), None)
+            if record is None:
+                return
+            now = time.monotonic()
+            self.stats.hold_time.record(now - record.checked_out_at)
+            if self._closed or expired(record.created_at, self.max_lifetime, now):
+                self._size -= 1
+                self.stats.total_discarded += 1
+                self._available.notify()
+            else:
+                record.last_used = now
+                self._idle.append(record)
+                self._available.notify()
+                return
+        self._close_quietly(conn)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return self.stats.snapshot(len(self._idle), len(self._in_use), self._size,
+                                       self.max_connections, self._waiting)
     
-    def close_all(self):
-        for conn in self.available + self.in_use:
+    def maintain(self) -> None:
+        """
+        Retire stale idle connections and reopen up to ``min_conn``
+        
+        Run periodically by the maintenance thread; safe to call directly.
+        """
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            if self._closed:
+                return
+            # The left end holds the least recently used connections
+            while self._idle and (
+                    expired(self._idle[0].last_used, self.max_idle_time, now)
+                    or expired(self._idle[0].created_at, self.max_lifetime, now)):
+                stale.append(self._idle.popleft())
+                self._size -= 1
+                self.stats.total_discarded += 1
+            missing = self.min_connections - self._size
+            self._size += max(0, missing)
+        
+        for record in stale:
+            self._close_quietly(record.conn)
+        
+        for _ in range(missing):
+            try:
+                record = self._open()
+            except Exception as e:
+                logger.error(f"Reconnect failed: {e}")
+                self._release_slot()
+                continue
+            with self._lock:
+                if self._closed:
+                    self._size -= 1
+                    self._close_quietly(record.conn)
+                    continue
+                self.stats.total_reconnections += 1
+                self._idle.append(record)
+                self._available.notify()
+    
+    def close_all(self) -> None:
+        """Close every connection and stop the maintenance thread"""
+        self._stop.set()
+        with self._lock:
+            self._closed = True
+            records = list(self._idle) + list(self._in_use.values())
+            self._idle.clear()
+            self._in_use.clear()
+            self._size = 0
+            self._available.notify_all()
+        for record in records:
+            self._close_quietly(record.conn)
+        if self._maintainer is not None and self._maintainer is not threading.current_thread():
+            self._maintainer.join()
+    
+    def _acquire(self, deadline: Optional[float]) -> Optional[_PooledConnection]:
+        """Take an idle record, or reserve a slot (None), waiting until ``deadline``"""
+        with self._lock:
+            self._waiting += 1
+            exhausted = False
             try:
-                if hasattr(conn, 'close'):
-                    conn.close()
-            except:
-                pass
-        self.available.clear()
-        self.in_use.clear()
+                while True:
+                    if self._closed:
+                        raise ResourceError("Connection pool is closed")
+                    if self._idle:
+                        return self._idle.pop()
+                    if self._size < self.max_connections:
+                        self._size += 1
+                        return None
+                    
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self.stats.total_timeouts += 1
+                        raise PoolTimeoutError(
+                            "Timed out waiting for a database connection",
+                            details={'max_connections': self.max_connections,
+                                     'in_use': len(self._in_use)})
+                    if not exhausted:
+                        exhausted = True
+                        self.stats.total_exhausted += 1
+                    self._available.wait(remaining)
+            finally:
+                self._waiting -= 1
+    
+    def _open(self) -> _PooledConnection:
+        """Create a connection, retrying with exponential backoff"""
+        delay = self.retry_delay
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                conn = self.create_connection()
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise ResourceError(f"Could not open a database connection: {e}",
+                                        details={'attempts': attempt}) from e
+                logger.warning(f"Connection attempt {attempt} failed: {e}")
+                time.sleep(delay)
+                delay *= 2
+        with self._lock:
+            self.stats.total_created += 1
+        return _PooledConnection(conn, time.monotonic())
+    
+    def _is_usable(self, record: _PooledConnection, now: float) -> bool:
+        """Lifetime, idle-time and validation checks run on checkout"""
+        if (expired(record.created_at, self.max_lifetime, now)
+                or expired(record.last_used, self.max_idle_time, now)):
+            return False
+        try:
+            healthy = self.validate_connection(record.conn)
+        except Exception:
+            healthy = False
+        if not healthy:
+            with self._lock:
+                self.stats.total_validation_failures += 1
+        return healthy
+    
+    def _discard(self, record: _PooledConnection) -> None:
+        """Close a checked-out record and free its slot"""
+        self._close_quietly(record.conn)
+        with self._lock:
+            self.stats.total_discarded += 1
+        self._release_slot()
+    
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._size -= 1
+            self._available.notify()
+    
+    @staticmethod
+    def _close_quietly(conn: Any) -> None:
+        try:
+            if hasattr(conn, 'close'):
+                conn.close()
+        except Exception:
+            pass
+
+
+def _maintain(pool_ref: 'weakref.ref[ConnectionPool]', stop: threading.Event,
+              interval: float) -> None:
+    """Maintenance loop; holds the pool only weakly so it can be collected"""
+    while not stop.wait(interval):
+        pool = pool_ref()
+        if pool is None:
+            return
+        try:
+            pool.maintain()
+        except Exception as e:
+            logger.error(f"Pool maintenance failed: {e}")
+        del pool
 
 
 class DatabaseManager:
@@ -77,28 +392,137 @@ class DatabaseManager:
     def __init__(self, db_type="memory", config=None):
         self.db_type = db_type
         self.config = config or {}
-        self.shared_data = {}  # Initialize shared data before pool
-        self.pool = ConnectionPool(self._create_connection)
+        self.shared_data = self._open_store()  # Initialize shared data before pool
+        self.statements = StatementCache(self.config.get("statement_cache_size", 256))
+        self.queries = self._query_statistics()
+        self.pool = self._create_pool()
+    
+    def _create_pool(self):
+        """Connection pool over _create_connection; subclasses swap the pool type"""
+        return ConnectionPool(self._create_connection, **self._pool_options())
+    
+    def _open_store(self):
+        """Backing store shared by every connection, with its secondary indexes"""
+        if self.db_type == "file":
+            store = FileStore(
+                self.config.get("path", "data/database"),
+                sync_every=self.config.get("sync_every", 100),
+                sync_interval=self.config.get("sync_interval", 1.0)
+            )
+        else:
+            store = {}
+        return IndexedStore(store, indexes=self.config.get("indexes"))
+    
+    def _pool_options(self):
+        """Pool settings from the config dict"""
+        return {
+            "max_conn": self.config.get("max_connections", 10),
+            "min_conn": self.config.get("min_connections", 2),
+            "timeout": self.config.get("pool_timeout", 30.0),
+            "max_idle_time": self.config.get("max_idle_time", 300.0),
+            "max_lifetime": self.config.get("max_lifetime", 3600.0),
+            "health_check_interval": self.config.get("health_check_interval", 30.0)
+        }
+    
+    def _query_statistics(self):
+        """Query latency tracking from the config dict"""
+        return QueryStatistics(
+            slow_threshold=self.config.get("slow_query_threshold", 0.1),
+            slow_log_size=self.config.get("slow_query_log_size", 100)
+        )
     
     def _create_connection(self):
         if self.db_type == "memory":
             # Return reference to shared data store
             return {"type": "memory", "data": self.shared_data, "connected": True}
         elif self.db_type == "file":
-            return {"type": "file", "path": self.config.get("path", "data.json"), "data": self.shared_data, "connected": True}
+            return {"type": "file", "path": self.shared_data.store.directory, "data": self.shared_data, "connected": True}
         return {"type": "memory", "data": self.shared_data, "connected": True}
     
     @contextmanager
-    def get_connection(self):
-        conn = self.pool.get_connection()
+    def get_connection(self, timeout=None):
+        conn = self.pool.get_connection(timeout)
         try:
             yield conn
         finally:
             self.pool.return_connection(conn)
     
     def execute(self, query, params=None):
+        """
+        Run one statement (see database.query for the language)
+        
+        Args:
+            query: Statement text, parsed once and cached
+            params: Sequence for ``?`` placeholders or dict for ``:name`` ones
+            
+        Returns:
+            Cursor; SELECT rows are read from the store as they are fetched
+        """
+        started = time.perf_counter()
+        statement = self._prepare(query)
+        parse_time = time.perf_counter() - started
+        with self.get_connection() as conn:
+            return self._run(statement, conn["data"], params, parse_time)
+    
+    def executemany(self, query, seq_of_params):
+        """
+        Run a write statement once per parameter set on one connection
+        
+        Returns:
+            Cursor whose rowcount is the total number of rows written
+        """
+        statement = self._prepare(query, batch=True)
         with self.get_connection() as conn:
-            return conn
+            return self._run_batch(statement, conn["data"], seq_of_params)
+    
+    def _prepare(self, query, batch=False):
+        try:
+            statement = self.statements.prepare(query)
+            if batch and not statement.is_write:
+                raise QueryError(f"executemany() needs a write statement, got {statement.verb}",
+                                 field="query", value=query)
+        except QueryError:
+            self.queries.record_error()
+            raise
+        return statement
+    
+    def _run(self, statement, store, params, elapsed=0.0):
+        """Execute a prepared statement, recording its latency"""
+        started = time.perf_counter()
+        try:
+            cursor = statement.execute(store, params)
+        except Exception:
+            self.queries.record_error()
+            raise
+        self.queries.observe(statement, cursor, elapsed + time.perf_counter() - started)
+        return cursor
+    
+    def _run_batch(self, statement, store, seq_of_params):
+        """Execute a write statement per parameter set, recorded as one query"""
+        started = time.perf_counter()
+        rowcount = 0
+        batch = 0
+        try:
+            for params in seq_of_params:
+                rowcount += statement.execute(store, params).rowcount
+                batch += 1
+        except Exception:
+            self.queries.record_error()
+            raise
+        cursor = Cursor(rowcount=rowcount)
+        self.queries.observe(statement, cursor, time.perf_counter() - started, batch)
+        return cursor
+    
+    def create_index(self, path, kind="hash"):
+        """
+        Add a secondary index on a value field, maintained on every write
+        
+        Args:
+            path: Dotted field path, e.g. "wetware_data.intent"
+            kind: "hash" for ``path = x`` filters on scalar fields,
+                  "inverted" for ``path CONTAINS x`` on list fields
+        """
+        self.shared_data.create_index(path, kind)
     
     def get_statistics(self):
         """Get database manager statistics"""
@@ -107,10 +531,17 @@ class DatabaseManager:
             "config": {k: v for k, v in self.config.items() if k != 'password'}
         }
         stats["pool"] = self.pool.get_statistics()
+        stats["statements"] = self.statements.get_statistics()
+        stats["queries"] = self.queries.snapshot()
+        stats["indexes"] = self.shared_data.get_statistics()
+        if isinstance(self.shared_data.store, FileStore):
+            stats["store"] = self.shared_data.store.get_statistics()
         return stats
     
     def close(self):
         """Close all connections"""
         if self.pool:
             self.pool.close_all()
+        if isinstance(self.shared_data.store, FileStore):
+            self.shared_data.store.close()
         logger.info("Database manager closed")
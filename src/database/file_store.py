@@ -0,0 +1,398 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+Thalos Prime™ is a proprietary system.
+
+Log-Structured File Store (bitcask-style)
+
+- Append-only segment files; the in-memory key directory maps each key to
+  the position of its latest value, so a read is one seek
+- Group commit: fsync every ``sync_every`` writes or ``sync_interval`` seconds
+- Segments roll over at ``max_segment_bytes``; a background merge rewrites
+  the live records of closed segments and drops the rest
+- Records carry a CRC; a torn tail left by a crash is truncated on open
+"""
+
+import json
+import logging
+import os
+import pickle
+import struct
+import threading
+import weakref
+import zlib
+from collections.abc import MutableMapping
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# crc32, key length, value length (TOMBSTONE marks a delete)
+_HEADER = struct.Struct('<III')
+_TOMBSTONE = 0xFFFFFFFF
+_SEGMENT_SUFFIX = '.log'
+_MERGE_SUFFIX = '.merge'
+_PENDING_MERGE = 'merge.pending'
+
+
+def _segment_name(segment_id: int) -> str:
+    return f"segment-{segment_id:08d}{_SEGMENT_SUFFIX}"
+
+
+class FileStore(MutableMapping):
+    """
+    Persistent mapping of string keys to picklable values
+
+    Every write appends one record to the active segment; nothing is
+    rewritten in place. The key directory ({key: (segment, offset, length)})
+    is rebuilt on open by replaying the segments in order. Writes are
+    durable after the next group commit, flush(), or close().
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 64 << 20,
+                 sync_every: int = 100, sync_interval: Optional[float] = 1.0,
+                 merge_threshold: float = 0.5, merge_min_bytes: int = 1 << 20):
+        """
+        Open (or create) a store
+
+        Args:
+            directory: Directory holding the segment files
+            max_segment_bytes: Size at which the active segment is closed
+            sync_every: Writes per fsync (1 = fsync every write)
+            sync_interval: Max seconds before buffered writes are fsynced,
+                           and between merge checks (None = no background thread)
+            merge_threshold: Fraction of dead bytes in closed segments that
+                             triggers a merge
+            merge_min_bytes: Dead bytes required before merging at all
+        """
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.sync_every = max(1, sync_every)
+        self.merge_threshold = merge_threshold
+        self.merge_min_bytes = merge_min_bytes
+
+        self._lock = threading.RLock()
+        self._merge_lock = threading.Lock()
+        self._keydir: Dict[str, Tuple[int, int, int]] = {}
+        self._sizes: Dict[int, int] = {}   # bytes per segment
+        self._dead: Dict[int, int] = {}    # superseded bytes per segment
+        self._readers: Dict[int, BinaryIO] = {}
+        self._writer: Optional[BinaryIO] = None
+        self._unsynced = 0
+        self._closed = False
+        self.stats = {'writes': 0, 'reads': 0, 'syncs': 0, 'merges': 0,
+                      'reclaimed_bytes': 0}
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+        self._stop = threading.Event()
+        self._background: Optional[threading.Thread] = None
+        if sync_interval:
+            self._background = threading.Thread(
+                target=_maintain, args=(weakref.ref(self), self._stop, sync_interval),
+                name='file-store-background', daemon=True)
+            self._background.start()
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            segment_id, offset, length = self._keydir[key]
+            self.stats['reads'] += 1
+            return pickle.loads(self._read(segment_id, offset, length))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._append(key, payload)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            if key not in self._keydir:
+                raise KeyError(key)
+            self._append(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keydir
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._keydir))
+
+    def __len__(self) -> int:
+        return len(self._keydir)
+
+    def flush(self) -> None:
+        """Make every write so far durable"""
+        with self._lock:
+            self._sync()
+
+    def merge(self) -> bool:
+        """
+        Rewrite the live records of all closed segments into one segment
+
+        Runs without blocking readers or writers except for the final swap.
+
+        Returns:
+            bool: True if a merge took place
+        """
+        with self._merge_lock:
+            with self._lock:
+                self._check_open()
+                inputs = sorted(s for s in self._sizes if s != self._active_id)
+                if not inputs:
+                    return False
+                input_set = set(inputs)
+                live = [(key, loc) for key, loc in self._keydir.items() if loc[0] in input_set]
+                target_id = inputs[-1]
+
+            # Closed segments are immutable, so copying needs no lock
+            temp_path = os.path.join(self.directory, _segment_name(target_id) + _MERGE_SUFFIX)
+            moved: Dict[str, Tuple[int, int, int]] = {}
+            size = 0
+            handles: Dict[int, BinaryIO] = {}
+            try:
+                with open(temp_path, 'wb') as out:
+                    for key, (segment_id, offset, length) in live:
+                        src = handles.get(segment_id)
+                        if src is None:
+                            src = handles[segment_id] = open(self._path(segment_id), 'rb')
+                        src.seek(offset)
+                        value = src.read(length)
+                        record = self._encode(key, value)
+                        out.write(record)
+                        moved[key] = (target_id, size + len(record) - length, length)
+                        size += len(record)
+                    out.flush()
+                    os.fsync(out.fileno())
+            finally:
+                for handle in handles.values():
+                    handle.close()
+
+            # The merged segment drops tombstones, so older inputs must never
+            # be replayed without the newest one: record which to delete
+            # before swapping, and let recovery finish the job after a crash
+            self._write_pending(target_id, inputs[:-1])
+
+            with self._lock:
+                for segment_id in inputs:
+                    reader = self._readers.pop(segment_id, None)
+                    if reader is not None:
+                        reader.close()
+                os.replace(temp_path, self._path(target_id))
+                self._fsync_directory()
+
+                # Keys written since the copy already point at newer segments
+                reclaimed = sum(self._sizes[s] for s in inputs) - size
+                dead = 0
+                for key, old in live:
+                    if self._keydir.get(key) == old:
+                        self._keydir[key] = moved[key]
+                    else:
+                        dead += _HEADER.size + len(key.encode('utf-8')) + old[2]
+                for segment_id in inputs:
+                    del self._sizes[segment_id]
+                    self._dead.pop(segment_id, None)
+                self._sizes[target_id] = size
+                self._dead[target_id] = dead
+                self.stats['merges'] += 1
+                self.stats['reclaimed_bytes'] += reclaimed
+
+            for segment_id in inputs[:-1]:
+                os.remove(self._path(segment_id))
+            os.remove(os.path.join(self.directory, _PENDING_MERGE))
+            self._fsync_directory()
+            return True
+
+    def needs_merge(self) -> bool:
+        """True when closed segments are mostly superseded records"""
+        with self._lock:
+            closed = [s for s in self._sizes if s != self._active_id]
+            total = sum(self._sizes[s] for s in closed)
+            dead = sum(self._dead.get(s, 0) for s in closed)
+            return dead >= self.merge_min_bytes and dead > total * self.merge_threshold
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, keys=len(self._keydir), segments=len(self._sizes),
+                        total_bytes=sum(self._sizes.values()),
+                        dead_bytes=sum(self._dead.values()))
+
+    def close(self) -> None:
+        """Flush, stop the background thread and close files"""
+        self._stop.set()
+        if self._background is not None and self._background is not threading.current_thread():
+            self._background.join()
+        with self._lock:
+            if self._closed:
+                return
+            self._sync()
+            for handle in list(self._readers.values()) + [self._writer]:
+                if handle is not None:
+                    handle.close()
+            self._readers.clear()
+            self._writer = None
+            self._closed = True
+
+    def _append(self, key: str, payload: Optional[bytes]) -> None:
+        """Append a value (or a tombstone for None); caller holds the lock"""
+        self._check_open()
+        record = self._encode(key, payload)
+        if self._sizes[self._active_id] + len(record) > self.max_segment_bytes \
+                and self._sizes[self._active_id] > 0:
+            self._roll()
+
+        segment_id = self._active_id
+        offset = self._sizes[segment_id]
+        self._writer.write(record)
+        self._sizes[segment_id] += len(record)
+        self._supersede(key)
+        if payload is None:
+            self._keydir.pop(key, None)
+            self._dead[segment_id] = self._dead.get(segment_id, 0) + len(record)
+        else:
+            self._keydir[key] = (segment_id, offset + len(record) - len(payload), len(payload))
+
+        self.stats['writes'] += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self._sync()
+
+    def _supersede(self, key: str) -> None:
+        """Count the key's current record as dead; caller holds the lock"""
+        old = self._keydir.get(key)
+        if old is not None:
+            self._dead[old[0]] = (self._dead.get(old[0], 0)
+                                  + _HEADER.size + len(key.encode('utf-8')) + old[2])
+
+    @staticmethod
+    def _encode(key: str, payload: Optional[bytes]) -> bytes:
+        key_bytes = key.encode('utf-8')
+        value = payload if payload is not None else b''
+        value_len = len(value) if payload is not None else _TOMBSTONE
+        body = struct.pack('<II', len(key_bytes), value_len) + key_bytes + value
+        return struct.pack('<I', zlib.crc32(body)) + body
+
+    def _read(self, segment_id: int, offset: int, length: int) -> bytes:
+        if segment_id == self._active_id:
+            self._writer.flush()
+        reader = self._readers.get(segment_id)
+        if reader is None:
+            reader = self._readers[segment_id] = open(self._path(segment_id), 'rb')
+        reader.seek(offset)
+        return reader.read(length)
+
+    def _sync(self) -> None:
+        if self._writer is not None and self._unsynced:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+            self._unsynced = 0
+            self.stats['syncs'] += 1
+
+    def _roll(self) -> None:
+        """Close the active segment and start the next; caller holds the lock"""
+        self._sync()
+        self._writer.close()
+        self._open_active(self._active_id + 1)
+
+    def _open_active(self, segment_id: int) -> None:
+        self._active_id = segment_id
+        self._sizes.setdefault(segment_id, 0)
+        self._writer = open(self._path(segment_id), 'ab')
+        self._fsync_directory()
+
+    def _write_pending(self, target_id: int, obsolete: List[int]) -> None:
+        """Durably record a merge about to replace ``target_id``"""
+        path = os.path.join(self.directory, _PENDING_MERGE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'target': target_id, 'obsolete': obsolete}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + '.tmp', path)
+        self._fsync_directory()
+
+    def _finish_pending_merge(self) -> None:
+        """Complete or discard a merge interrupted by a crash"""
+        path = os.path.join(self.directory, _PENDING_MERGE)
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            pending = json.load(f)
+        temp_path = self._path(pending['target']) + _MERGE_SUFFIX
+        if not os.path.exists(temp_path):
+            # The merged segment is in place; its inputs are obsolete
+            for segment_id in pending['obsolete']:
+                if os.path.exists(self._path(segment_id)):
+                    os.remove(self._path(segment_id))
+        os.remove(path)
+        self._fsync_directory()
+
+    def _recover(self) -> None:
+        """Rebuild the key directory from the segment files"""
+        self._finish_pending_merge()
+        segment_ids: List[int] = []
+        for name in os.listdir(self.directory):
+            if name.endswith(_MERGE_SUFFIX):
+                # An interrupted merge; its inputs are still intact
+                os.remove(os.path.join(self.directory, name))
+            elif name.startswith('segment-') and name.endswith(_SEGMENT_SUFFIX):
+                segment_ids.append(int(name[len('segment-'):-len(_SEGMENT_SUFFIX)]))
+        segment_ids.sort()
+
+        for segment_id in segment_ids:
+            valid = self._replay(segment_id)
+            if valid < os.path.getsize(self._path(segment_id)):
+                logger.warning(f"Truncating torn tail of {_segment_name(segment_id)}")
+                with open(self._path(segment_id), 'r+b') as f:
+                    f.truncate(valid)
+            self._sizes[segment_id] = valid
+
+        self._open_active(segment_ids[-1] if segment_ids else 0)
+
+    def _replay(self, segment_id: int) -> int:
+        """Apply one segment's records to the key directory; returns its valid length"""
+        with open(self._path(segment_id), 'rb') as f:
+            data = f.read()
+        position = 0
+        while position + _HEADER.size <= len(data):
+            crc, key_len, value_len = _HEADER.unpack_from(data, position)
+            value_size = 0 if value_len == _TOMBSTONE else value_len
+            end = position + _HEADER.size + key_len + value_size
+            if end > len(data) or zlib.crc32(data[position + 4:end]) != crc:
+                break
+            key = data[position + _HEADER.size:position + _HEADER.size + key_len].decode('utf-8')
+            self._supersede(key)
+            if value_len == _TOMBSTONE:
+                self._keydir.pop(key, None)
+                self._dead[segment_id] = self._dead.get(segment_id, 0) + end - position
+            else:
+                self._keydir[key] = (segment_id, end - value_len, value_len)
+            position = end
+        return position
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("FileStore is closed")
+
+    def _path(self, segment_id: int) -> str:
+        return os.path.join(self.directory, _segment_name(segment_id))
+
+    def _fsync_directory(self) -> None:
+        dir_fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _maintain(store_ref: 'weakref.ref[FileStore]', stop: threading.Event,
+              interval: float) -> None:
+    """Group commit and merge loop; holds the store only weakly"""
+    while not stop.wait(interval):
+        store = store_ref()
+        if store is None:
+            return
+        try:
+            store.flush()
+            if store.needs_merge():
+                store.merge()
+        except Exception as e:
+            logger.error(f"File store maintenance failed: {e}")
+        del store
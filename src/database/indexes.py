@@ -0,0 +1,251 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+Thalos Prime™ is a proprietary system.
+
+Secondary Indexes over the DatabaseManager Store
+"""
+
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from core.exceptions import QueryError
+from .query import _MISSING, _parse_path, resolve_path
+
+Path = Tuple[str, ...]
+
+
+class HashIndex:
+    """
+    Field value -> keys, for ``path = x`` filters
+
+    Records whose field is missing or unhashable are left out; they can
+    never equal a hashable operand.
+    """
+
+    kind = 'hash'
+    operators = ('=',)
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._keys: Dict[Any, Set[str]] = {}
+
+    def add(self, key: str, value: Any) -> None:
+        field = resolve_path(key, value, self.path)
+        if field is not _MISSING and _hashable(field):
+            self._keys.setdefault(field, set()).add(key)
+
+    def remove(self, key: str, value: Any) -> None:
+        field = resolve_path(key, value, self.path)
+        if field is not _MISSING and _hashable(field):
+            _discard(self._keys, field, key)
+
+    def candidates(self, operand: Any) -> Set[str]:
+        return self._keys.get(operand, set())
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {'type': self.kind, 'distinct_values': len(self._keys),
+                'entries': sum(len(keys) for keys in self._keys.values())}
+
+
+class InvertedIndex:
+    """
+    List element -> keys, for ``path CONTAINS x`` filters
+
+    Each hashable element of a list, tuple or set field is indexed. Records
+    whose field is a string or dict (where CONTAINS means substring or key
+    membership) are kept aside and offered as candidates for every lookup.
+    """
+
+    kind = 'inverted'
+    operators = ('CONTAINS',)
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._keys: Dict[Any, Set[str]] = {}
+        self._other: Set[str] = set()
+
+    def add(self, key: str, value: Any) -> None:
+        field = resolve_path(key, value, self.path)
+        if isinstance(field, (list, tuple, set, frozenset)):
+            for element in field:
+                if _hashable(element):
+                    self._keys.setdefault(element, set()).add(key)
+        elif isinstance(field, (str, dict)):
+            self._other.add(key)
+
+    def remove(self, key: str, value: Any) -> None:
+        field = resolve_path(key, value, self.path)
+        if isinstance(field, (list, tuple, set, frozenset)):
+            for element in field:
+                if _hashable(element):
+                    _discard(self._keys, element, key)
+        else:
+            self._other.discard(key)
+
+    def candidates(self, operand: Any) -> Set[str]:
+        return self._keys.get(operand, set()) | self._other
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._other.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {'type': self.kind, 'distinct_values': len(self._keys),
+                'entries': sum(len(keys) for keys in self._keys.values()),
+                'unindexed_records': len(self._other)}
+
+
+INDEX_TYPES = {
+    'hash': HashIndex,
+    'inverted': InvertedIndex
+}
+
+
+class IndexedStore(MutableMapping):
+    """
+    Key-value store with secondary indexes maintained on every write
+
+    Wraps the dict or FileStore behind DatabaseManager connections. Queries
+    ask candidates() for the keys an indexed filter can match and re-check
+    every condition on them, so an index only narrows the rows read. Values
+    must be replaced, not mutated in place, for the indexes to stay current.
+    """
+
+    def __init__(self, store: Optional[MutableMapping] = None,
+                 indexes: Optional[Dict[str, str]] = None):
+        """
+        Initialize the store
+
+        Args:
+            store: Backing mapping (default: a new dict)
+            indexes: Field path -> index type ('hash' or 'inverted')
+        """
+        self.store = {} if store is None else store
+        self._indexes: Dict[Path, Any] = {}
+        self._lock = threading.RLock()
+        self.index_lookups = 0
+        self.full_scans = 0
+        for path, kind in (indexes or {}).items():
+            self.create_index(path, kind)
+
+    def create_index(self, path: str, kind: str = 'hash') -> None:
+        """
+        Index a field, backfilling it from the existing records
+
+        Args:
+            path: Dotted field path into dict values (as in queries)
+            kind: 'hash' for equality on scalars, 'inverted' for
+                  membership in list fields
+        """
+        if kind not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type: {kind}. Available: {list(INDEX_TYPES)}")
+        parsed = _parse_path(path)
+        if parsed == ('key',) or not parsed:
+            raise ValueError(f"Cannot index {path!r}: only value fields can be indexed")
+
+        index = INDEX_TYPES[kind](parsed)
+        with self._lock:
+            for key, value in self.store.items():
+                index.add(key, value)
+            self._indexes[parsed] = index
+
+    def drop_index(self, path: str) -> bool:
+        with self._lock:
+            return self._indexes.pop(_parse_path(path), None) is not None
+
+    def candidates(self, conditions) -> Tuple[Optional[Set[str]], Optional[str]]:
+        """
+        Keys that can satisfy every condition, using the narrowest index
+
+        Args:
+            conditions: (Condition, operand) pairs from a WHERE clause
+
+        Returns:
+            (keys, index path), or (None, None) if no index applies and
+            the caller must scan
+        """
+        best, best_path = None, None
+        with self._lock:
+            for condition, operand in conditions:
+                index = self._indexes.get(condition.path)
+                if index is None or condition.op not in index.operators \
+                        or not _hashable(operand):
+                    continue
+                keys = index.candidates(operand)
+                if best is None or len(keys) < len(best):
+                    best, best_path = keys, '.'.join(condition.path)
+            if best is None:
+                self.full_scans += 1
+                return None, None
+            self.index_lookups += 1
+            return set(best), best_path
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'indexes': {'.'.join(path): index.get_statistics()
+                            for path, index in self._indexes.items()},
+                'index_lookups': self.index_lookups,
+                'full_scans': self.full_scans
+            }
+
+    def __getitem__(self, key: str) -> Any:
+        return self.store[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.store.get(key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            if self._indexes:
+                old = self.store.get(key, _MISSING)
+                if old is not _MISSING:
+                    for index in self._indexes.values():
+                        index.remove(key, old)
+            self.store[key] = value
+            for index in self._indexes.values():
+                index.add(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            old = self.store[key]
+            del self.store[key]
+            for index in self._indexes.values():
+                index.remove(key, old)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.store.clear()
+            for index in self._indexes.values():
+                index.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.store
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            keys = list(self.store)
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _discard(keys_by_value: Dict[Any, Set[str]], value: Any, key: str) -> None:
+    keys = keys_by_value.get(value)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del keys_by_value[value]
@@ -0,0 +1,350 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+Thalos Prime™ is a proprietary system.
+
+Bounded Chat Interaction Log
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT = re.compile(r'^interactions-(\d{12})\.jsonl$')
+
+
+class _Segment:
+    """Id and time bounds of one segment file"""
+
+    __slots__ = ('path', 'first_id', 'last_id', 'first_ts', 'last_ts', 'count')
+
+    def __init__(self, path: str, first_id: int):
+        self.path = path
+        self.first_id = first_id
+        self.last_id = first_id - 1
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.count = 0
+
+    def track(self, entry: Dict[str, Any]) -> None:
+        if self.first_ts is None:
+            self.first_ts = entry['timestamp']
+        self.last_id = entry['id']
+        self.last_ts = entry['timestamp']
+        self.count += 1
+
+
+class InteractionLog:
+    """
+    Append-only log of chat turns with bounded memory
+
+    Each turn gets the next id from a monotonic counter and a timestamp
+    that never goes backwards, both assigned under one lock, so ids are
+    unique across threads and ordering by id matches ordering by time.
+    The most recent ``capacity`` turns stay in an in-memory ring buffer;
+    with a ``directory`` every turn is also appended to JSON-lines segment
+    files of ``segment_entries`` turns, which serve reads older than the
+    ring and survive restarts. Without one, turns leaving the ring are
+    dropped. ``max_segments`` bounds the disk used by deleting the oldest
+    segments.
+    """
+
+    def __init__(self, capacity: int = 1000, directory: Optional[str] = None,
+                 segment_entries: int = 10000, max_segments: Optional[int] = None):
+        """
+        Initialize the log, reloading existing segments
+
+        Args:
+            capacity: Turns kept in memory
+            directory: Directory for segment files (None = memory only)
+            segment_entries: Turns per segment file before rolling over
+            max_segments: Segment files kept on disk (None = unlimited)
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive: {capacity}")
+        if segment_entries < 1:
+            raise ValueError(f"segment_entries must be positive: {segment_entries}")
+
+        self.capacity = capacity
+        self.directory = directory
+        self.segment_entries = segment_entries
+        self.max_segments = max_segments
+
+        self._lock = threading.Lock()
+        self._ring: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._segments: List[_Segment] = []
+        self._file = None
+        self._closed = False
+        self._next_id = 1
+        self._last_ts = 0.0
+        self.total_appended = 0
+        self.total_dropped = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._recover()
+
+    def append(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Log one turn
+
+        Args:
+            record: JSON-serializable fields of the turn
+
+        Returns:
+            The stored entry: the record plus ``id`` and ``timestamp``
+        """
+        with self._lock:
+            if self._closed:
+                raise ValueError("Interaction log is closed")
+            timestamp = max(time.time(), self._last_ts)
+            entry = dict(record, id=self._next_id, timestamp=timestamp)
+            if self.directory is not None:
+                self._write(entry)
+            elif len(self._ring) == self.capacity:
+                self.total_dropped += 1
+            self._ring.append(entry)
+            self._next_id += 1
+            self._last_ts = timestamp
+            self.total_appended += 1
+        return entry
+
+    def next_id(self) -> int:
+        """Id the next appended turn will get"""
+        with self._lock:
+            return self._next_id
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        """One turn by id, or None if unknown or no longer kept"""
+        with self._lock:
+            ring = list(self._ring)
+            segments = list(self._segments)
+        if ring and entry_id >= ring[0]['id']:
+            index = entry_id - ring[0]['id']
+            return ring[index] if index < len(ring) else None
+        for segment in segments:
+            if segment.first_id <= entry_id <= segment.last_id:
+                for entry in self._read(segment):
+                    if entry['id'] == entry_id:
+                        return entry
+        return None
+
+    def last(self, n: int) -> List[Dict[str, Any]]:
+        """
+        The ``n`` most recent turns, oldest first
+
+        Served from memory when ``n`` fits in the ring; older turns are read
+        from the newest segments backwards.
+        """
+        if n <= 0:
+            return []
+        with self._lock:
+            ring = list(self._ring)
+            segments = list(self._segments)
+        if n <= len(ring):
+            return ring[-n:]
+
+        older: List[Dict[str, Any]] = []
+        below = ring[0]['id'] if ring else self._next_id
+        wanted = n - len(ring)
+        for segment in reversed(segments):
+            if segment.first_id >= below:
+                continue
+            entries = [entry for entry in self._read(segment) if entry['id'] < below]
+            older[:0] = entries[-wanted:]
+            wanted = n - len(ring) - len(older)
+            if wanted <= 0:
+                break
+        return older + ring
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None,
+              limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Turns with ``start <= timestamp < end``, oldest first
+
+        Args:
+            start: Earliest timestamp (None = from the beginning)
+            end: Exclusive latest timestamp (None = up to now)
+            limit: Maximum turns to yield
+
+        Segments outside the range are skipped unread, and the ring is
+        searched by bisection; entries are yielded as they are read.
+        """
+        with self._lock:
+            ring = list(self._ring)
+            segments = list(self._segments)
+
+        yielded = 0
+        below = ring[0]['id'] if ring else self._next_id
+        for segment in segments:
+            if segment.first_id >= below or segment.last_ts is None:
+                continue
+            if (start is not None and segment.last_ts < start) \
+                    or (end is not None and segment.first_ts >= end):
+                continue
+            for entry in self._read(segment):
+                if entry['id'] >= below or (end is not None and entry['timestamp'] >= end):
+                    break
+                if _in_range(entry['timestamp'], start, end):
+                    if limit is not None and yielded >= limit:
+                        return
+                    yield entry
+                    yielded += 1
+
+        timestamps = [entry['timestamp'] for entry in ring]
+        first = 0 if start is None else bisect_left(timestamps, start)
+        for entry in ring[first:]:
+            if end is not None and entry['timestamp'] >= end:
+                return
+            if limit is not None and yielded >= limit:
+                return
+            yield entry
+            yielded += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'capacity': self.capacity,
+                'in_memory': len(self._ring),
+                'next_id': self._next_id,
+                'total_appended': self.total_appended,
+                'total_dropped': self.total_dropped,
+                'segments': len(self._segments),
+                'on_disk': sum(segment.count for segment in self._segments)
+            }
+
+    def close(self) -> None:
+        """Close the active segment file"""
+        with self._lock:
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __len__(self) -> int:
+        """Turns still retrievable (in memory or on disk)"""
+        with self._lock:
+            if self.directory is None:
+                return len(self._ring)
+            return sum(segment.count for segment in self._segments)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Append an entry to the active segment, rolling over when full"""
+        if self._file is None or self._segments[-1].count >= self.segment_entries:
+            self._roll(entry['id'])
+        self._file.write(json.dumps(entry, default=str) + '\n')
+        self._file.flush()
+        self._segments[-1].track(entry)
+
+    def _roll(self, first_id: int) -> None:
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f'interactions-{first_id:012d}.jsonl')
+        self._file = open(path, 'a', encoding='utf-8')
+        self._segments.append(_Segment(path, first_id))
+
+        while self.max_segments is not None and len(self._segments) > self.max_segments:
+            oldest = self._segments.pop(0)
+            self.total_dropped += oldest.count
+            try:
+                os.remove(oldest.path)
+            except OSError as e:
+                logger.warning(f"Could not remove {oldest.path}: {e}")
+
+    def _recover(self) -> None:
+        """
+        Rebuild segment bounds, the id counter and the ring from disk
+
+        Only the first and last entries of each segment are read (ids are
+        consecutive within a segment), plus enough of the newest segments
+        to refill the ring.
+        """
+        names = sorted(name for name in os.listdir(self.directory) if _SEGMENT.match(name))
+        for name in names:
+            segment = _Segment(os.path.join(self.directory, name),
+                               int(_SEGMENT.match(name).group(1)))
+            first, last = _bounds(segment.path)
+            if first is None:
+                continue
+            segment.first_ts, segment.last_ts = first['timestamp'], last['timestamp']
+            segment.last_id = last['id']
+            segment.count = last['id'] - segment.first_id + 1
+            self._segments.append(segment)
+
+        if not self._segments:
+            return
+        newest = self._segments[-1]
+        self._next_id = newest.last_id + 1
+        self._last_ts = newest.last_ts
+        for segment in reversed(self._segments):
+            entries = list(self._read(segment))
+            self._ring.extendleft(reversed(entries[-(self.capacity - len(self._ring)):]))
+            if len(self._ring) == self.capacity:
+                break
+
+        # Continue the newest segment, after a torn final line if any
+        self._file = open(newest.path, 'a', encoding='utf-8')
+        with open(newest.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                self._file.write('\n')
+                self._file.flush()
+
+    @staticmethod
+    def _read(segment: _Segment) -> Iterator[Dict[str, Any]]:
+        """Entries of a segment in id order, skipping torn or blank lines"""
+        try:
+            with open(segment.path, 'rb') as f:
+                for line in f:
+                    entry = _decode(line)
+                    if entry is not None:
+                        yield entry
+        except FileNotFoundError:
+            return  # removed by retention while being read
+
+
+def _bounds(path: str, block: int = 65536):
+    """First and last decodable entries of a segment file (None, None if empty)"""
+    with open(path, 'rb') as f:
+        first = None
+        for line in f:
+            first = _decode(line)
+            if first is not None:
+                break
+        if first is None:
+            return None, None
+
+        size = f.seek(0, os.SEEK_END)
+        while True:
+            block = min(block, size)
+            f.seek(size - block)
+            lines = f.read(block).split(b'\n')
+            if block < size:
+                lines = lines[1:]  # possibly cut at the start of the block
+            for line in reversed(lines):
+                last = _decode(line)
+                if last is not None:
+                    return first, last
+            if block == size:
+                return first, first
+            block *= 2
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    if not line.strip():
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _in_range(timestamp: float, start: Optional[float], end: Optional[float]) -> bool:
+    return (start is None or timestamp >= start) and (end is None or timestamp < end)
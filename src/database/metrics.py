@@ -0,0 +1,155 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+Thalos Prime™ is a proprietary system.
+
+Latency Instrumentation for Pools and Queries
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds in milliseconds; a final bucket catches the rest
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+                    1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+
+    Recording is O(log buckets) and memory is constant however many
+    samples arrive. Percentiles are interpolated within the bucket that
+    holds them, so they are accurate to the bucket width and never
+    exceed the largest sample seen.
+    """
+
+    def __init__(self, bounds_ms=BUCKET_BOUNDS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self._lock = threading.Lock()
+        self._counts: List[int] = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one sample, given in seconds"""
+        ms = max(0.0, seconds * 1000.0)
+        with self._lock:
+            self._counts[bisect_left(self.bounds_ms, ms)] += 1
+            self.count += 1
+            self.total_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        """Approximate ``q``-th percentile (0-100) in milliseconds"""
+        with self._lock:
+            return self._percentile(q)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {}
+            for i, count in enumerate(self._counts):
+                if count:
+                    label = f"le_{self.bounds_ms[i]:g}ms" if i < len(self.bounds_ms) else "inf"
+                    buckets[label] = count
+            return {
+                "count": self.count,
+                "mean_ms": self.total_ms / self.count if self.count else 0.0,
+                "max_ms": self.max_ms,
+                "p50_ms": self._percentile(50),
+                "p95_ms": self._percentile(95),
+                "p99_ms": self._percentile(99),
+                "buckets": buckets
+            }
+
+    def _percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, count in enumerate(self._counts):
+            if count and seen + count >= rank:
+                low = self.bounds_ms[i - 1] if i else 0.0
+                high = self.bounds_ms[i] if i < len(self.bounds_ms) else self.max_ms
+                high = min(high, self.max_ms)
+                low = min(low, high)
+                return low + (high - low) * (rank - seen) / count
+            seen += count
+        return self.max_ms
+
+
+class QueryStatistics:
+    """
+    Query latency percentiles, overall and per statement type, plus a
+    log of the most recent queries slower than ``slow_threshold`` seconds
+
+    A SELECT streams its rows, so its latency is the time spent parsing
+    and producing rows, recorded once the cursor is exhausted or closed;
+    time the caller spends between fetches is not counted.
+    """
+
+    def __init__(self, slow_threshold: Optional[float] = 0.1, slow_log_size: int = 100):
+        self.slow_threshold = slow_threshold
+        self.latency = LatencyHistogram()
+        self._by_statement: Dict[str, LatencyHistogram] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=max(1, slow_log_size))
+        self._lock = threading.Lock()
+        self.total_slow = 0
+        self.total_errors = 0
+
+    def observe(self, statement: Any, cursor: Any, elapsed: float, batch: int = 1) -> None:
+        """Record a finished statement, or arrange to once its cursor is drained"""
+        if cursor.lazy:
+            cursor.on_done = lambda fetch_time: self.record(
+                statement.query, statement.verb, elapsed + fetch_time, batch)
+        else:
+            self.record(statement.query, statement.verb, elapsed, batch)
+
+    def record(self, query: str, verb: str, elapsed: float, batch: int = 1) -> None:
+        self.latency.record(elapsed)
+        histogram = self._by_statement.get(verb)
+        if histogram is None:
+            with self._lock:
+                histogram = self._by_statement.setdefault(verb, LatencyHistogram())
+        histogram.record(elapsed)
+
+        if self.slow_threshold is not None and elapsed >= self.slow_threshold:
+            entry = {"query": query, "duration_ms": elapsed * 1000.0,
+                     "timestamp": time.time()}
+            if batch != 1:
+                entry["batch"] = batch
+            with self._lock:
+                self._slow.append(entry)
+                self.total_slow += 1
+            logger.warning(f"Slow query ({elapsed * 1000.0:.1f} ms): {query}")
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.total_errors += 1
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """Most recent slow queries, oldest first"""
+        with self._lock:
+            return list(self._slow)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            by_statement = dict(self._by_statement)
+        stats = self.latency.snapshot()
+        stats.update({
+            "by_statement": {verb: histogram.snapshot()
+                             for verb, histogram in sorted(by_statement.items())},
+            "slow_threshold_ms": None if self.slow_threshold is None
+            else self.slow_threshold * 1000.0,
+            "total_slow": self.total_slow,
+            "total_errors": self.total_errors,
+            "slow_queries": self.slow_queries()
+        })
+        return stats
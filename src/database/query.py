@@ -0,0 +1,456 @@
+"""
+© 2026 Tony Ray Macier III. All rights reserved.
+Thalos Prime™ is a proprietary system.
+
+Query Language for DatabaseManager
+
+A small statement language over the key-value store behind each
+connection (``conn["data"]``):
+
+    PUT ? ?                      upsert a key and value
+    INSERT ? ?                   store only if the key is absent
+    GET ?                        the (key, value) row for one key
+    DELETE ?                     remove a key
+    SELECT * | key | value | path[, path...]
+        [WHERE cond [AND cond...]] [LIMIT n]
+    COUNT [WHERE cond [AND cond...]]
+
+    cond: key PREFIX x | path = x | path != x | path CONTAINS x
+    path: key, value, or a dotted field path into dict values
+          (``wetware_data.intent``; a leading ``value.`` is optional)
+    x:    ? (positional), :name (named), 'text', "text", number,
+          true, false or null
+
+Statements are parsed once and cached by query text; results stream
+through a DB-API style Cursor.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.exceptions import QueryError
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<param>\?|:[A-Za-z_]\w*)
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<op>!=|=|,|\*)
+      | (?P<word>[A-Za-z_][\w.]*)
+    )""", re.VERBOSE)
+
+_LITERALS = {'true': True, 'false': False, 'null': None}
+_MISSING = object()
+
+
+class _Param:
+    """Placeholder resolved when a statement is bound"""
+
+    __slots__ = ('index', 'name')
+
+    def __init__(self, index: Optional[int] = None, name: Optional[str] = None):
+        self.index = index
+        self.name = name
+
+
+class Condition:
+    """One WHERE clause: a path, an operator and an operand"""
+
+    __slots__ = ('path', 'op', 'operand')
+
+    def __init__(self, path: Tuple[str, ...], op: str, operand: Any):
+        self.path = path
+        self.op = op
+        self.operand = operand
+
+    def matches(self, key: str, value: Any, operand: Any) -> bool:
+        if self.op == 'PREFIX':
+            return isinstance(key, str) and key.startswith(operand)
+        field = resolve_path(key, value, self.path)
+        if self.op == '=':
+            return field is not _MISSING and field == operand
+        if self.op == '!=':
+            return field is _MISSING or field != operand
+        # CONTAINS: membership in a list/tuple/set/dict, substring of a str
+        try:
+            return field is not _MISSING and operand in field
+        except TypeError:
+            return False
+
+
+def resolve_path(key: str, value: Any, path: Tuple[str, ...]) -> Any:
+    """Look up a parsed path in a row, or _MISSING"""
+    if path == ('key',):
+        return key
+    for part in path:
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _parse_path(word: str) -> Tuple[str, ...]:
+    if word.lower() == 'key':
+        return ('key',)
+    parts = tuple(word.split('.'))
+    if parts[0].lower() == 'value':
+        parts = parts[1:]
+    return parts
+
+
+class Cursor:
+    """
+    Result of one statement
+
+    Rows are tuples produced lazily, so a SELECT over a large store holds
+    one row at a time. ``rowcount`` is the number of rows written, or -1
+    for reads (as in DB-API). For a lazy cursor, ``on_done`` is called
+    once with the seconds spent producing rows when the rows run out or
+    the cursor is closed.
+
+    For filtered SELECT and COUNT, ``plan`` reports how rows were found:
+    ``{'access': 'index', 'index': path, 'candidates': n}`` when a
+    secondary index narrowed the keys, else ``{'access': 'scan', ...}``.
+    """
+
+    arraysize = 100
+
+    def __init__(self, rows: Iterable[tuple] = (), rowcount: int = -1,
+                 description: Sequence[str] = (), lazy: bool = False,
+                 plan: Optional[Dict[str, Any]] = None):
+        self._rows: Iterator[tuple] = iter(rows)
+        self.rowcount = rowcount
+        self.description = tuple(description)
+        self.lazy = lazy
+        self.plan = plan
+        self.on_done: Optional[Callable[[float], None]] = None
+        self._fetch_time = 0.0
+        self._done = False
+
+    def fetchone(self) -> Optional[tuple]:
+        return next(self, None)
+
+    def fetchmany(self, size: Optional[int] = None) -> List[tuple]:
+        size = self.arraysize if size is None else size
+        rows = []
+        while len(rows) < size:
+            row = next(self, None)
+            if row is None:
+                break
+            rows.append(row)
+        return rows
+
+    def fetchall(self) -> List[tuple]:
+        return list(self)
+
+    def scalar(self) -> Any:
+        """First column of the next row, or None"""
+        row = self.fetchone()
+        return None if row is None else row[0]
+
+    def close(self) -> None:
+        self._rows = iter(())
+        self._finish()
+
+    def __iter__(self) -> Iterator[tuple]:
+        return self
+
+    def __next__(self) -> tuple:
+        if not self.lazy:
+            return next(self._rows)
+        started = time.perf_counter()
+        row = next(self._rows, _MISSING)
+        self._fetch_time += time.perf_counter() - started
+        if row is _MISSING:
+            self._finish()
+            raise StopIteration
+        return row
+
+    def _finish(self) -> None:
+        if not self._done:
+            self._done = True
+            if self.on_done is not None:
+                self.on_done(self._fetch_time)
+
+
+class PreparedStatement:
+    """A parsed query, executable against any store with new parameters"""
+
+    def __init__(self, query: str):
+        """
+        Parse a query
+
+        Args:
+            query: Statement text
+
+        Raises:
+            QueryError: If the query is malformed
+        """
+        self.query = query
+        self.param_count = 0
+        self.param_names: set = set()
+        self.args: List[Any] = []
+        self.columns: List[Tuple[str, ...]] = []
+        self.conditions: List[Condition] = []
+        self.limit: Any = None
+
+        self._tokens = self._tokenize(query)
+        self._pos = 0
+        self.verb = self._expect_word().upper()
+        parser = getattr(self, f'_parse_{self.verb.lower()}', None)
+        if parser is None:
+            raise QueryError(f"Unknown statement: {self.verb}", field='query', value=query)
+        parser()
+        if self._pos != len(self._tokens):
+            raise QueryError(f"Unexpected input after {self.verb}: {self._tokens[self._pos][1]}",
+                             field='query', value=query)
+        del self._tokens
+
+    @property
+    def is_write(self) -> bool:
+        return self.verb in ('PUT', 'INSERT', 'DELETE')
+
+    def execute(self, store: Any, params: Any = None) -> Cursor:
+        """
+        Run the statement
+
+        Args:
+            store: The MutableMapping behind a connection
+            params: Sequence for ``?`` placeholders or dict for ``:name`` ones
+
+        Returns:
+            Cursor over the result rows
+        """
+        bind = self._binder(params)
+        if self.verb == 'PUT':
+            key, value = bind(self.args[0]), bind(self.args[1])
+            store[key] = value
+            return Cursor(rowcount=1)
+        if self.verb == 'INSERT':
+            key, value = bind(self.args[0]), bind(self.args[1])
+            if key in store:
+                return Cursor(rowcount=0)
+            store[key] = value
+            return Cursor(rowcount=1)
+        if self.verb == 'DELETE':
+            key = bind(self.args[0])
+            if key not in store:
+                return Cursor(rowcount=0)
+            del store[key]
+            return Cursor(rowcount=1)
+        if self.verb == 'GET':
+            key = bind(self.args[0])
+            value = store.get(key, _MISSING)
+            return Cursor([] if value is _MISSING else [(key, value)],
+                          description=('key', 'value'))
+
+        if self.verb == 'COUNT' and not self.conditions:
+            return Cursor([(len(store),)], description=('count',))
+        conditions = [(condition, bind(condition.operand)) for condition in self.conditions]
+        keys, index = None, None
+        if conditions and hasattr(store, 'candidates'):
+            keys, index = store.candidates(conditions)
+        plan = {'access': 'index' if index else 'scan', 'index': index,
+                'candidates': None if keys is None else len(keys)}
+        rows = self._matching(store, keys, conditions)
+        if self.verb == 'COUNT':
+            return Cursor([(sum(1 for _ in rows),)], description=('count',), plan=plan)
+
+        limit = bind(self.limit)
+        if limit is not None:
+            if not isinstance(limit, int) or limit < 0:
+                raise QueryError(f"LIMIT must be a non-negative integer: {limit!r}",
+                                 field='limit', value=limit)
+            rows = _take(rows, limit)
+        return Cursor(self._project(rows), description=self._description(), lazy=True,
+                      plan=plan)
+
+    def _matching(self, store: Any, keys: Optional[set],
+                  conditions: List[Tuple[Condition, Any]]) -> Iterator[Tuple[str, Any]]:
+        """
+        Rows satisfying every condition, read from the store lazily
+
+        ``keys`` are the candidates from an index (None to scan every key);
+        conditions are re-checked on each, in key order.
+        """
+        for key in (list(store) if keys is None else sorted(keys)):
+            value = store.get(key, _MISSING)
+            if value is _MISSING:
+                continue  # deleted while streaming
+            if all(condition.matches(key, value, operand) for condition, operand in conditions):
+                yield key, value
+
+    def _project(self, rows: Iterator[Tuple[str, Any]]) -> Iterator[tuple]:
+        if not self.columns:
+            for key, value in rows:
+                yield key, value
+            return
+        for key, value in rows:
+            yield tuple(None if (field := resolve_path(key, value, path)) is _MISSING else field
+                        for path in self.columns)
+
+    def _description(self) -> Tuple[str, ...]:
+        if not self.columns:
+            return ('key', 'value')
+        return tuple('.'.join(path) or 'value' for path in self.columns)
+
+    def _binder(self, params: Any) -> Callable[[Any], Any]:
+        if self.param_count:
+            if params is None or isinstance(params, (dict, str)) \
+                    or len(params) != self.param_count:
+                raise QueryError(
+                    f"Expected {self.param_count} positional parameters",
+                    field='params', value=params)
+        if self.param_names:
+            if not isinstance(params, dict) or not self.param_names <= params.keys():
+                raise QueryError(
+                    f"Missing named parameters: {sorted(self.param_names)}",
+                    field='params', value=params)
+
+        def bind(arg: Any) -> Any:
+            if isinstance(arg, _Param):
+                return params[arg.index] if arg.name is None else params[arg.name]
+            return arg
+        return bind
+
+    # Parsing
+
+    def _tokenize(self, query: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        text = query.rstrip().rstrip(';')
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None or match.end() == position:
+                raise QueryError(f"Syntax error at: {text[position:position + 20]!r}",
+                                 field='query', value=query)
+            kind = match.lastgroup
+            tokens.append((kind, match.group(kind)))
+            position = match.end()
+        return tokens
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else None
+
+    def _next(self, expected: str) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise QueryError(f"Incomplete query, expected {expected}",
+                             field='query', value=self.query)
+        self._pos += 1
+        return token
+
+    def _expect_word(self, *choices: str) -> str:
+        kind, text = self._next(' or '.join(choices) or 'a keyword')
+        if kind != 'word' or (choices and text.upper() not in choices):
+            raise QueryError(f"Expected {' or '.join(choices) or 'a keyword'}, got {text}",
+                             field='query', value=self.query)
+        return text
+
+    def _accept_word(self, word: str) -> bool:
+        token = self._peek()
+        if token is not None and token[0] == 'word' and token[1].upper() == word:
+            self._pos += 1
+            return True
+        return False
+
+    def _operand(self) -> Any:
+        kind, text = self._next('a value')
+        if kind == 'param':
+            if text == '?':
+                self.param_count += 1
+                return _Param(index=self.param_count - 1)
+            self.param_names.add(text[1:])
+            return _Param(name=text[1:])
+        if kind == 'string':
+            return re.sub(r'\\(.)', r'\1', text[1:-1])
+        if kind == 'number':
+            return float(text) if '.' in text else int(text)
+        if kind == 'word' and text.lower() in _LITERALS:
+            return _LITERALS[text.lower()]
+        raise QueryError(f"Expected a value, got {text}", field='query', value=self.query)
+
+    def _parse_put(self) -> None:
+        self.args = [self._operand(), self._operand()]
+
+    _parse_insert = _parse_put
+
+    def _parse_get(self) -> None:
+        self.args = [self._operand()]
+
+    _parse_delete = _parse_get
+
+    def _parse_select(self) -> None:
+        token = self._peek()
+        if token == ('op', '*'):
+            self._pos += 1
+        else:
+            self.columns.append(_parse_path(self._expect_word()))
+            while self._peek() == ('op', ','):
+                self._pos += 1
+                self.columns.append(_parse_path(self._expect_word()))
+        self._parse_where()
+        if self._accept_word('LIMIT'):
+            self.limit = self._operand()
+
+    def _parse_count(self) -> None:
+        self._parse_where()
+
+    def _parse_where(self) -> None:
+        if not self._accept_word('WHERE'):
+            return
+        while True:
+            path = _parse_path(self._expect_word())
+            token = self._peek()
+            if token is not None and token[0] == 'op' and token[1] in ('=', '!='):
+                self._pos += 1
+                op = token[1]
+            else:
+                op = self._expect_word('CONTAINS', 'PREFIX').upper()
+                if op == 'PREFIX' and path != ('key',):
+                    raise QueryError("PREFIX applies to key only", field='query', value=self.query)
+            self.conditions.append(Condition(path, op, self._operand()))
+            if not self._accept_word('AND'):
+                break
+
+
+def _take(rows: Iterator, limit: int) -> Iterator:
+    for index, row in enumerate(rows):
+        if index >= limit:
+            return
+        yield row
+
+
+class StatementCache:
+    """LRU cache of PreparedStatements keyed by query text"""
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = max(1, capacity)
+        self._statements: 'OrderedDict[str, PreparedStatement]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def prepare(self, query: str) -> PreparedStatement:
+        """Cached statement for a query, parsing it on first use"""
+        with self._lock:
+            statement = self._statements.get(query)
+            if statement is not None:
+                self._statements.move_to_end(query)
+                self.hits += 1
+                return statement
+
+            statement = PreparedStatement(query)
+            self.misses += 1
+            self._statements[query] = statement
+            if len(self._statements) > self.capacity:
+                self._statements.popitem(last=False)
+            return statement
+
+    def get_statistics(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': len(self._statements), 'capacity': self.capacity,
+                    'hits': self.hits, 'misses': self.misses}
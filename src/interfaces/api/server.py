@@ -23,6 +23,7 @@ Minimal REST surface:
 
 from typing import Dict, Any, Optional
 import json
+from urllib.parse import parse_qsl
 
 
 class API:
@@ -169,7 +170,15 @@ class API:
         if method == 'POST' and path == '/memory':
             if not body or 'key' not in body or 'value' not in body:
                 return {'status': 'error', 'code': 400, 'message': 'Missing key or value'}
-            result = memory.create(body['key'], body['value'])
+            ttl = body.get('ttl')
+            if ttl is not None:
+                try:
+                    ttl = float(ttl)
+                except (TypeError, ValueError):
+                    ttl = None
+                if ttl is None or not ttl > 0:
+                    return {'status': 'error', 'code': 400, 'message': 'ttl must be a positive number'}
+            result = memory.create(body['key'], body['value'], ttl=ttl)
             return {
                 'status': 'success' if result else 'error',
                 'code': 200 if result else 409,
@@ -206,10 +215,19 @@ class API:
                 'data': {'deleted': result}
             }
             
-        # GET /memory - list keys
-        if method == 'GET' and path == '/memory':
-            keys = memory.list_keys()
-            return {'status': 'success', 'code': 200, 'data': {'keys': keys, 'count': len(keys)}}
+        # GET /memory - list keys (?prefix=&start=&end=&limit=&cursor=)
+        if method == 'GET' and path.split('?', 1)[0] == '/memory':
+            params = dict(parse_qsl(path.partition('?')[2]))
+            params.update(body or {})
+            try:
+                limit = int(params['limit']) if params.get('limit') else None
+                keys, cursor = memory.scan(prefix=params.get('prefix'), start=params.get('start'),
+                                           end=params.get('end'), limit=limit,
+                                           cursor=params.get('cursor'))
+            except ValueError as e:
+                return {'status': 'error', 'code': 400, 'message': str(e)}
+            return {'status': 'success', 'code': 200,
+                    'data': {'keys': keys, 'count': len(keys), 'cursor': cursor}}
             
         return {'status': 'error', 'code': 405, 'message': 'Method not allowed'}
         
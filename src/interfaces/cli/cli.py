@@ -92,7 +92,10 @@ class CLI:
         mem_delete = memory_subparsers.add_parser('delete', help='Delete memory entry')
         mem_delete.add_argument('key', help='Key name')
         
-        memory_subparsers.add_parser('list', help='List all keys')
+        mem_list = memory_subparsers.add_parser('list', help='List keys in sorted order')
+        mem_list.add_argument('--prefix', help='Only keys starting with this prefix')
+        mem_list.add_argument('--limit', type=int, help='Maximum number of keys')
+        mem_list.add_argument('--cursor', help='Continue after this key (from a previous page)')
         memory_subparsers.add_parser('count', help='Get count of stored items')
         
         # Codegen commands
@@ -183,8 +186,12 @@ class CLI:
             return f"Deleted: {parsed.key}" if result else f"Key not found: {parsed.key}"
             
         elif parsed.memory_cmd == 'list':
-            keys = memory.list_keys()
-            return f"Keys: {', '.join(keys)}" if keys else "No keys stored"
+            keys, cursor = memory.scan(prefix=parsed.prefix, limit=parsed.limit,
+                                       cursor=parsed.cursor)
+            if not keys:
+                return "No keys stored"
+            result = f"Keys: {', '.join(keys)}"
+            return f"{result}\nNext cursor: {cursor}" if cursor else result
             
         elif parsed.memory_cmd == 'count':
             count = memory.count()
@@ -269,9 +269,9 @@ class ActionHandler:
         }
     
     def _execute_memory_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List all memory entries"""
+        """List memory entries in key order, optionally by prefix"""
         memory = self.cis.get_memory()
-        keys = memory.list_keys()
+        keys, _ = memory.scan(prefix=params.get('prefix'), limit=params.get('limit'))
         
         entries = {}
         for key in keys:
@@ -27,6 +27,7 @@ from wetware.life_support import LifeSupport
 from ai.neural.bio_neural_network import BioNeuralNetwork
 from ai.learning.reinforcement_learner import ReinforcementLearner
 from database.connection_manager import DatabaseManager
+from database.interaction_log import InteractionLog
 from interfaces.web.nlp_processor import NLPProcessor
 from interfaces.web.action_handler import ActionHandler
 
@@ -53,6 +54,10 @@ print("✓ Action Handler initialized")
 db_manager = DatabaseManager(db_type="memory")
 print("✓ Database manager initialized")
 
+# Recent chat turns in memory, the full history in segment files
+interaction_log = InteractionLog(capacity=1000, directory=os.path.join('data', 'interactions'))
+print("✓ Interaction log initialized")
+
 # Initialize Wetware Core
 print("Initializing Wetware Core...")
 life_support = LifeSupport()
@@ -194,9 +199,7 @@ def chat():
         # Step 4: Also process through neural network
         input_pattern = message_to_pattern(message)
         neural_net.stimulate_inputs(input_pattern)
-        
-        for _ in range(50):
-            neural_net.simulate_step()
+        neural_net.simulate(50)
         
         output_activity = neural_net.get_output_activity()
         net_stats = neural_net.get_network_stats()
@@ -229,27 +232,25 @@ def chat():
                     message, wetware_result, output_activity, net_stats
                 )
         
-        # Step 7: Store interaction in database
+        # Step 7: Record the turn in the interaction log
+        interaction_id = None
         try:
-            conn = db_manager.pool.get_connection()
-            interaction_id = f'chat_{len(conn["data"])}'
-            conn['data'][interaction_id] = {
+            interaction_id = interaction_log.append({
                 'message': message,
                 'response': response_text,
-                'analysis': analysis,
+                'intent': analysis['intent'],
+                'topics': analysis['topics'],
+                'sentiment': analysis['sentiment'],
                 'action_executed': action_type,
-                'action_result': action_result,
+                'action_success': action_result.get('success') if action_result else None,
                 'wetware_data': {
                     'total_spikes': wetware_result['total_spikes'],
                     'lobes_active': len(wetware_result['lobe_responses']),
-                    'decoded_confidence': wetware_result['decoded'].get('confidence', 0),
-                    'intent': analysis['intent'],
-                    'topics': analysis['topics']
+                    'decoded_confidence': wetware_result['decoded'].get('confidence', 0)
                 }
-            }
-            db_manager.pool.return_connection(conn)
+            })['id']
         except Exception as e:
-            print(f"Database storage error: {e}")
+            print(f"Interaction log error: {e}")
         
         # Step 8: Prepare comprehensive metadata
         life_support_status = wetware_result['life_support']
@@ -277,7 +278,8 @@ def chat():
                 'complexity': analysis['complexity']
             },
             'actionExecuted': action_type,
-            'actionSuccess': action_result.get('success') if action_result else False
+            'actionSuccess': action_result.get('success') if action_result else False,
+            'interactionId': interaction_id
         }
         
         return jsonify({
@@ -334,6 +336,28 @@ def _format_action_response(action_result: Dict[str, Any], action_type: str) ->
     return message
 
 
+@app.route('/api/interactions', methods=['GET'])
+def get_interactions():
+    """
+    Read logged chat turns, oldest first
+    
+    Query parameters: ``last`` for the N most recent turns (default 20),
+    or ``since`` / ``until`` (Unix timestamps) and ``limit`` for a time range
+    """
+    try:
+        if 'since' in request.args or 'until' in request.args:
+            since = request.args.get('since', type=float)
+            until = request.args.get('until', type=float)
+            limit = request.args.get('limit', 100, type=int)
+            turns = list(interaction_log.range(since, until, limit))
+        else:
+            turns = interaction_log.last(min(request.args.get('last', 20, type=int), 1000))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'interactions': turns, 'count': len(turns)})
+
+
 @app.route('/api/status', methods=['GET'])
 def get_status():
     """Get comprehensive system status including wetware"""
@@ -358,6 +382,7 @@ def get_status():
             'viability_score': life_support.get_viability_score()
         },
         'database': db_stats,
+        'interactions': interaction_log.get_statistics(),
         'system_health': 'OPERATIONAL'
     })
 
@@ -375,6 +400,8 @@ def get_metrics():
     # Calculate aggregate accuracy from organoids
     avg_accuracy = sum(org['accuracy_score'] for org in organoid_statuses) / len(organoid_statuses)
     
+    db_stats = db_manager.get_statistics()
+    
     return jsonify({
         'neural_density': avg_neural_density,
         'accuracy': avg_accuracy,
@@ -384,7 +411,11 @@ def get_metrics():
         'organoid_count': len(organoids),
         'life_support_viability': life_support.get_viability_score(),
         'temperature': life_support_status['temperature'],
-        'oxygen_saturation': life_support_status['oxygen_saturation']
+        'oxygen_saturation': life_support_status['oxygen_saturation'],
+        'database': {
+            'pool': db_stats['pool'],
+            'queries': db_stats['queries']
+        }
     })
 
 
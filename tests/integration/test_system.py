@@ -59,6 +59,29 @@ def test_memory_through_cis():
     print("✓ Memory through CIS test passed")
 
 
+def test_memory_config_through_cis():
+    """Test CIS passes the [memory] config section to the memory module"""
+    print("Testing memory config through CIS...")
+    
+    from core.config import Config
+    config = Config()
+    config.set('memory', 'max_size', '2')
+    config.set('memory', 'eviction_policy', 'fifo')
+    
+    cis = CIS(config=config)
+    cis.boot()
+    memory = cis.get_memory()
+    assert memory.max_items == 2
+    assert memory.eviction_policy == 'fifo'
+    
+    for key in ('a', 'b', 'c'):
+        memory.create(key, key)
+    assert memory.exists('a') is False
+    assert memory.read('c') == 'c'
+    
+    print("✓ Memory config through CIS test passed")
+
+
 def test_codegen_through_cis():
     """Test code generation through CIS"""
     print("Testing codegen through CIS...")
@@ -313,6 +336,7 @@ if __name__ == '__main__':
     
     test_full_system_lifecycle()
     test_memory_through_cis()
+    test_memory_config_through_cis()
     test_codegen_through_cis()
     test_cli_integration()
     test_api_integration()
@@ -0,0 +1,673 @@
+"""
+Thalos Prime - Unit Tests for Advanced Memory System
+
+Tests for persistence modes, indexing and version history
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.memory.advanced_memory import AdvancedMemorySystem
+
+
+def test_snapshot_persistence_roundtrip():
+    """Test default snapshot mode reloads saved entries"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path))
+        memory.create('k1', 'alpha beta', tags=['greek'])
+        memory.update('k1', 'alpha gamma')
+
+        reloaded = AdvancedMemorySystem(str(tmp_path))
+        assert reloaded.read('k1') == 'alpha gamma'
+        assert len(reloaded.get_version_history('k1')) == 2
+
+    print("✓ Snapshot persistence test passed")
+
+
+def test_wal_replay_without_compaction():
+    """Test WAL mode replays the log tail on startup"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), persistence='wal', compact_every=0)
+        memory.create('k1', 'alpha', tags=['t'], related_keys=['k2'])
+        memory.create('k2', {'field': 'beta'})
+        memory.update('k1', 'gamma')
+        memory.create('k3', 'delta')
+        memory.delete('k3')
+        memory.close()
+
+        assert not (tmp_path / 'snapshot.pkl').exists()
+        assert not (tmp_path / 'data.json').exists()
+
+        reloaded = AdvancedMemorySystem(str(tmp_path), persistence='wal')
+        assert reloaded.read('k1') == 'gamma'
+        assert reloaded.read('k2') == {'field': 'beta'}
+        assert reloaded.read('k3') is None
+        assert reloaded.find_related('k1') == ['k2']
+        assert [v['action'] for v in reloaded.get_version_history('k1')] == ['created', 'updated']
+        assert reloaded.metadata['k1']['created_at'] == memory.metadata['k1']['created_at']
+        reloaded.close()
+
+    print("✓ WAL replay test passed")
+
+
+def test_wal_compaction_and_tail():
+    """Test snapshot compaction followed by replay of newer records"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), persistence='wal', compact_every=3,
+                                      background_compaction=False)
+        for i in range(4):
+            memory.create(f'k{i}', f'value {i}')
+        memory.restore_version('k0', 1)
+        memory.close()
+
+        assert (tmp_path / 'snapshot.pkl').exists()
+        assert not (tmp_path / 'wal.log.old').exists()
+
+        reloaded = AdvancedMemorySystem(str(tmp_path), persistence='wal')
+        assert sorted(reloaded.data) == ['k0', 'k1', 'k2', 'k3']
+        assert reloaded.stats['created'] == 4
+        assert len(reloaded.get_version_history('k0')) == 2
+        reloaded.close()
+
+    print("✓ WAL compaction test passed")
+
+
+def test_wal_ignores_torn_record():
+    """Test a partially written trailing record is dropped on startup"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), persistence='wal', compact_every=0)
+        memory.create('k1', 'alpha')
+        memory.close()
+
+        with open(tmp_path / 'wal.log', 'ab') as f:
+            f.write(b'{"op":"create","k":"k2"')
+
+        reloaded = AdvancedMemorySystem(str(tmp_path), persistence='wal', compact_every=0)
+        assert reloaded.read('k1') == 'alpha'
+        assert reloaded.read('k2') is None
+        reloaded.create('k2', 'beta')
+        reloaded.close()
+
+        again = AdvancedMemorySystem(str(tmp_path), persistence='wal')
+        assert again.read('k2') == 'beta'
+        again.close()
+
+    print("✓ WAL torn record test passed")
+
+
+def test_every_n_durability_defers_snapshot():
+    """Test every_n policy only rewrites the store every N mutations"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), durability='every_n', flush_every=3)
+        memory.create('k1', 'one')
+        memory.create('k2', 'two')
+        assert not (tmp_path / 'data.json').exists()
+
+        memory.create('k3', 'three')
+        assert (tmp_path / 'data.json').exists()
+
+        memory.create('k4', 'four')
+        memory.flush()
+        reloaded = AdvancedMemorySystem(str(tmp_path))
+        assert sorted(reloaded.data) == ['k1', 'k2', 'k3', 'k4']
+
+    print("✓ every_n durability test passed")
+
+
+def test_batch_flushes_once_on_exit():
+    """Test batch() suspends persistence and flushes on exit"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path))
+        flushes = []
+        original = memory.save_to_disk
+        memory.save_to_disk = lambda: (flushes.append(1), original())
+
+        with memory.batch():
+            with memory.batch():
+                memory.create('k1', 'one')
+            memory.create('k2', 'two')
+            memory.update('k1', 'uno')
+            assert flushes == []
+
+        assert len(flushes) == 1
+        reloaded = AdvancedMemorySystem(str(tmp_path))
+        assert reloaded.read('k1') == 'uno'
+
+    print("✓ Batch flush test passed")
+
+
+def test_manual_durability_in_wal_mode():
+    """Test manual policy leaves the log unsynced until flush()"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), persistence='wal', durability='manual',
+                                      compact_every=0)
+        memory.create('k1', 'one')
+        memory.create('k2', 'two')
+        assert memory.wal.pending == 2
+
+        memory.flush()
+        assert memory.wal.pending == 0
+        memory.close()
+
+    print("✓ Manual durability test passed")
+
+
+def test_bulk_operations():
+    """Test create_many/update_many/delete_many per-key results"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path))
+        memory.create('existing', 'old entry')
+
+        created = memory.create_many([
+            {'key': 'a', 'value': 'alpha particle', 'tags': ['physics']},
+            {'key': 'b', 'value': 'beta decay', 'related_keys': ['a']},
+            {'key': 'existing', 'value': 'ignored'},
+            {'key': 'a', 'value': 'duplicate'},
+        ])
+        assert created == {'a': True, 'b': True, 'existing': False}
+        assert memory.read('a') == 'alpha particle'
+        assert [k for k, _ in memory.find_by_tag('physics')] == ['a']
+        assert memory.find_related('b') == ['a']
+
+        updated = memory.update_many({'a': 'alpha ray', 'missing': 'x'})
+        assert updated == {'a': True, 'missing': False}
+        assert [k for k, _, _ in memory.search('ray')] == ['a']
+        assert memory.search('particle') == []
+
+        deleted = memory.delete_many(['b', 'b', 'missing'])
+        assert deleted == {'b': True, 'missing': False}
+        assert memory.stats['created'] == 3
+        assert memory.stats['deleted'] == 1
+
+    print("✓ Bulk operations test passed")
+
+
+def test_bulk_operations_single_wal_record():
+    """Test bulk operations log one record each and replay correctly"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), persistence='wal', compact_every=0)
+        memory.create_many({'key': f'k{i}', 'value': f'value {i}'} for i in range(50))
+        memory.update_many((f'k{i}', f'changed {i}') for i in range(10))
+        memory.delete_many(f'k{i}' for i in range(40, 50))
+        assert memory.wal.last_seq == 3
+        memory.close()
+
+        reloaded = AdvancedMemorySystem(str(tmp_path), persistence='wal')
+        assert len(reloaded.data) == 40
+        assert reloaded.read('k3') == 'changed 3'
+        assert len(reloaded.get_version_history('k3')) == 2
+        reloaded.close()
+
+    print("✓ Bulk WAL replay test passed")
+
+
+def test_bm25_ranking():
+    """Test BM25 weighs term frequency, rarity and document length"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), durability='manual')
+        memory.create('short', 'neuron spike')
+        memory.create('long', 'neuron ' + ' '.join(f'filler{i}' for i in range(30)))
+        memory.create('repeated', 'neuron neuron neuron spike')
+        memory.create('common', 'the the the the')
+        memory.create('rare', 'the synapse')
+
+        ranked = [key for key, _, _ in memory.search('neuron')]
+        assert ranked == ['repeated', 'short', 'long']
+
+        # A rare term outweighs a common one
+        key, _, score = memory.search('the synapse', limit=1)[0]
+        assert key == 'rare'
+        assert score > 0
+
+        assert len(memory.search('neuron', limit=2)) == 2
+        assert memory.search('absent') == []
+
+    print("✓ BM25 ranking test passed")
+
+
+def test_legacy_set_index_is_rebuilt():
+    """Test stores saved with set-based word indexes still load and search"""
+    import json
+    import pickle
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        (tmp_path / 'data.json').write_text(json.dumps({'k1': 'legacy neuron'}))
+        (tmp_path / 'metadata.json').write_text(json.dumps({'k1': {'tags': [], 'version': 1}}))
+        with open(tmp_path / 'indexes.pkl', 'wb') as f:
+            pickle.dump({'word_index': {'legacy': {'k1'}, 'neuron': {'k1'}},
+                         'tag_index': {}, 'relationships': {}, 'versions': {}}, f)
+
+        memory = AdvancedMemorySystem(str(tmp_path))
+        assert [key for key, _, _ in memory.search('neuron')] == ['k1']
+
+    print("✓ Legacy index rebuild test passed")
+
+
+def test_update_reindexes_only_changed_terms():
+    """Test update() diffs term counts instead of retokenising the old value"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), durability='manual')
+        memory.create('doc', {'title': 'neural network', 'body': 'spike train spike'})
+
+        # The old value must never be stringified again
+        memory._deindex_content = None
+        removed, changed = memory.word_index.update(
+            'doc', memory._tokenize(str({'title': 'neural network', 'body': 'spike burst'}).lower()))
+        assert (removed, changed) == (1, 2)  # 'train' removed; 'spike' re-weighted, 'burst' added
+
+        memory.update('doc', {'title': 'neural network', 'body': 'synapse'})
+        assert [k for k, _, _ in memory.search('synapse')] == ['doc']
+        assert memory.search('spike') == []
+        assert memory.word_index.doc_length('doc') == 5
+
+    print("✓ Incremental reindex test passed")
+
+
+def test_restore_version_reindexes():
+    """Test restoring a version makes its content searchable again"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), durability='manual')
+        memory.create('k1', 'original phrasing')
+        memory.update('k1', 'rewritten text')
+        memory.restore_version('k1', 1)
+
+        assert [k for k, _, _ in memory.search('original')] == ['k1']
+        assert memory.search('rewritten') == []
+
+    print("✓ Restore reindex test passed")
+
+
+def test_index_segment_roundtrip():
+    """Test segment files keep sorted terms and delta-encoded postings"""
+    from core.memory.index_segment import IndexSegment, write_index_segment
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        path = tmp_path / 'test.seg'
+        write_index_segment(path, {'b': 3, 'a': 2, 'c': 1}, [
+            ('alpha', {'a': 1, 'c': 1}),
+            ('beta', {'b': 2, 'a': 1}),
+            ('empty', {}),
+        ])
+
+        segment = IndexSegment(path)
+        assert segment.num_docs == 3
+        assert segment.num_terms == 2
+        assert segment.total_length == 6
+        assert [segment.doc_key(i) for i in range(3)] == ['a', 'b', 'c']
+        assert segment.doc_id('c') == 2 and segment.doc_id('zzz') is None
+        assert segment.term_id('empty') is None
+        assert list(segment.postings(segment.term_id('alpha'))) == [(0, 1), (2, 1)]
+        assert list(segment.postings(segment.term_id('beta'))) == [(0, 1), (1, 2)]
+        segment.close()
+
+    print("✓ Index segment roundtrip test passed")
+
+
+def test_segment_backed_search_after_restart():
+    """Test saved indexes are mmapped on load and updated through the overlay"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), durability='manual')
+        memory.create_many({'key': f'k{i}', 'value': f'shared topic{i % 3}'} for i in range(9))
+        memory.flush()
+        assert len(list(tmp_path.glob('index-*.seg'))) == 1
+
+        reloaded = AdvancedMemorySystem(str(tmp_path), durability='manual')
+        assert reloaded.word_index.segment is not None
+        assert not reloaded.word_index.overlay.doc_lengths
+        assert sorted(k for k, _, _ in reloaded.search('topic1')) == ['k1', 'k4', 'k7']
+
+        reloaded.update('k1', 'moved elsewhere')
+        reloaded.delete('k4')
+        assert [k for k, _, _ in reloaded.search('topic1')] == ['k7']
+        assert [k for k, _, _ in reloaded.search('elsewhere')] == ['k1']
+        assert reloaded.word_index.num_docs == 8
+
+        reloaded.flush()
+        assert [p.name for p in tmp_path.glob('index-*.seg')] == ['index-00000002.seg']
+
+        again = AdvancedMemorySystem(str(tmp_path))
+        assert [k for k, _, _ in again.search('topic1')] == ['k7']
+        assert again.word_index.doc_length('k1') == 2
+
+    print("✓ Segment-backed search test passed")
+
+
+def test_wal_compaction_writes_index_segment():
+    """Test WAL compaction references a segment that replay builds on"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), persistence='wal', compact_every=0)
+        memory.create('k1', 'first neuron')
+        memory.compact(background=False)
+        memory.create('k2', 'second neuron')
+        memory.close()
+
+        reloaded = AdvancedMemorySystem(str(tmp_path), persistence='wal')
+        assert reloaded.word_index.segment is not None
+        assert sorted(k for k, _, _ in reloaded.search('neuron')) == ['k1', 'k2']
+        reloaded.close()
+
+    print("✓ WAL segment compaction test passed")
+
+
+def test_version_deltas_reconstruct_history():
+    """Test dict versions are stored as deltas and rebuilt on read"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path))
+        base = {f'field{i}': i for i in range(10)}
+        memory.create('doc', base)
+        memory.update('doc', {**base, 'field3': 'changed'})
+        memory.update('doc', {k: v for k, v in base.items() if k != 'field9'})
+
+        records = [memory.versions._load('doc', entry) for entry in memory.versions.entries['doc']]
+        assert 'value' in records[0]
+        assert records[1]['delta'] == {'set': {'field3': 'changed'}, 'unset': []}
+
+        reloaded = AdvancedMemorySystem(str(tmp_path))
+        history = reloaded.get_version_history('doc')
+        assert [v['version'] for v in history] == [1, 2, 3]
+        assert history[1]['value']['field3'] == 'changed'
+        assert 'field9' not in history[2]['value']
+
+        assert reloaded.restore_version('doc', 2)
+        assert reloaded.read('doc') == {**base, 'field3': 'changed'}
+
+    print("✓ Version delta test passed")
+
+
+def test_version_retention_by_count():
+    """Test old versions are dropped while numbering stays stable"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), max_versions=3)
+        memory.create('doc', {'a': 0, 'b': 0, 'c': 0})
+        for i in range(1, 6):
+            memory.update('doc', {'a': i, 'b': 0, 'c': 0})
+
+        history = memory.get_version_history('doc')
+        assert [v['version'] for v in history] == [4, 5, 6]
+        assert history[0]['value'] == {'a': 3, 'b': 0, 'c': 0}
+        assert not memory.restore_version('doc', 1)
+
+        reloaded = AdvancedMemorySystem(str(tmp_path), max_versions=3)
+        assert reloaded.get_version_history('doc') == history
+        assert reloaded.restore_version('doc', 4)
+        assert reloaded.get_version_history('doc')[-1]['version'] == 7
+
+    print("✓ Version retention test passed")
+
+
+def test_version_retention_by_age():
+    """Test versions older than the retention window are pruned"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path))
+        memory._replay_ts = '2020-01-01T00:00:00'
+        memory.create('doc', 'old')
+        memory._replay_ts = None
+        memory.update('doc', 'new')
+
+        memory.versions.max_age_days = 30
+        result = memory.optimize()
+        assert result['pruned_versions'] == 1
+        assert [v['value'] for v in memory.get_version_history('doc')] == ['new']
+
+    print("✓ Version age retention test passed")
+
+
+def test_inline_version_history_is_imported():
+    """Test stores that pickled full histories load into the version log"""
+    import json
+    import pickle
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        (tmp_path / 'data.json').write_text(json.dumps({'k1': 'two'}))
+        (tmp_path / 'metadata.json').write_text(json.dumps({'k1': {'tags': [], 'version': 2}}))
+        history = [
+            {'version': 1, 'timestamp': '2026-01-01T00:00:00', 'action': 'created', 'value': 'one'},
+            {'version': 2, 'timestamp': '2026-01-02T00:00:00', 'action': 'updated', 'value': 'two'},
+        ]
+        with open(tmp_path / 'indexes.pkl', 'wb') as f:
+            pickle.dump({'word_index': {}, 'tag_index': {}, 'relationships': {},
+                         'versions': {'k1': history}}, f)
+
+        memory = AdvancedMemorySystem(str(tmp_path))
+        assert memory.get_version_history('k1') == history
+        memory.save_to_disk()
+
+        reloaded = AdvancedMemorySystem(str(tmp_path))
+        assert reloaded.get_version_history('k1') == history
+
+    print("✓ Inline version history import test passed")
+
+
+def test_unreferenced_version_records_are_discarded():
+    """Test versions flushed without a durable snapshot are not duplicated"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), persistence='wal', compact_every=0)
+        memory.create('k1', 'one')
+        memory.update('k1', 'two')
+        memory.wal.sync()
+        memory.versions.flush()  # as if compaction crashed before the snapshot landed
+        memory.versions.close()
+        memory.wal.close()
+
+        reloaded = AdvancedMemorySystem(str(tmp_path), persistence='wal')
+        assert [v['value'] for v in reloaded.get_version_history('k1')] == ['one', 'two']
+        reloaded.compact(background=False)
+        reloaded.close()
+
+        again = AdvancedMemorySystem(str(tmp_path), persistence='wal')
+        assert [v['version'] for v in again.get_version_history('k1')] == [1, 2]
+        assert [p.name for p in tmp_path.glob('versions-*.log')] == ['versions-00000000.log']
+        again.close()
+
+    print("✓ Unreferenced version record test passed")
+
+
+def test_eviction_policies():
+    """Test LRU and LFU victim order"""
+    from core.memory.eviction import EvictionPolicy, LFUPolicy, LRUPolicy
+
+    lru = LRUPolicy()
+    for key in 'abc':
+        lru.insert(key)
+    lru.access('a')
+    assert [lru.pop_victim() for _ in range(3)] == ['b', 'c', 'a']
+    assert lru.pop_victim() is None
+
+    lfu = LFUPolicy()
+    for key in 'abc':
+        lfu.insert(key)
+    lfu.access('a')
+    lfu.access('a')
+    lfu.access('c')
+    lfu.remove('b')
+    lfu.insert('d')
+    assert [lfu.pop_victim() for _ in range(3)] == ['d', 'c', 'a']
+
+    class Incomplete(EvictionPolicy):
+        def insert(self, key):
+            pass
+
+    try:
+        Incomplete()
+        assert False, "a policy missing methods should not instantiate"
+    except TypeError:
+        pass
+
+    print("✓ Eviction policy test passed")
+
+
+def test_tiered_values_page_from_disk():
+    """Test a bounded hot cache with cold values read back from the value log"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), durability='manual', cache_bytes=2000)
+        for i in range(50):
+            memory.create(f'k{i}', {'body': f'value {i} ' + 'x' * 100})
+
+        assert memory.data.cache.current_bytes <= 2000
+        assert len(memory.data.cache) < 50
+        assert memory.stats['cache_evictions'] > 0
+
+        hits = memory.stats['cache_hits']
+        assert memory.read('k49')['body'].startswith('value 49')
+        assert memory.stats['cache_hits'] == hits + 1
+
+        misses = memory.stats['cache_misses']
+        assert memory.read('k0')['body'].startswith('value 0')
+        assert memory.stats['cache_misses'] == misses + 1
+        assert memory.read('missing') is None
+        assert memory.stats['cache_misses'] == misses + 1
+
+        memory.update('k1', {'body': 'rewritten'})
+        memory.delete('k2')
+        assert memory.search('rewritten')[0][:2] == ('k1', {'body': 'rewritten'})
+        assert memory.get_statistics()['operations']['cache_evictions'] > 0
+        memory.close()
+
+        assert not (tmp_path / 'data.json').exists()
+        reloaded = AdvancedMemorySystem(str(tmp_path), cache_bytes=2000)
+        assert len(reloaded.data) == 49
+        assert reloaded.read('k1') == {'body': 'rewritten'}
+        assert reloaded.read('k2') is None
+        assert reloaded.stats['cache_evictions'] > 0
+
+    print("✓ Tiered value store test passed")
+
+
+def test_tiered_lfu_keeps_hot_values():
+    """Test LFU retains frequently read values under churn"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), durability='manual', cache_bytes=1000,
+                                      cache_policy='lfu')
+        memory.create('hot', 'h' * 100)
+        for _ in range(5):
+            memory.read('hot')
+        for i in range(20):
+            memory.create(f'cold{i}', 'c' * 100)
+
+        assert 'hot' in memory.data.cache
+        memory.close()
+
+    print("✓ Tiered LFU test passed")
+
+
+def test_tiered_versions_read_previous_value_from_log():
+    """Test tiered mode keeps no value tips yet still delta-encodes versions"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = AdvancedMemorySystem(str(tmp_path), persistence='wal', durability='manual',
+                                      compact_every=0, cache_bytes=500)
+        for i in range(20):
+            memory.create(f'k{i}', {'body': 'x' * 100, 'n': 0, 'tag': i})
+        for n in range(1, 4):
+            memory.update_many({f'k{i}': {'body': 'x' * 100, 'n': n, 'tag': i} for i in range(20)})
+        memory.delete('k3')
+
+        assert not any(isinstance(tip[0], dict) for tip in memory.versions._tips.values())
+        assert not memory.data.superseded
+        assert len(memory.versions._pending) > 0
+        memory.flush()
+        assert not memory.versions._pending
+
+        history = memory.get_version_history('k0')
+        assert [item['value']['n'] for item in history] == [0, 1, 2, 3]
+        records = [memory.versions._load('k0', entry) for entry in memory.versions.entries['k0']]
+        assert ['delta' in record for record in records] == [False, True, True, True]
+        assert memory.get_version_history('k3')[-1]['action'] == 'deleted'
+        assert memory.get_version_history('k3')[-1]['value']['n'] == 3
+        memory.close()
+
+        reloaded = AdvancedMemorySystem(str(tmp_path), persistence='wal', cache_bytes=500)
+        assert [item['value']['n'] for item in reloaded.get_version_history('k5')] == [0, 1, 2, 3]
+        reloaded.close()
+
+    print("✓ Tiered version tips test passed")
+
+
+def test_switching_between_tiered_and_resident():
+    """Test stores convert in both directions and in wal mode"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        resident = AdvancedMemorySystem(str(tmp_path))
+        resident.create('k1', 'one')
+        resident.create('k2', [1, 2])
+
+        tiered = AdvancedMemorySystem(str(tmp_path), cache_bytes=10)
+        assert tiered.read('k2') == [1, 2]
+        tiered.create('k3', 'three')
+        tiered.close()
+        assert list(tmp_path.glob('values-*.log'))
+
+        back = AdvancedMemorySystem(str(tmp_path))
+        assert isinstance(back.data, dict)
+        assert back.data == {'k1': 'one', 'k2': [1, 2], 'k3': 'three'}
+        back.save_to_disk()
+        assert not list(tmp_path.glob('values-*.log'))
+
+        wal_dir = tmp_path / 'wal'
+        memory = AdvancedMemorySystem(str(wal_dir), persistence='wal', cache_bytes=64,
+                                      compact_every=3, background_compaction=False)
+        for i in range(5):
+            memory.create(f'k{i}', f'value {i}')
+        memory.close()
+
+        reloaded = AdvancedMemorySystem(str(wal_dir), persistence='wal', cache_bytes=64)
+        assert [reloaded.read(f'k{i}') for i in range(5)] == [f'value {i}' for i in range(5)]
+        reloaded.close()
+
+    print("✓ Tiered conversion test passed")
+
+
+if __name__ == '__main__':
+    print("Running Advanced Memory System Unit Tests...")
+    test_snapshot_persistence_roundtrip()
+    test_wal_replay_without_compaction()
+    test_wal_compaction_and_tail()
+    test_wal_ignores_torn_record()
+    test_every_n_durability_defers_snapshot()
+    test_batch_flushes_once_on_exit()
+    test_manual_durability_in_wal_mode()
+    test_bulk_operations()
+    test_bulk_operations_single_wal_record()
+    test_bm25_ranking()
+    test_legacy_set_index_is_rebuilt()
+    test_update_reindexes_only_changed_terms()
+    test_restore_version_reindexes()
+    test_index_segment_roundtrip()
+    test_segment_backed_search_after_restart()
+    test_wal_compaction_writes_index_segment()
+    test_version_deltas_reconstruct_history()
+    test_version_retention_by_count()
+    test_version_retention_by_age()
+    test_inline_version_history_is_imported()
+    test_unreferenced_version_records_are_discarded()
+    test_eviction_policies()
+    test_tiered_values_page_from_disk()
+    test_tiered_lfu_keeps_hot_values()
+    test_tiered_versions_read_previous_value_from_log()
+    test_switching_between_tiered_and_resident()
+    print("\nAll Advanced Memory System tests passed!")
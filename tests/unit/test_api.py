@@ -111,6 +111,26 @@ def test_memory_create_endpoint():
     print("✓ Memory create endpoint test passed")
 
 
+def test_memory_create_ttl():
+    """Test POST /memory coerces the ttl and rejects invalid ones"""
+    cis = CIS()
+    cis.boot()
+    api = API(cis)
+    memory = cis.get_memory()
+    
+    response = api.handle_request('POST', '/memory', {'key': 'ttlkey', 'value': 1, 'ttl': '5'})
+    assert response['code'] == 200
+    assert 0 < memory.get_ttl('ttlkey') <= 5
+    
+    for ttl in (0, -1, 'soon', [5]):
+        response = api.handle_request('POST', '/memory', {'key': 'badttl', 'value': 1, 'ttl': ttl})
+        assert response['status'] == 'error'
+        assert response['code'] == 400
+    assert memory.exists('badttl') is False
+    
+    print("✓ Memory create ttl test passed")
+
+
 def test_memory_read_endpoint():
     """Test memory read endpoint (GET /memory/{key})"""
     cis = CIS()
@@ -197,6 +217,16 @@ def test_memory_list_endpoint():
     assert 'k2' in response['data']['keys']
     assert response['data']['count'] == 2
     
+    # Prefix scan with pagination
+    api.handle_request('POST', '/memory', {'key': 'session:1', 'value': 'a'})
+    api.handle_request('POST', '/memory', {'key': 'session:2', 'value': 'b'})
+    response = api.handle_request('GET', '/memory?prefix=session:&limit=1')
+    assert response['data']['keys'] == ['session:1']
+    cursor = response['data']['cursor']
+    response = api.handle_request('GET', f'/memory?prefix=session:&limit=1&cursor={cursor}')
+    assert response['data']['keys'] == ['session:2']
+    assert response['data']['cursor'] is None
+    
     print("✓ Memory list endpoint test passed")
 
 
@@ -295,6 +325,7 @@ if __name__ == '__main__':
     test_boot_endpoint()
     test_shutdown_endpoint()
     test_memory_create_endpoint()
+    test_memory_create_ttl()
     test_memory_read_endpoint()
     test_memory_update_endpoint()
     test_memory_delete_endpoint()
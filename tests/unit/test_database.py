@@ -0,0 +1,672 @@
+"""
+Thalos Prime v1.0 - Unit Tests for Database Connection Management
+
+Tests for the thread-safe connection pool and DatabaseManager
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import asyncio
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from core.exceptions import PoolTimeoutError, QueryError, ResourceError
+from database.async_pool import AsyncConnectionPool, AsyncDatabaseManager
+from database.connection_manager import ConnectionPool, DatabaseManager
+
+
+class FakeConnection:
+    """Connection stub with an id and a closed flag"""
+
+    count = 0
+
+    def __init__(self):
+        FakeConnection.count += 1
+        self.id = FakeConnection.count
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_blocks_then_times_out():
+    """Test an exhausted pool queues callers and raises PoolTimeoutError"""
+    pool = ConnectionPool(FakeConnection, max_conn=1, min_conn=0, health_check_interval=None)
+    conn = pool.get_connection()
+
+    start = time.monotonic()
+    try:
+        pool.get_connection(timeout=0.05)
+        assert False, "exhausted pool handed out a connection"
+    except PoolTimeoutError as e:
+        assert isinstance(e, ResourceError)
+    assert time.monotonic() - start >= 0.05
+    assert pool.get_statistics()['total_timeouts'] == 1
+
+    # A waiter is woken by the return
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(pool.get_connection(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    assert pool.get_statistics()['waiting_requests'] == 1
+    pool.return_connection(conn)
+    waiter.join()
+    assert result == [conn]
+
+    pool.close_all()
+    try:
+        pool.get_connection()
+        assert False, "closed pool handed out a connection"
+    except ResourceError:
+        pass
+
+    print("✓ Pool blocking test passed")
+
+
+def test_pool_concurrent_checkout():
+    """Test no connection is ever handed to two threads at once"""
+    pool = ConnectionPool(FakeConnection, max_conn=4, min_conn=2, health_check_interval=None)
+    holders = {}
+    errors = []
+
+    def worker():
+        for _ in range(200):
+            conn = pool.get_connection(timeout=5)
+            if holders.setdefault(conn.id, threading.get_ident()) != threading.get_ident():
+                errors.append(conn.id)
+            del holders[conn.id]
+            pool.return_connection(conn)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.get_statistics()
+    assert not errors
+    assert stats['in_use_connections'] == 0
+    assert stats['total_connections'] <= 4 and stats['total_created'] <= 4
+    pool.close_all()
+
+    print("✓ Pool concurrency test passed")
+
+
+def test_pool_health_checks_and_reconnection():
+    """Test stale and broken connections are replaced on checkout and in the background"""
+    pool = ConnectionPool(FakeConnection, max_conn=3, min_conn=1, max_idle_time=0.05,
+                          max_lifetime=None, health_check_interval=None)
+    conn = pool.get_connection()
+    conn.closed = True  # the server dropped it while in use
+    pool.return_connection(conn)
+
+    replacement = pool.get_connection()
+    assert replacement is not conn and not replacement.closed
+    stats = pool.get_statistics()
+    assert stats['total_validation_failures'] == 1
+    assert stats['total_reconnections'] == 1
+    pool.return_connection(replacement)
+
+    time.sleep(0.1)
+    idle = list(pool._idle)
+    pool.maintain()  # retires idle connections, reopens min_conn
+    assert all(record.conn.closed for record in idle)
+    stats = pool.get_statistics()
+    assert stats['available_connections'] == 1 and stats['total_connections'] == 1
+    pool.close_all()
+
+    # Connections that fail to open are retried, and reopened by the maintenance thread
+    failures = [True, True]
+
+    def flaky():
+        if failures and failures.pop():
+            raise OSError("connection refused")
+        return FakeConnection()
+
+    pool = ConnectionPool(flaky, max_conn=2, min_conn=1, max_retries=1, retry_delay=0,
+                          health_check_interval=0.01)
+    assert pool.get_statistics()['total_connections'] == 0
+    deadline = time.monotonic() + 2
+    while pool.get_statistics()['available_connections'] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.get_statistics()['total_reconnections'] >= 1
+    pool.close_all()
+
+    print("✓ Pool health check test passed")
+
+
+def test_database_manager_pool_config():
+    """Test DatabaseManager passes pool settings through"""
+    db = DatabaseManager(db_type="memory", config={"max_connections": 1, "pool_timeout": 0.01})
+    with db.get_connection() as conn:
+        conn['data']['key'] = 'value'
+        try:
+            with db.get_connection():
+                assert False, "second connection exceeded max_connections"
+        except PoolTimeoutError:
+            pass
+    with db.get_connection() as conn:
+        assert conn['data']['key'] == 'value'
+    assert db.get_statistics()['pool']['max_connections'] == 1
+    db.close()
+
+    print("✓ Database manager pool config test passed")
+
+
+def test_query_execution():
+    """Test statements, parameters, the statement cache and streaming cursors"""
+    db = DatabaseManager(config={"statement_cache_size": 2})
+    cursor = db.executemany("PUT ? ?", [
+        (f'chat_{i}', {'n': i, 'meta': {'intent': 'greet' if i % 2 else 'ask'},
+                       'topics': ['ai'] if i % 3 == 0 else []})
+        for i in range(10)
+    ])
+    assert cursor.rowcount == 10
+    db.execute("PUT 'other' 1")
+
+    assert db.execute("COUNT").scalar() == 11
+    assert db.execute("COUNT WHERE key PREFIX ?", ('chat_',)).scalar() == 10
+    rows = db.execute("SELECT key, n WHERE meta.intent = :intent AND topics CONTAINS 'ai'",
+                      {'intent': 'greet'}).fetchall()
+    assert sorted(rows) == [('chat_3', 3), ('chat_9', 9)]
+    assert db.execute("SELECT value.missing WHERE key = 'other'").fetchall() == [(None,)]
+
+    assert db.execute("INSERT 'other' 2").rowcount == 0
+    assert db.execute("GET 'other'").fetchone() == ('other', 1)
+    assert db.execute("DELETE ?", ('other',)).rowcount == 1
+    assert db.execute("GET 'other'").fetchone() is None
+
+    # Rows stream: a cursor holds no connection and yields lazily
+    cursor = db.execute("SELECT * WHERE key PREFIX 'chat_' LIMIT 4")
+    assert db.get_statistics()['pool']['in_use_connections'] == 0
+    assert len(cursor.fetchmany(3)) == 3 and len(cursor.fetchall()) == 1
+    assert cursor.fetchone() is None
+
+    stats = db.get_statistics()['statements']
+    assert stats['size'] == 2 and stats['capacity'] == 2
+    db.execute("SELECT * WHERE key PREFIX 'chat_' LIMIT 4")
+    assert db.get_statistics()['statements']['hits'] == stats['hits'] + 1
+
+    for query, params in [("DROP TABLE", None), ("PUT ?", ('k',)), ("GET ?", ()),
+                          ("SELECT * WHERE n PREFIX 'x'", None), ("COUNT WHERE n = :n", {}),
+                          ("SELECT * LIMIT ?", (-1,))]:
+        try:
+            db.execute(query, params).fetchall()
+            assert False, f"accepted {query!r}"
+        except QueryError:
+            pass
+    try:
+        db.executemany("SELECT *", [()])
+        assert False, "executemany accepted a read"
+    except QueryError:
+        pass
+    db.close()
+
+    print("✓ Query execution test passed")
+
+
+def test_statement_cache_concurrent_prepare():
+    """Test the statement cache keeps consistent counters across threads"""
+    from database.query import StatementCache
+
+    cache = StatementCache(capacity=4)
+    queries = [f"GET 'k{i}'" for i in range(8)]
+
+    def worker():
+        for _ in range(200):
+            for query in queries:
+                cache.prepare(query)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.get_statistics()
+    assert stats['size'] == 4
+    assert stats['hits'] + stats['misses'] == 8 * 200 * len(queries)
+
+    print("✓ Statement cache concurrency test passed")
+
+
+def test_latency_statistics():
+    """Test pool wait/hold histograms, query percentiles and the slow-query log"""
+    from database.metrics import LatencyHistogram
+
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000.0)
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 100 and snapshot['max_ms'] == 100
+    assert 25 <= snapshot['p50_ms'] <= 50
+    assert 50 <= snapshot['p95_ms'] <= snapshot['p99_ms'] <= 100
+    assert sum(snapshot['buckets'].values()) == 100
+
+    db = DatabaseManager(config={"max_connections": 1, "pool_timeout": 5,
+                                 "slow_query_threshold": 0.02})
+    with db.get_connection():
+        waiter = threading.Thread(target=lambda: db.execute("COUNT").fetchall())
+        waiter.start()
+        time.sleep(0.05)
+    waiter.join()
+
+    db.executemany("PUT ? ?", [(f'k{i}', i) for i in range(50)])
+    for i in range(50):
+        db.execute("GET ?", (f'k{i}',)).fetchone()
+    cursor = db.execute("SELECT * WHERE key PREFIX 'k'")
+    cursor.fetchone()
+    assert 'SELECT' not in db.get_statistics()['queries']['by_statement']
+    cursor.close()  # streamed queries are recorded once finished
+
+    # A slow streaming query: time spent producing rows counts
+    class SlowStore(dict):
+        def get(self, key, default=None):
+            time.sleep(0.03)
+            return dict.get(self, key, default)
+
+    db._run(db.statements.prepare("SELECT *"), SlowStore(a=1), None).fetchall()
+    try:
+        db.execute("SELECT * LIMIT")
+    except QueryError:
+        pass
+
+    stats = db.get_statistics()
+    pool = stats['pool']
+    assert pool['total_exhausted'] == 1
+    assert pool['wait_time']['count'] == 54 and pool['wait_time']['max_ms'] >= 40
+    assert pool['hold_time']['count'] == 54 and pool['hold_time']['max_ms'] >= 40
+
+    queries = stats['queries']
+    assert queries['count'] == 54 and queries['total_errors'] == 1
+    assert queries['by_statement']['GET']['count'] == 50
+    assert queries['by_statement']['SELECT']['count'] == 2
+    assert queries['p50_ms'] <= queries['p95_ms'] <= queries['p99_ms'] <= queries['max_ms']
+    assert [entry['query'] for entry in queries['slow_queries']] == ["SELECT *"]
+    assert queries['total_slow'] == 1
+    db.close()
+
+    print("✓ Latency statistics test passed")
+
+
+def test_secondary_indexes():
+    """Test hash and inverted indexes stay current and are used by queries"""
+    db = DatabaseManager(config={"indexes": {"wetware_data.intent": "hash"}})
+    db.executemany("PUT ? ?", [
+        (f'chat_{i}', {'action_executed': 'search' if i % 4 == 0 else None,
+                       'wetware_data': {'intent': ['greet', 'ask', 'command'][i % 3],
+                                        'topics': ['ai', 'bio'][:i % 3]}})
+        for i in range(30)
+    ])
+    db.execute("PUT 'note' ?", ({'wetware_data': {'topics': 'free text about ai'}},))
+    db.create_index("wetware_data.topics", "inverted")  # backfilled
+    db.create_index("action_executed")
+
+    def select(query, params=None):
+        cursor = db.execute(query, params)
+        return [key for key, _ in cursor], cursor.plan
+
+    keys, plan = select("SELECT * WHERE wetware_data.intent = 'ask'")
+    assert plan == {'access': 'index', 'index': 'wetware_data.intent', 'candidates': 10}
+    assert keys == sorted(f'chat_{i}' for i in range(30) if i % 3 == 1)
+
+    # Membership uses the inverted index; string fields are still checked
+    keys, plan = select("SELECT * WHERE wetware_data.topics CONTAINS 'ai'")
+    assert plan['access'] == 'index' and plan['candidates'] == 21
+    assert len(keys) == 21 and 'note' in keys
+
+    # The narrowest index wins; every condition is still applied
+    keys, plan = select("SELECT * WHERE wetware_data.topics CONTAINS ? "
+                        "AND action_executed = ?", ('bio', 'search'))
+    assert plan['index'] == 'action_executed'
+    assert keys == ['chat_20', 'chat_8']
+
+    # Unindexed filters fall back to a scan
+    keys, plan = select("SELECT * WHERE wetware_data.intent != 'ask'")
+    assert plan['access'] == 'scan' and len(keys) == 21
+
+    # Writes through the connection keep the indexes current
+    with db.get_connection() as conn:
+        conn['data']['chat_1'] = {'wetware_data': {'intent': 'greet', 'topics': []}}
+        del conn['data']['chat_4']
+    assert db.execute("COUNT WHERE wetware_data.intent = 'ask'").scalar() == 8
+    assert db.execute("COUNT WHERE wetware_data.intent = 'greet'").scalar() == 11
+    assert 'chat_1' not in select("SELECT * WHERE wetware_data.topics CONTAINS 'ai'")[0]
+
+    # Iteration works on a snapshot of the keys, so writes can interleave
+    with db.get_connection() as conn:
+        keys = iter(conn['data'])
+        conn['data']['chat_30'] = {'wetware_data': {'intent': 'ask'}}
+        assert 'chat_30' not in list(keys)
+
+    stats = db.get_statistics()['indexes']
+    assert stats['indexes']['wetware_data.topics']['type'] == 'inverted'
+    assert stats['indexes']['wetware_data.topics']['unindexed_records'] == 1
+    assert stats['index_lookups'] == 6 and stats['full_scans'] == 1
+    db.close()
+
+    print("✓ Secondary index test passed")
+
+
+def test_interaction_log_ring_buffer():
+    """Test ids stay unique across threads and memory stays bounded"""
+    from database.interaction_log import InteractionLog
+
+    log = InteractionLog(capacity=50)
+    ids = []
+
+    def writer(name):
+        for i in range(100):
+            ids.append(log.append({'message': f'{name}-{i}'})['id'])
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(ids) == list(range(1, 401))
+    stats = log.get_statistics()
+    assert stats['in_memory'] == 50 and stats['total_dropped'] == 350
+    assert len(log) == 50 and log.next_id() == 401
+
+    recent = log.last(10)
+    assert [entry['id'] for entry in recent] == list(range(391, 401))
+    assert len(log.last(1000)) == 50
+    assert log.get(400)['id'] == 400 and log.get(1) is None
+
+    timestamps = [entry['timestamp'] for entry in log.last(50)]
+    assert timestamps == sorted(timestamps)
+    window = list(log.range(timestamps[10], timestamps[20]))
+    assert all(timestamps[10] <= entry['timestamp'] < timestamps[20] for entry in window)
+    assert len(list(log.range(limit=5))) == 5
+
+    print("✓ Interaction log ring buffer test passed")
+
+
+def test_interaction_log_spills_to_disk():
+    """Test older turns are read back from segments, also after a restart"""
+    from database.interaction_log import InteractionLog
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        log = InteractionLog(capacity=10, directory=str(tmp_path), segment_entries=25)
+        entries = [log.append({'n': i}) for i in range(100)]
+        assert log.get_statistics()['segments'] == 4 and len(log) == 100
+
+        assert [entry['n'] for entry in log.last(30)] == list(range(70, 100))
+        assert log.get(5)['n'] == 4
+        middle = list(log.range(entries[20]['timestamp'], entries[60]['timestamp']))
+        assert [entry['id'] for entry in middle] == [entry['id'] for entry in entries
+                                                      if entries[20]['timestamp'] <= entry['timestamp']
+                                                      < entries[60]['timestamp']]
+        assert [entry['n'] for entry in log.range()] == list(range(100))
+        log.close()
+
+        # A torn final line is skipped and numbering continues
+        newest = sorted(tmp_path.glob('interactions-*.jsonl'))[-1]
+        with open(newest, 'a') as f:
+            f.write('{"n": "torn')
+
+        log = InteractionLog(capacity=10, directory=str(tmp_path), segment_entries=25,
+                             max_segments=3)
+        assert [entry['n'] for entry in log.last(3)] == [97, 98, 99]
+        assert log.append({'n': 100})['id'] == 101
+        assert [entry['n'] for entry in log.last(2)] == [99, 100]
+
+        for i in range(101, 130):
+            log.append({'n': i})
+        assert len(list(tmp_path.glob('interactions-*.jsonl'))) == 3
+        assert log.get(60) is None and log.get(80)['n'] == 79
+        log.close()
+
+    print("✓ Interaction log spill test passed")
+
+
+def test_async_pool_fifo_and_timeout():
+    """Test async waiters are served in arrival order and time out cleanly"""
+    async def scenario():
+        pool = AsyncConnectionPool(FakeConnection, max_conn=1, min_conn=0,
+                                   health_check_interval=None)
+        conn = await pool.get_connection()
+        order = []
+
+        async def waiter(name):
+            async with pool.connection(timeout=5) as got:
+                order.append((name, got))
+                await asyncio.sleep(0)
+
+        tasks = [asyncio.ensure_future(waiter(i)) for i in range(5)]
+        await asyncio.sleep(0.01)
+        assert pool.get_statistics()['waiting_requests'] == 5
+        await pool.return_connection(conn)
+        await asyncio.gather(*tasks)
+        assert order == [(i, conn) for i in range(5)]
+
+        conn = await pool.get_connection()
+        try:
+            await pool.get_connection(timeout=0.02)
+            assert False, "exhausted pool handed out a connection"
+        except PoolTimeoutError:
+            pass
+        stats = pool.get_statistics()
+        assert stats['total_timeouts'] == 1 and stats['waiting_requests'] == 0
+        assert stats['total_created'] == 1
+        await pool.close_all()
+
+    asyncio.run(scenario())
+
+    print("✓ Async pool FIFO test passed")
+
+
+def test_async_pool_cancellation_safe():
+    """Test cancelled waiters neither leak connections nor lose their turn to others"""
+    async def scenario():
+        pool = AsyncConnectionPool(FakeConnection, max_conn=2, min_conn=0,
+                                   health_check_interval=None)
+        held = [await pool.get_connection(), await pool.get_connection()]
+
+        cancelled = asyncio.ensure_future(pool.get_connection())
+        patient = asyncio.ensure_future(pool.get_connection())
+        await asyncio.sleep(0.01)
+
+        # Return a connection, then cancel the waiter it was handed to
+        await pool.return_connection(held.pop())
+        cancelled.cancel()
+        got = await patient
+        assert cancelled.cancelled()
+
+        await pool.return_connection(got)
+        await pool.return_connection(held.pop())
+        stats = pool.get_statistics()
+        assert stats['in_use_connections'] == 0 and stats['available_connections'] == 2
+
+        # A task cancelled inside the block still returns its connection
+        async def worker():
+            async with pool.connection():
+                await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(worker())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert pool.get_statistics()['in_use_connections'] == 0
+        await pool.close_all()
+
+    asyncio.run(scenario())
+
+    print("✓ Async pool cancellation test passed")
+
+
+def test_async_database_manager():
+    """Test AsyncDatabaseManager mirrors DatabaseManager"""
+    async def scenario():
+        db = AsyncDatabaseManager(db_type="memory", config={"max_connections": 2,
+                                                            "statement_cache_size": 8})
+        assert isinstance(db.pool, AsyncConnectionPool) and db.pool.max_connections == 2
+        assert db.statements.capacity == 8
+        async with db.connection() as conn:
+            conn['data']['key'] = 'value'
+        async with db.get_connection() as conn:
+            assert conn['data']['key'] == 'value'
+        assert (await db.executemany("PUT ? ?", [('a', 1), ('b', 2)])).rowcount == 2
+        assert (await db.execute("COUNT")).scalar() == 3
+
+        stats = db.get_statistics()
+        sync_db = DatabaseManager()
+        assert set(stats['pool']) == set(sync_db.get_statistics()['pool'])
+        sync_db.close()
+        assert stats['pool']['in_use_connections'] == 0
+        await db.close()
+
+    asyncio.run(scenario())
+
+    print("✓ Async database manager test passed")
+
+
+def test_file_store_persistence():
+    """Test FileStore survives reopen, including deletes and a torn tail"""
+    from database.file_store import FileStore
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        store = FileStore(str(tmp_path), sync_interval=None)
+        for i in range(100):
+            store[f'key{i}'] = {'n': i}
+        store['key0'] = 'overwritten'
+        del store['key1']
+        store.close()
+
+        segment = next(tmp_path.glob('segment-*.log'))
+        with open(segment, 'ab') as f:
+            f.write(b'\x01\x02\x03 torn record')
+
+        store = FileStore(str(tmp_path), sync_interval=None)
+        assert len(store) == 99
+        assert store['key0'] == 'overwritten' and store['key99'] == {'n': 99}
+        assert 'key1' not in store
+        store['after'] = 1  # appended after the truncated tail
+        store.close()
+        assert FileStore(str(tmp_path), sync_interval=None)['after'] == 1
+
+    print("✓ File store persistence test passed")
+
+
+def test_file_store_merge():
+    """Test merging closed segments reclaims space and keeps the latest values"""
+    from database.file_store import FileStore
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        store = FileStore(str(tmp_path), max_segment_bytes=4096, sync_interval=None,
+                          merge_min_bytes=0)
+        for round_number in range(20):
+            for i in range(50):
+                store[f'key{i}'] = round_number
+        for i in range(40, 50):
+            del store[f'key{i}']
+        before = store.get_statistics()
+        assert store.needs_merge()
+
+        assert store.merge()
+        after = store.get_statistics()
+        assert after['total_bytes'] < before['total_bytes'] / 5
+        assert after['segments'] == 2  # merged + active
+        assert all(store[f'key{i}'] == 19 for i in range(40))
+        store.close()
+
+        reopened = FileStore(str(tmp_path), sync_interval=None)
+        assert len(reopened) == 40 and reopened['key0'] == 19
+        reopened.close()
+
+    print("✓ File store merge test passed")
+
+
+def test_file_store_interrupted_merge():
+    """Test recovery completes a merge that crashed after the swap"""
+    from database.file_store import FileStore
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        store = FileStore(str(tmp_path), max_segment_bytes=256, sync_interval=None)
+        store['doomed'] = 'x' * 200
+        store['kept'] = 'y' * 200
+        del store['doomed']  # the tombstone lands in the newest closed segment
+        store['filler'] = 'z' * 200
+        store.flush()
+        closed = sorted(tmp_path.glob('segment-*.log'))[:-1]
+
+        # Simulate a crash between the swap and deleting the older inputs
+        original_remove = os.remove
+
+        def crash(path):
+            if path.endswith('.log'):
+                raise KeyboardInterrupt("crash")
+            original_remove(path)
+
+        os.remove = crash
+        try:
+            store.merge()
+            assert False, "merge did not crash"
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove = original_remove
+        assert closed[0].exists() and (tmp_path / 'merge.pending').exists()
+        store._stop.set()
+
+        recovered = FileStore(str(tmp_path), sync_interval=None)
+        assert 'doomed' not in recovered  # not resurrected by an old segment
+        assert recovered['kept'] == 'y' * 200 and recovered['filler'] == 'z' * 200
+        assert not (tmp_path / 'merge.pending').exists()
+        recovered.close()
+
+    print("✓ File store interrupted merge test passed")
+
+
+def test_database_manager_file_backend():
+    """Test db_type="file" persists through the connection interface"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        config = {"path": str(tmp_path / "db"), "sync_every": 1}
+        db = DatabaseManager(db_type="file", config=config)
+        with db.get_connection() as conn:
+            conn['data'][f'chat_{len(conn["data"])}'] = {'message': 'hello'}
+            conn['data'][f'chat_{len(conn["data"])}'] = {'message': 'again'}
+        assert db.execute("GET 'chat_0'").fetchone() == ('chat_0', {'message': 'hello'})
+        assert db.get_statistics()['store']['keys'] == 2
+        db.close()
+
+        db = DatabaseManager(db_type="file", config=config)
+        with db.get_connection() as conn:
+            assert conn['data']['chat_1'] == {'message': 'again'}
+            assert len(conn['data']) == 2
+        db.close()
+
+    print("✓ Database manager file backend test passed")
+
+
+if __name__ == '__main__':
+    print("Running Database Unit Tests...")
+    test_pool_blocks_then_times_out()
+    test_pool_concurrent_checkout()
+    test_pool_health_checks_and_reconnection()
+    test_database_manager_pool_config()
+    test_query_execution()
+    test_statement_cache_concurrent_prepare()
+    test_latency_statistics()
+    test_secondary_indexes()
+    test_interaction_log_ring_buffer()
+    test_interaction_log_spills_to_disk()
+    test_async_pool_fifo_and_timeout()
+    test_async_pool_cancellation_safe()
+    test_async_database_manager()
+    test_file_store_persistence()
+    test_file_store_merge()
+    test_file_store_interrupted_merge()
+    test_database_manager_file_backend()
+    print("\nAll Database tests passed!")
@@ -6,6 +6,8 @@ Tests for deterministic in-memory storage with explicit CRUD operations
 
 import sys
 import os
+import tempfile
+from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from core.memory import MemoryModule
@@ -248,6 +250,410 @@ def test_persistence():
             os.remove(temp_path)
 
 
+def test_sqlite_backend():
+    """Test the SQLite backend stores one row per key and persists commits"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        path = str(tmp_path / 'memory.sqlite3')
+        memory = MemoryModule(persistence_path=path, backend='sqlite')
+        assert memory.operate()['storage_backend'] == 'sqlite'
+        
+        assert memory.create('key1', {'nested': [1, 2]}) is True
+        assert memory.create('key1', 'other') is False
+        assert memory.update('key1', {'nested': [3]}) is True
+        assert memory.update('missing', 'value') is False
+        with memory.storage.batch():
+            for i in range(10):
+                memory.create(f'bulk{i}', i)
+        assert memory.delete('bulk0') is True
+        assert memory.delete('bulk0') is False
+        assert memory.save_to_disk() is True
+        memory.storage.close()
+        
+        reopened = MemoryModule(persistence_path=path, backend='sqlite')
+        assert reopened.read('key1') == {'nested': [3]}
+        assert reopened.count() == 10
+        assert sorted(reopened.list_keys())[:2] == ['bulk1', 'bulk2']
+        assert reopened.checkpoint()['data']['bulk9'] == 9
+    
+    print("✓ SQLite backend test passed")
+
+
+def test_backend_selected_from_config():
+    """Test [memory] storage_type and path select the backend"""
+    from core.config import Config
+    from core.memory.backends import JSONBackend, SQLiteBackend
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        config = Config()
+        config.set('memory', 'storage_type', 'sqlite')
+        config.set('memory', 'path', str(tmp_path / 'configured.sqlite3'))
+        memory = MemoryModule(config=config)
+        assert isinstance(memory.storage, SQLiteBackend)
+        assert memory.initialize() and memory.validate()
+        
+        default = MemoryModule(persistence_path=str(tmp_path / 'legacy.json'), config=Config())
+        assert isinstance(default.storage, JSONBackend)
+        
+        config.set('memory', 'storage_type', 'lmdb')
+        try:
+            MemoryModule(config=config)
+            assert False, "unknown storage type accepted"
+        except ValueError:
+            pass
+    
+    print("✓ Backend selection test passed")
+
+
+def test_save_is_atomic():
+    """Test a failed save leaves the previous file intact"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        path = str(tmp_path / 'memory.json')
+        memory = MemoryModule(persistence_path=path)
+        memory.create('key1', 'value1')
+        assert memory.save_to_disk() is True
+        with open(path) as f:
+            assert f.read() == '{"key1":"value1"}'
+        
+        memory.create('key2', object())  # not JSON serialisable
+        assert memory.save_to_disk() is False
+        assert os.listdir(tmp_path) == ['memory.json']
+        assert MemoryModule(persistence_path=path).list_keys() == ['key1']
+    
+    print("✓ Atomic save test passed")
+
+
+def test_compressed_checkpoint():
+    """Test gzip snapshots round-trip and checkpoint returns plain data"""
+    import gzip
+    import json
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        path = str(tmp_path / 'memory.json.gz')
+        memory = MemoryModule(persistence_path=path)
+        for i in range(100):
+            memory.create(f'key{i}', {'payload': 'x' * 50})
+        
+        state = memory.checkpoint()
+        assert state['item_count'] == 100
+        assert state['data']['key5'] == {'payload': 'x' * 50}
+        assert json.loads(json.dumps(state))['data'] == state['data']
+        state['data']['key5'] = 'changed'
+        assert memory.read('key5') == {'payload': 'x' * 50}
+        assert memory.operate()['active_snapshots'] == 0
+        
+        with open(path, 'rb') as f:
+            compressed = f.read()
+        assert compressed[:2] == b'\x1f\x8b'
+        assert len(compressed) < len(gzip.decompress(compressed))
+        assert MemoryModule(persistence_path=path).count() == 100
+    
+    print("✓ Compressed checkpoint test passed")
+
+
+def test_snapshot_isolation():
+    """Test snapshots keep their version while writers continue"""
+    memory = MemoryModule()
+    memory.create('a', 1)
+    memory.create('b', 2)
+    
+    with memory.snapshot() as view:
+        memory.update('a', 10)
+        memory.delete('b')
+        memory.create('c', 3)
+        assert dict(view.items()) == {'a': 1, 'b': 2}
+        assert 'c' not in view and view['b'] == 2 and len(view) == 2
+        
+        with memory.snapshot() as later:
+            memory.clear()
+            assert dict(later.items()) == {'a': 10, 'c': 3}
+            assert dict(view.items()) == {'a': 1, 'b': 2}
+        assert memory.count() == 0
+    
+    status = memory.operate()
+    assert status['active_snapshots'] == 0
+    assert status['undo_entries'] == 0
+    
+    print("✓ Snapshot isolation test passed")
+
+
+def test_snapshot_reclamation():
+    """Test undo entries are kept only while a snapshot needs them"""
+    memory = MemoryModule()
+    for i in range(10):
+        memory.create(f'key{i}', i)
+        memory.update(f'key{i}', i + 1)
+    assert memory.operate()['undo_entries'] == 0
+    
+    old = memory.snapshot()
+    newer = memory.snapshot()
+    memory.update('key0', 'changed')
+    newer.close()
+    assert memory.operate()['undo_entries'] == 1
+    assert old['key0'] == 1
+    
+    del old  # unreachable snapshots release their version
+    assert memory.operate()['undo_entries'] == 0
+    
+    # Repeated writes to one key keep a single pre-image per pin
+    with memory.snapshot() as view:
+        for i in range(1000):
+            memory.update('key1', i)
+        assert memory.operate()['undo_entries'] == 1
+        with memory.snapshot() as later:
+            memory.update('key1', 'again')
+            memory.update('key1', 'and again')
+            assert memory.operate()['undo_entries'] == 2
+            assert later['key1'] == 999
+        assert view['key1'] == 2
+    assert memory.operate()['undo_entries'] == 0
+    
+    print("✓ Snapshot reclamation test passed")
+
+
+def test_checkpoint_during_concurrent_writes():
+    """Test checkpoint streams a consistent view while a writer runs"""
+    import threading
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        path = str(tmp_path / 'memory.json')
+        memory = MemoryModule(persistence_path=path)
+        for i in range(2000):
+            memory.create(f'key{i}', i)
+        
+        stop = threading.Event()
+        
+        def writer():
+            i = 0
+            while not stop.is_set():
+                memory.create(f'new{i}', i)
+                memory.update(f'key{i % 2000}', -i)
+                i += 1
+        
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            state = memory.checkpoint()
+            items = state['data']
+            created = sorted(int(key[3:]) for key in items if key.startswith('new'))
+            assert created == list(range(len(created)))  # a single point in time
+            assert state['item_count'] == len(items)
+            assert memory.operate()['active_snapshots'] == 0
+        finally:
+            stop.set()
+            thread.join()
+        
+        assert MemoryModule(persistence_path=path).count() >= 2000
+    
+    print("✓ Concurrent checkpoint test passed")
+
+
+
+def test_ttl_expiry():
+    """Test keys expire lazily on read and in the background sweeper"""
+    import time
+    
+    memory = MemoryModule()
+    memory.create('short', 1, ttl=0.05)
+    memory.create('lazy', 2, ttl=0.05)
+    memory.create('forever', 3)
+    assert memory.read('short') == 1
+    assert 0 < memory.get_ttl('short') <= 0.05
+    assert memory.get_ttl('forever') is None
+    
+    with memory.snapshot() as view:
+        time.sleep(0.1)
+        assert memory.read('lazy') is None  # lazy check, even before a sweep
+        assert not memory.exists('short')
+        assert view['short'] == 1  # snapshots keep the expired values
+    
+    deadline = time.monotonic() + 2
+    while memory.operate()['ttl_keys'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    status = memory.operate()
+    assert status['expirations'] == 2 and status['ttl_keys'] == 0
+    assert memory.list_keys() == ['forever']
+    assert memory._sweeper is None  # idle once no TTLs remain
+    
+    # Expired keys can be recreated; set_ttl(None) makes a key permanent
+    assert memory.create('short', 4, ttl=0.05)
+    assert memory.set_ttl('short', None)
+    time.sleep(0.1)
+    assert memory.read('short') == 4
+    assert not memory.set_ttl('missing', 1)
+    
+    # Invalid TTLs are rejected before anything is written
+    bounded = MemoryModule(max_items=2)
+    for ttl in (0, -1, '5', True, float('nan')):
+        for call in (lambda: bounded.create('bad', 1, ttl=ttl),
+                     lambda: bounded.update('short', 1, ttl=ttl)):
+            try:
+                call()
+                assert False, f"accepted ttl={ttl!r}"
+            except ValueError:
+                pass
+    assert not bounded.exists('bad')
+    for key in ('a', 'b', 'c'):
+        bounded.create(key, key)
+    assert bounded.list_keys() == ['b', 'c']
+    
+    print("✓ TTL expiry test passed")
+
+
+def test_capacity_eviction():
+    """Test the capacity limit evicts by LRU, LFU and FIFO order"""
+    def fill(policy):
+        memory = MemoryModule(max_items=3, eviction_policy=policy)
+        for key in ('a', 'b', 'c'):
+            memory.create(key, key)
+        memory.read('a')
+        memory.read('a')
+        memory.read('b')
+        memory.create('d', 'd')
+        return memory
+    
+    assert sorted(fill('lru').list_keys()) == ['a', 'b', 'd']
+    assert sorted(fill('lfu').list_keys()) == ['a', 'b', 'd']
+    fifo = fill('fifo')
+    assert sorted(fifo.list_keys()) == ['b', 'c', 'd']
+    
+    memory = fill('lru')
+    memory.read('c')  # evicted, does not resurrect
+    for i in range(10):
+        memory.create(f'extra{i}', i)
+    status = memory.operate()
+    assert status['item_count'] == 3
+    assert status['evictions'] == 11
+    
+    try:
+        MemoryModule(max_items=3, eviction_policy='random')
+        assert False, "unknown eviction policy accepted"
+    except ValueError:
+        pass
+    
+    print("✓ Capacity eviction test passed")
+
+
+def test_capacity_from_config():
+    """Test [memory] max_size applies to data reloaded from disk"""
+    from core.config import Config
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        path = str(tmp_path / 'memory.json')
+        memory = MemoryModule(persistence_path=path)
+        for i in range(10):
+            memory.create(f'key{i}', i)
+        memory.save_to_disk()
+        
+        config = Config()
+        config.set('memory', 'max_size', '4')
+        config.set('memory', 'eviction_policy', 'fifo')
+        config.set('memory', 'default_ttl', '60')
+        bounded = MemoryModule(persistence_path=path, config=config)
+        assert bounded.count() == 4
+        assert bounded.operate()['evictions'] == 6
+        
+        bounded.create('fresh', 1)
+        assert 0 < bounded.get_ttl('fresh') <= 60
+        bounded.terminate()
+    
+    print("✓ Capacity from config test passed")
+
+
+
+def test_scan_prefix_and_range():
+    """Test scan returns sorted keys by prefix or range on every backend"""
+    from core.memory.backends import SQLiteBackend
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite = SQLiteBackend(os.path.join(tmp, 'scan.sqlite3'))
+        for memory in (MemoryModule(), MemoryModule(backend=sqlite)):
+            for key in ('session:2:b', 'user:1', 'session:1:b', 'session:1:a',
+                        'session:10:a', 'sessions'):
+                memory.create(key, 1)
+            
+            keys, cursor = memory.scan(prefix='session:1:')
+            assert keys == ['session:1:a', 'session:1:b'] and cursor is None
+            assert memory.scan(prefix='session:')[0] == [
+                'session:10:a', 'session:1:a', 'session:1:b', 'session:2:b']
+            assert memory.scan(start='session:1:b', end='session:3')[0] == [
+                'session:1:b', 'session:2:b']
+            assert memory.scan(prefix='session:', start='session:2')[0] == ['session:2:b']
+            assert memory.scan()[0] == sorted(memory.list_keys())
+            
+            memory.delete('session:1:a')
+            memory.create('session:1:c', 1)
+            assert memory.scan(prefix='session:1:')[0] == ['session:1:b', 'session:1:c']
+            memory.clear()
+            assert memory.scan() == ([], None)
+        sqlite.close()
+    
+    print("✓ Scan prefix and range test passed")
+
+
+def test_scan_pagination_is_stable():
+    """Test cursors neither skip nor repeat keys across concurrent writes"""
+    memory = MemoryModule()
+    for i in range(0, 100, 2):
+        memory.create(f'k{i:03d}', i)
+    
+    seen = []
+    keys, cursor = memory.scan(prefix='k', limit=7)
+    seen.extend(keys)
+    while cursor:
+        # Inserts before the cursor are not returned; inserts after it are
+        memory.create(f'k{int(cursor[1:]) - 1:03d}', 'behind')
+        memory.create(f'k{int(cursor[1:]) + 1:03d}', 'ahead')
+        keys, cursor = memory.scan(prefix='k', limit=7, cursor=cursor)
+        assert len(keys) <= 7
+        seen.extend(keys)
+    
+    assert seen == sorted(set(seen))
+    assert set(f'k{i:03d}' for i in range(0, 100, 2)) <= set(seen)
+    assert not any(memory.read(key) == 'behind' for key in seen)
+    
+    try:
+        memory.scan(limit=0)
+        assert False, "non-positive limit accepted"
+    except ValueError:
+        pass
+    
+    print("✓ Scan pagination test passed")
+
+
+def test_sorted_key_index():
+    """Test the chunked sorted index against a sorted list"""
+    import random
+    from core.memory.key_index import SortedKeyIndex, prefix_upper_bound
+    
+    rng = random.Random(7)
+    index = SortedKeyIndex(chunk_size=4)
+    reference = set()
+    for _ in range(2000):
+        key = f'{rng.randrange(300):03d}'
+        if rng.random() < 0.6:
+            assert index.add(key) == (key not in reference)
+            reference.add(key)
+        else:
+            assert index.discard(key) == (key in reference)
+            reference.discard(key)
+    
+    ordered = sorted(reference)
+    assert list(index) == ordered and len(index) == len(ordered)
+    assert list(index.irange('100', '200')) == [k for k in ordered if '100' <= k < '200']
+    assert list(index.irange('150', None, low_inclusive=False)) == [k for k in ordered if k > '150']
+    assert prefix_upper_bound('ab') == 'ac'
+    assert prefix_upper_bound('') is None
+    
+    print("✓ Sorted key index test passed")
+
+
 if __name__ == '__main__':
     print("Running Memory Module Unit Tests...")
     test_memory_initialization()
@@ -262,4 +668,17 @@ if __name__ == '__main__':
     test_deterministic_behavior()
     test_no_side_effects()
     test_persistence()
+    test_sqlite_backend()
+    test_backend_selected_from_config()
+    test_save_is_atomic()
+    test_compressed_checkpoint()
+    test_snapshot_isolation()
+    test_snapshot_reclamation()
+    test_checkpoint_during_concurrent_writes()
+    test_ttl_expiry()
+    test_capacity_eviction()
+    test_capacity_from_config()
+    test_scan_prefix_and_range()
+    test_scan_pagination_is_stable()
+    test_sorted_key_index()
     print("\nAll Memory Module tests passed!")
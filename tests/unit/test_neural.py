@@ -0,0 +1,255 @@
+"""
+Thalos Prime v1.0 - Unit Tests for the Biological Neural Network
+
+Tests for the object model and the vectorized simulation engine
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import random
+
+import numpy as np
+
+from ai.neural.bio_neural_network import BioNeuralNetwork
+
+
+def build_network(seed, hidden=30):
+    """Input -> two recurrent hidden layers -> output, seeded"""
+    random.seed(seed)
+    network = BioNeuralNetwork("test_net")
+    inputs = network.create_layer(10, "input")
+    first = network.create_layer(hidden, "hidden")
+    second = network.create_layer(hidden, "hidden")
+    outputs = network.create_layer(5, "output")
+    network.connect_layers(inputs, first, 0.8)
+    network.connect_layers(first, second, 0.5)
+    network.connect_layers(second, first, 0.2)
+    network.connect_layers(second, outputs, 0.7)
+    return network
+
+
+def test_engine_matches_object_model():
+    """Test simulate(n) reproduces n simulate_step() calls from the same seed"""
+    objects = build_network(7)
+    arrays = build_network(7)
+    stimulus = random.Random(5)
+
+    object_spikes, engine_spikes = [], []
+    for _ in range(10):
+        pattern = [stimulus.random() for _ in range(10)]
+        objects.stimulate_inputs(pattern)
+        arrays.stimulate_inputs(pattern)
+        for _ in range(30):
+            object_spikes.append(objects.simulate_step()['spikes'])
+        result = arrays.simulate(30)
+        assert result['steps'] == 30 and result['time'] == arrays.current_time
+        engine_spikes.extend(result['spikes'])
+
+    assert sum(len(step) for step in object_spikes) > 50
+    assert engine_spikes == object_spikes
+    assert arrays.current_time == objects.current_time
+    for a, b in zip(objects.neurons, arrays.neurons):
+        assert abs(a.membrane_potential - b.membrane_potential) < 1e-9
+        assert a.threshold == b.threshold and a.spike_times == b.spike_times
+    for a, b in zip(objects.synapses, arrays.synapses):
+        assert abs(a.weight - b.weight) < 1e-9 and abs(a.current - b.current) < 1e-9
+    assert np.array_equal(objects.synapse_store.last_arrival, arrays.synapse_store.last_arrival)
+    assert np.allclose(objects.synapse_store.buffer.slots, arrays.synapse_store.buffer.slots,
+                       rtol=0, atol=1e-9)
+
+    # The two paths can be mixed: state lives in the objects between runs
+    for _ in range(5):
+        objects.simulate_step()
+    arrays.simulate(2)
+    for _ in range(3):
+        arrays.simulate_step()
+    assert [n.spike_times for n in arrays.neurons] == [n.spike_times for n in objects.neurons]
+    assert arrays.get_network_stats() == objects.get_network_stats()
+
+    print("✓ Engine equivalence test passed")
+
+
+def test_engine_rebuilds_after_structural_changes():
+    """Test simulate() picks up new layers and connections"""
+    network = build_network(3, hidden=10)
+    network.stimulate_inputs([1.0] * 10)
+    network.simulate(20)
+    engine = network._engine
+
+    extra = network.create_layer(4, "output")
+    network.connect_layers(network.hidden_neurons[-10:], extra, 1.0)
+    network.simulate(5)
+    assert network._engine is not engine
+    assert network._engine.num_neurons == len(network.neurons)
+    assert all(len(neuron.incoming_synapses) == 10 for neuron in extra)
+
+    assert network.simulate(0)['spikes'] == []
+    assert BioNeuralNetwork().simulate(10)['num_spikes'] == 0
+
+    print("✓ Engine rebuild test passed")
+
+
+def test_sparse_connectivity_store():
+    """Test CSR layout, views that follow reordering, and optimizer pruning"""
+    from ai.neural.bio_neural_network import Synapse
+    from ai.optimization.neural_optimizer import NeuralPathwayOptimizer
+
+    network = build_network(11, hidden=20)
+    store = network.synapse_store
+    assert store.weight.dtype == np.float32 and store.pre.dtype == np.int32
+    assert np.all(np.diff(store.pre) >= 0)
+    assert store.indptr[-1] == len(store) == len(network.synapses)
+    for neuron in network.neurons:
+        assert all(s.pre_neuron is neuron for s in neuron.outgoing_synapses)
+        assert all(s.post_neuron is neuron for s in neuron.incoming_synapses)
+    assert all(0.3 <= s.weight <= 0.7 for s in network.synapses)
+
+    # Same seed, same graph
+    assert np.array_equal(build_network(11, hidden=20).synapse_store.post, store.post)
+
+    # A view keeps pointing at its synapse when new edges reorder the arrays
+    last = network.synapses[-1]
+    assert isinstance(last, Synapse)
+    last.weight = 0.55
+    index = last.index
+    pre_id, post_id = last.pre_neuron.neuron_id, last.post_neuron.neuron_id
+    network.connect_layers(network.input_neurons, network.output_neurons, 1.0)
+    assert last.index == index + 50
+    assert (last.pre_neuron.neuron_id, last.post_neuron.neuron_id) == (pre_id, post_id)
+    assert abs(last.weight - 0.55) < 1e-6
+
+    # The optimizer prunes and consolidates through the view layer
+    weak = network.synapses[0]
+    weak.weight = 0.001
+    optimizer = NeuralPathwayOptimizer()
+    before = len(network.synapses)
+    result = optimizer.optimize_network(network)
+    assert result['pruned'] >= 1 and weak not in network.synapses
+    assert len(network.synapses) == before - result['pruned'] - result['consolidated']
+    assert len(store) == len(network.synapses)
+    try:
+        weak.weight
+        assert False, "removed synapse view should raise"
+    except ValueError:
+        pass
+    assert network.simulate(10)['steps'] == 10
+
+    print("✓ Sparse connectivity test passed")
+
+
+def test_optimizer_tracks_each_synapse():
+    """Test the optimizer keeps separate stats for every store-backed synapse"""
+    from ai.optimization.neural_optimizer import NeuralPathwayOptimizer
+
+    network = build_network(5, hidden=10)
+    ids = {synapse.synapse_id for synapse in network.synapses}
+    optimizer = NeuralPathwayOptimizer()
+    result = optimizer.optimize_network(network)
+    assert len(ids) == result['initial_connections']
+    assert set(optimizer.pathway_strengths) == ids
+
+    # A second pass updates the same entries instead of adding new ones
+    optimizer.optimize_network(network)
+    assert set(optimizer.pathway_strengths) == ids
+    for synapse in network.synapses:
+        assert abs(optimizer.pathway_strengths[synapse.synapse_id] - abs(synapse.weight)) < 1e-6
+
+    print("✓ Optimizer synapse tracking test passed")
+
+
+def test_delay_buffer_delivers_after_quantized_delay():
+    """Test a spike reaches its target exactly round(delay / dt) steps later"""
+    for simulate in ('objects', 'engine'):
+        network = BioNeuralNetwork("delay_net")
+        network.homeostasis_enabled = False
+        network.learning_enabled = False
+        source = network.create_layer(1, "input")
+        target = network.create_layer(1, "output")
+        network.connect_layers(source, target, 1.0)
+        synapse = network.synapses[0]
+        synapse.weight = 0.5
+        synapse.delay = 2.5  # 25 steps, longer than the initial buffer
+
+        network.stimulate_inputs([1.0])
+        inputs = []
+        for _ in range(40):
+            if simulate == 'objects':
+                network.simulate_step()
+            else:
+                network.simulate(1)
+            inputs.append(float(network.synapse_store.buffer.current[1]))
+
+        assert network.neurons[0].spike_times == [0.0]
+        assert network.synapse_store.buffer.num_slots == 25
+        assert inputs[:25] == [0.0] * 25
+        assert inputs[25] == 0.5
+        assert 0 < inputs[30] < inputs[26] < 0.5
+        assert abs(synapse.current - inputs[-1]) < 1e-6
+
+    # A single synapse can be driven directly; removing it does not cancel
+    # input already in flight
+    synapse.receive_spike(network.current_time)
+    network.synapses = []
+    before = float(network.synapse_store.buffer.current[1])
+    for _ in range(25):
+        network.simulate_step()
+    assert network.synapse_store.buffer.current[1] > before
+
+    network.reset()
+    assert not network.synapse_store.buffer.slots.any()
+
+    print("✓ Delay buffer test passed")
+
+
+def test_trace_stdp_matches_pair_rule():
+    """Test eligibility traces reproduce pair-based STDP on spiking neurons only"""
+    import math
+
+    network = BioNeuralNetwork("stdp_net")
+    source, silent = network.create_layer(2, "input")
+    target = network.create_layer(1, "output")[0]
+    network.connect_layers([source, silent], [target], 1.0)
+    store = network.synapse_store
+    forward, unused = network.synapses
+    forward.weight = unused.weight = 0.5
+
+    def step(spikes):
+        store.update(network.dt, network.current_time)
+        store.apply_stdp(spikes)
+        store.record_spikes(spikes)
+        network.current_time += network.dt
+
+    # Pre at 0 ms, post at 5 ms: potentiation by a_plus * exp(-5 / tau_plus)
+    step([source.neuron_id])
+    for _ in range(49):
+        step([])
+    step([target.neuron_id])
+    expected = 0.5 + store.a_plus * math.exp(-5.0 / store.tau_plus)
+    assert abs(forward.weight - expected) < 1e-6
+    assert unused.weight == 0.5
+
+    # Pre again 1 ms after the post spike: depression by a_minus * exp(-1 / tau_minus)
+    for _ in range(9):
+        step([])
+    step([source.neuron_id])
+    expected -= store.a_minus * math.exp(-1.0 / store.tau_minus)
+    assert abs(forward.weight - expected) < 1e-6
+    assert unused.weight == 0.5
+
+    network.reset()
+    assert not store.pre_trace.any() and not store.post_trace.any()
+
+    print("✓ Trace STDP test passed")
+
+
+if __name__ == '__main__':
+    print("Running Biological Neural Network Unit Tests...")
+    test_engine_matches_object_model()
+    test_engine_rebuilds_after_structural_changes()
+    test_sparse_connectivity_store()
+    test_optimizer_tracks_each_synapse()
+    test_delay_buffer_delivers_after_quantized_delay()
+    test_trace_stdp_matches_pair_rule()
+    print("\nAll Biological Neural Network tests passed!")
@@ -0,0 +1,147 @@
+"""
+Thalos Prime - Unit Tests for Sharded Memory System
+
+Tests for key routing, fan-out queries and concurrent writers
+"""
+
+import sys
+import os
+import tempfile
+import threading
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from core.memory.advanced_memory import AdvancedMemorySystem
+from core.memory.sharded_memory import ShardedMemorySystem
+
+
+def test_keys_are_routed_to_owning_shard():
+    """Test entries land on one shard and survive a restart"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = ShardedMemorySystem(str(tmp_path), num_shards=4)
+        for i in range(40):
+            memory.create(f'k{i}', f'value {i}')
+
+        counts = memory.get_statistics()['shard_entries']
+        assert sum(counts) == 40
+        assert all(counts)
+        assert 'k7' in memory.shard_for('k7').data
+
+        reloaded = ShardedMemorySystem(str(tmp_path), num_shards=4)
+        assert reloaded.read('k7') == 'value 7'
+        assert len(reloaded.get_version_history('k7')) == 1
+
+        try:
+            ShardedMemorySystem(str(tmp_path), num_shards=2)
+            assert False, "a different shard count was accepted"
+        except ValueError:
+            pass
+
+    print("✓ Shard routing test passed")
+
+
+def test_fan_out_queries():
+    """Test search, tags and relationships merge across shards"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = ShardedMemorySystem(str(tmp_path), num_shards=4)
+        memory.create_many([
+            {'key': f'doc{i}', 'value': 'neuron ' * (i + 1) + 'filler', 'tags': ['bio']}
+            for i in range(8)
+        ])
+        memory.create('a', 'start', related_keys=['b'])
+        memory.create('b', 'middle', related_keys=['c'])
+        memory.create('c', 'end')
+
+        results = memory.search('neuron', limit=3)
+        scores = [score for _, _, score in results]
+        assert len(results) == 3
+        assert scores == sorted(scores, reverse=True)
+        assert results[0][0] == 'doc7'
+
+        single = AdvancedMemorySystem(str(tmp_path / 'single'))
+        single.create_many([{'key': k, 'value': memory.read(k)} for k in
+                            [f'doc{i}' for i in range(8)] + ['a', 'b', 'c']])
+        expected = single.search('neuron', limit=3)
+        assert [key for key, _, _ in results] == [key for key, _, _ in expected]
+        assert all(abs(a - b) < 1e-9 for a, (_, _, b) in zip(scores, expected))
+
+        assert len(memory.find_by_tag('bio')) == 8
+        assert memory.find_related('a') == ['b']
+        assert sorted(memory.find_related('a', depth=2)) == ['b', 'c']
+
+        assert memory.delete('b')
+        assert memory.find_related('a') == []
+        assert memory.find_related('c') == []
+
+    print("✓ Fan-out query test passed")
+
+
+def test_unlink_survives_wal_replay():
+    """Test cross-shard edge removal is logged on the shard holding the edge"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = ShardedMemorySystem(str(tmp_path), num_shards=8, persistence='wal',
+                                     compact_every=0)
+        memory.create('hub', 'hub')
+        spokes = [f'spoke{i}' for i in range(8)]
+        for spoke in spokes:
+            memory.create(spoke, spoke, related_keys=['hub'])
+        memory.delete_many(['hub'])
+        memory.close()
+
+        reloaded = ShardedMemorySystem(str(tmp_path), num_shards=8, persistence='wal')
+        assert reloaded.find_related('spoke0') == []
+        reloaded.close()
+
+    print("✓ Unlink replay test passed")
+
+
+def test_concurrent_writers():
+    """Test writer threads on different shards keep every entry, with readers running"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        memory = ShardedMemorySystem(str(tmp_path), num_shards=4, durability='manual')
+        errors = []
+
+        def writer(worker):
+            for i in range(200):
+                memory.create(f'w{worker}-{i}', f'payload {worker} {i}',
+                              tags=[f'tag{worker}-{i % 25}'])
+                memory.update(f'w{worker}-{i}', f'updated {worker} {i}')
+                memory.search('payload', limit=2)
+
+        def reader():
+            try:
+                while any(thread.is_alive() for thread in threads):
+                    memory.get_statistics()
+                    memory.export_graph()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads + readers:
+            thread.start()
+        for thread in threads + readers:
+            thread.join()
+        memory.close()
+        assert not errors, errors
+
+        stats = memory.get_statistics()
+        assert stats['total_entries'] == 800
+        assert stats['total_tags'] == 100
+        assert stats['operations']['updated'] == 800
+        assert ShardedMemorySystem(str(tmp_path), num_shards=4).read('w3-199') == 'updated 3 199'
+
+    print("✓ Concurrent writer test passed")
+
+
+if __name__ == '__main__':
+    print("Running Sharded Memory System Unit Tests...")
+    test_keys_are_routed_to_owning_shard()
+    test_fan_out_queries()
+    test_unlink_survives_wal_replay()
+    test_concurrent_writers()
+    print("\nAll Sharded Memory System tests passed!")